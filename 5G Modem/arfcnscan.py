@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+import time
+
+from qeng import parse_servingcell
+
+# NR ARFCN lock (RM5xx). SCS is 30 kHz on n78, so usable ARFCNs step by 2
+LOCK_COMMAND = 'AT+QNWCFG="nr5g_earfcn_lock",1,{arfcn}:{scs}'
+UNLOCK_COMMAND = 'AT+QNWCFG="nr5g_earfcn_lock",0'
+SCS_KHZ = 30
+
+# Settling: poll until the modem reports the locked ARFCN with a steady RSRP
+POLL_INTERVAL = 0.2        # Seconds between servingcell polls while settling
+EMPTY_TIMEOUT = 1.5        # No NR cell on the ARFCN by then → empty, move on
+SETTLE_TIMEOUT = 5.0       # Cell seen but RSRP never steadied → record as unstable
+STABLE_SAMPLES = 3         # Consecutive readings that must agree...
+STABLE_DB = 2.0            # ...within this many dB
+MEASURE_SAMPLES = 5        # Readings averaged once settled
+PRUNE_AFTER = 2            # Drop an ARFCN from later passes after this many empty (or failed) passes in a row
+
+def mean(values):
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+class ArfcnScanner(object):
+    """Locks NR ARFCNs in turn and measures each one once the modem has settled on it"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.empty_passes = {}
+
+    def read_cell(self):
+        """Current NR serving cell record, or None when the modem reports none"""
+        try:
+            return parse_servingcell(self.engine.query('AT+QENG="servingcell"')).get('5G')
+        except Exception as ex:
+            print("Exception reading serving cell", ex, flush=True)
+            return None
+
+    def settle(self, arfcn):
+        """Poll until RSRP on the locked ARFCN is steady; returns (status, seconds, readings)"""
+        start = time.monotonic()
+        readings = []
+        while True:
+            elapsed = time.monotonic() - start
+            cell = self.read_cell()
+            if cell and cell.get('arfcn') == arfcn and cell.get('rsrp') is not None:
+                readings.append(cell)
+                recent = [r['rsrp'] for r in readings[-STABLE_SAMPLES:]]
+                if len(recent) == STABLE_SAMPLES and max(recent) - min(recent) <= STABLE_DB:
+                    return "ok", elapsed, readings
+            if not readings and elapsed >= EMPTY_TIMEOUT:
+                return "empty", elapsed, readings
+            if elapsed >= SETTLE_TIMEOUT:
+                return "unstable", elapsed, readings
+            time.sleep(POLL_INTERVAL)
+
+    def measure(self, arfcn):
+        """Lock one ARFCN and return its record; status "error" when the modem rejects the lock"""
+        try:
+            self.engine.query(LOCK_COMMAND.format(arfcn=arfcn, scs=SCS_KHZ))
+        except Exception as ex:
+            print("Exception locking ARFCN", arfcn, ex, flush=True)
+            return {'timestamp': time.time(), 'arfcn': arfcn, 'status': "error", 'settle_s': 0.0, 'samples': 0}
+        status, settle_time, readings = self.settle(arfcn)
+        if status == "ok":
+            for _ in range(MEASURE_SAMPLES - 1):
+                time.sleep(POLL_INTERVAL)
+                cell = self.read_cell()
+                if cell and cell.get('arfcn') == arfcn:
+                    readings.append(cell)
+            readings = readings[-MEASURE_SAMPLES:]
+        record = {
+            'timestamp': time.time(),
+            'arfcn': arfcn,
+            'status': status,
+            'settle_s': round(settle_time, 2),
+            'samples': len(readings)}
+        if readings:
+            record.update({
+                'pcid': readings[-1].get('pcid'),
+                'band': readings[-1].get('band'),
+                'rsrp': mean(r.get('rsrp') for r in readings),
+                'rsrq': mean(r.get('rsrq') for r in readings),
+                'sinr': mean(r.get('sinr') for r in readings)})
+        return record
+
+    def scan(self, arfcns, passes=1):
+        """Yield a record per ARFCN per pass, skipping ARFCNs that stayed empty PRUNE_AFTER passes in a row.
+
+        Each record's arfcn_state is the ARFCN's index in arfcns, whatever has been pruned.
+        """
+        arfcns = list(arfcns)
+        index = {arfcn: i for i, arfcn in enumerate(arfcns)}
+        try:
+            for pass_no in range(passes):
+                active = [a for a in arfcns if self.empty_passes.get(a, 0) < PRUNE_AFTER]
+                if not active:
+                    print("Every ARFCN has been pruned", flush=True)
+                    return
+                for arfcn in active:
+                    record = self.measure(arfcn)
+                    record.update({'pass': pass_no, 'arfcn_state': index[arfcn]})
+                    if record['status'] in ("empty", "error"):
+                        self.empty_passes[arfcn] = self.empty_passes.get(arfcn, 0) + 1
+                    else:
+                        self.empty_passes[arfcn] = 0
+                    yield record
+        finally:
+            try:
+                self.engine.query(UNLOCK_COMMAND)
+            except Exception as ex:
+                print("Exception removing ARFCN lock", ex, flush=True)
+
+class ScanSummary(object):
+    """Running per-ARFCN aggregates, so an endless scan keeps constant memory per ARFCN"""
+
+    def __init__(self):
+        self.locks = {}             # arfcn -> number of records
+        self.rsrp_sum = {}          # arfcn -> (sum of RSRP, records with RSRP)
+        self.best = {}              # arfcn -> record with the strongest RSRP
+
+    def add(self, record):
+        arfcn = record['arfcn']
+        self.locks[arfcn] = self.locks.get(arfcn, 0) + 1
+        rsrp = record.get('rsrp')
+        if rsrp is None:
+            return
+        total, n = self.rsrp_sum.get(arfcn, (0.0, 0))
+        self.rsrp_sum[arfcn] = (total + rsrp, n + 1)
+        if arfcn not in self.best or rsrp > self.best[arfcn]['rsrp']:
+            self.best[arfcn] = record
+
+    def print(self):
+        """Best reading per ARFCN that had a cell, strongest first"""
+        print("{:<10} {:<10} {:<8} {:<8} {:<10} {:<10} {:<10} {:<10}".format(
+            "ARFCN", "Status", "Locks", "PCID", "RSRP", "Mean RSRP", "RSRQ", "SINR"))
+        for record in sorted(self.best.values(), key=lambda r: -r['rsrp']):
+            total, n = self.rsrp_sum[record['arfcn']]
+            print("{:<10} {:<10} {:<8} {:<8} {:<10.1f} {:<10.1f} {:<10.1f} {:<10.1f}".format(
+                record['arfcn'], record['status'], self.locks[record['arfcn']], str(record['pcid']),
+                record['rsrp'], total / n,
+                record['rsrq'] if record['rsrq'] is not None else float('nan'),
+                record['sinr'] if record['sinr'] is not None else float('nan')))
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import collections
+import queue
+import threading
+import time
+
+# Final result codes that end a command's response
+FINAL_OK = ("OK",)
+FINAL_ERROR = ("ERROR", "+CME ERROR", "+CMS ERROR", "NO CARRIER")
+
+# Longest a timed-out command keeps its place in flight waiting for its late
+# result code before the modem is assumed to have dropped it
+ZOMBIE_TIMEOUT = 30.0
+
+# Lines the modem may emit on its own at any time (unsolicited result codes)
+URC_PREFIXES = ("+QIND", "RDY", "+CPIN", "+QUSIM", "+CFUN", "POWERED DOWN", "+QNETDEVSTATUS",
+                "+CGEV", "+CREG", "+CEREG", "+CGREG", "+C5GREG", "+QSTAT", "+QSIMSTAT")
+
+class ATCommand(object):
+    """One queued AT command and the response lines collected for it"""
+
+    def __init__(self, command):
+        self.command = command
+        self.name = command[2:].split('=')[0].split('?')[0] if command.upper().startswith('AT') else command
+        self.lines = []
+        self.status = None          # final result code line once finished
+        self.sent_at = None
+        self.finished_at = None
+        self.aborted = False        # timed out; any late response is discarded
+        self.done = threading.Event()
+
+    @property
+    def latency(self):
+        """Seconds from write to final result code"""
+        if self.sent_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.sent_at
+
+    def check(self):
+        """Response lines of a finished command; raises on timeout or an error result"""
+        if self.status is None:
+            raise Exception("Timeout from query \"", self.command, "\"")
+        if self.status != "OK":
+            raise Exception("Error from query \"", self.command, "\":", self.status)
+        return self.lines
+
+class ATEngine(object):
+    """Serial AT engine: a reader thread splits responses on OK/ERROR terminators.
+
+    Commands are queued and the next one is written by the reader thread as
+    soon as the previous one completes, so a batch of queries costs only the
+    modem's processing time. Unsolicited result codes are routed to
+    self.urcs (a queue) instead of being mixed into command responses.
+    """
+
+    def __init__(self, port, max_in_flight=1):
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self.pending = collections.deque()      # queued, not yet written
+        self.in_flight = collections.deque()    # written, waiting for a final result code
+        self.urcs = queue.Queue()
+        self.lock = threading.Lock()
+        self.buffer = b''
+        self.running = True
+
+        # Drop stale output in one go instead of reading it line by line
+        if hasattr(self.port, 'reset_input_buffer'):
+            self.port.reset_input_buffer()
+
+        self.reader = threading.Thread(target=self.read_loop, name="at-reader", daemon=True)
+        self.reader.start()
+
+    def send(self, command):
+        """Queue a command and return its ATCommand handle without waiting"""
+        cmd = ATCommand(command)
+        with self.lock:
+            self.pending.append(cmd)
+            self.write_pending()
+        return cmd
+
+    def wait(self, cmd, timeout):
+        """Wait for a command; one that times out is dropped so the queue keeps moving"""
+        if not cmd.done.wait(timeout):
+            self.abort(cmd)
+        return cmd
+
+    def query(self, command, timeout=5.0):
+        """Send a command and wait for its response lines"""
+        return self.wait(self.send(command), timeout).check()
+
+    def query_many(self, commands, timeout=5.0):
+        """Queue several commands back to back and wait for all of them (handles, not lines)"""
+        handles = [self.send(command) for command in commands]
+        deadline = time.monotonic() + timeout
+        for handle in handles:
+            self.wait(handle, max(0.0, deadline - time.monotonic()))
+        return handles
+
+    def abort(self, cmd):
+        """Give up on a command that timed out.
+
+        A command already written stays in flight as a zombie that swallows
+        its late response lines and result code, so they are not credited to
+        the next command. It is dropped after ZOMBIE_TIMEOUT if the modem
+        never answers.
+        """
+        with self.lock:
+            if cmd.done.is_set():
+                return
+            cmd.aborted = True
+            if cmd in self.pending:
+                self.pending.remove(cmd)
+            self.write_pending()
+
+    def write_pending(self):
+        # Caller holds self.lock
+        now = time.monotonic()
+        while self.in_flight and self.in_flight[0].aborted and now - self.in_flight[0].sent_at > ZOMBIE_TIMEOUT:
+            self.in_flight.popleft()
+        while self.pending and len(self.in_flight) < self.max_in_flight:
+            cmd = self.pending.popleft()
+            cmd.sent_at = time.monotonic()
+            self.in_flight.append(cmd)
+            self.port.write((cmd.command + '\r\n').encode('utf-8'))
+
+    def read_loop(self):
+        while self.running:
+            try:
+                data = self.port.read(max(1, getattr(self.port, 'in_waiting', 0) or 1))
+            except Exception as ex:
+                print("Serial read failed:", ex, flush=True)
+                break
+            if not data:
+                continue
+            self.buffer += data
+            while b'\n' in self.buffer:
+                raw, self.buffer = self.buffer.split(b'\n', 1)
+                line = raw.decode('utf-8', errors='replace').strip()
+                if line:
+                    self.handle_line(line)
+
+    def handle_line(self, line):
+        with self.lock:
+            cmd = self.in_flight[0] if self.in_flight else None
+            if cmd is None or (line.startswith(URC_PREFIXES) and not line.startswith(cmd.name)):
+                self.urcs.put((time.time(), line))
+                return
+            if line == cmd.command:
+                return  # command echo
+            if line in FINAL_OK or line.startswith(FINAL_ERROR):
+                self.in_flight.popleft()
+                if not cmd.aborted:
+                    cmd.status = line
+                    cmd.finished_at = time.monotonic()
+                    cmd.done.set()
+                self.write_pending()
+                return
+            if not cmd.aborted:
+                cmd.lines.append(line)
+
+    def close(self):
+        self.running = False
+        self.reader.join(timeout=2.0)
+        if hasattr(self.port, 'close'):
+            self.port.close()
+
+def open_engine(device, baudrate=115200):
+    """Open a serial device with a short read timeout and start an ATEngine on it"""
+    import serial
+    return ATEngine(serial.Serial(device, baudrate=baudrate, timeout=0.05))
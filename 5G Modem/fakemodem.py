@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from atengine import FINAL_OK, FINAL_ERROR
+
+# Replay defaults
+RESPONSE_DELAY = 0.0       # Seconds before each response; a real RM5xx answers QENG in ~10-30 ms
+RESPONSE_JITTER = 0.0      # Extra uniform random delay
+URC_INTERVAL = None        # Seconds between unsolicited messages; None → never
+URCS = ['+QIND: "csq",23,99', '+CGEV: ME PDN ACT 1', '+QNETDEVSTATUS: 1']
+READ_TIMEOUT = 0.05        # Like the pyserial timeout used by atengine.open_engine
+
+# Regression check: a recorded transcript and the fields the AT engine + qeng parsers must produce
+# from it, in replay order. Covers the single-line NOCONN LTE layout (SINR 26 and CQI 0; the old
+# regexes logged SINR as CQI), the EN-DC three-line layout, neighbour cells and a cell search.
+REGRESSION_TRANSCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regression.log")
+REGRESSION_EXPECTED = [
+    ('AT+QENG="servingcell"', "servingcell", {
+        'state': "NOCONN", 'rat': "LTE",
+        'LTE': {'is_tdd': "FDD", 'MCC': 302, 'MNC': 720, 'cellid': 0x99B815, 'pcid': 0, 'earfcn': 675,
+                'freq_band_ind': 2, 'TAC': 0x73A0, 'RSRP': -67, 'RSRQ': -6, 'RSSI': -42, 'SINR': 26,
+                'CQI': 0, 'tx_power': None, 'SRXLEV': 60}}),
+    ('AT+QENG="neighbourcell"', "neighbourcell", [
+        {'cell': "LTE intra", 'earfcn': 3050, 'pcid': 95, 'RSRQ': -16, 'RSRP': -110, 'SINR': -2,
+         's_intra_search': 8},
+        {'cell': "LTE inter", 'earfcn': 675, 'pcid': 0, 'RSRP': -72, 'SINR': 12, 'threshX_high': 0},
+        {'cell': "NR", 'arfcn': 638016, 'pcid': 479, 'rsrp': -101, 'rsrq': -14, 'sinr': 2}]),
+    ('AT+QCAINFO', None, ['+QCAINFO: "pcc",3050,100,"LTE BAND 7",1,95,-110,-16,-74,-2']),
+    ('AT+QENG="servingcell"', "servingcell", {
+        'state': "NOCONN", 'rat': "NR5G-NSA",
+        'LTE': {'cellid': 0x9D8148, 'pcid': 95, 'earfcn': 3050, 'RSRP': -110, 'SINR': -2, 'CQI': 4,
+                'tx_power': 140, 'SRXLEV': None},
+        '5G': {'pcid': 479, 'rsrp': -100, 'sinr': 3, 'rsrq': -15, 'arfcn': 638016, 'band': 77, 'scs': 1}}),
+    ('AT+QENG="servingcell"', "servingcell", {'state': "SEARCH"}),
+]
+
+# Optional timestamp written before a transcript line ('12.345 ' or '2025-11-10 13:49:29 ')
+STAMP_RE = re.compile(r'^(?:[0-9]+\.?[0-9]*|\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\s+(?=\S)')
+
+def load_transcript(path):
+    """Recorded AT transcript → {command: [(lines, final result code), ...]}
+
+    Understands echoed transcripts (command line, response lines, OK/ERROR)
+    as well as bare +QENG captures, where a '"servingcell"' line starts a new
+    servingcell response and a run of neighbour lines forms one neighbourcell
+    response.
+    """
+    responses = {}
+    command, lines = None, []
+    bare, bare_lines = None, []
+
+    def close_bare():
+        if bare:
+            responses.setdefault(bare, []).append((bare_lines, "OK"))
+
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = STAMP_RE.sub('', raw.strip())
+            if not line:
+                continue
+            if line.upper().startswith("AT"):
+                close_bare()
+                bare = None
+                command, lines = line, []
+            elif command is not None:
+                if line in FINAL_OK or line.startswith(FINAL_ERROR):
+                    responses.setdefault(command, []).append((lines, line))
+                    command = None
+                else:
+                    lines.append(line)
+            elif line.startswith('+QENG: "neighbourcell'):
+                if bare != 'AT+QENG="neighbourcell"':
+                    close_bare()
+                    bare, bare_lines = 'AT+QENG="neighbourcell"', []
+                bare_lines.append(line)
+            elif line.startswith('+QENG: "servingcell"') or (line.startswith('+QENG:') and bare != 'AT+QENG="servingcell"'):
+                close_bare()
+                bare, bare_lines = 'AT+QENG="servingcell"', [line]
+            elif line.startswith('+QENG:'):
+                bare_lines.append(line)
+    close_bare()
+    return responses
+
+class FakeModem(object):
+    """Serial-port stand-in that answers AT commands from recorded responses.
+
+    Implements the part of the pyserial interface ATEngine uses (write, read,
+    in_waiting, reset_input_buffer, close), so it can be handed straight to
+    ATEngine or served on a pty with serve_pty(). Each command's recorded
+    responses are replayed in a loop; commands that were not recorded
+    (AT, ARFCN locks, ...) answer a bare OK.
+    """
+
+    def __init__(self, responses, delay=RESPONSE_DELAY, jitter=RESPONSE_JITTER,
+                 urc_interval=URC_INTERVAL, urcs=URCS, echo=True):
+        self.replay = {command: itertools.cycle(recorded) for command, recorded in responses.items() if recorded}
+        self.delay = delay
+        self.jitter = jitter
+        self.echo = echo
+        self.timeout = READ_TIMEOUT
+        self.output = bytearray()
+        self.input = b''
+        self.commands = []
+        self.ready = threading.Condition()
+        self.running = True
+        self.answered = 0
+        threading.Thread(target=self.answer_loop, name="fake-modem", daemon=True).start()
+        if urc_interval:
+            threading.Thread(target=self.urc_loop, args=(urc_interval, urcs), name="fake-urcs", daemon=True).start()
+
+    @property
+    def in_waiting(self):
+        return len(self.output)
+
+    def reset_input_buffer(self):
+        with self.ready:
+            del self.output[:]
+
+    def write(self, data):
+        self.input += data
+        with self.ready:
+            while b'\r' in self.input:
+                raw, self.input = self.input.split(b'\r', 1)
+                command = raw.decode('utf-8', errors='replace').strip()
+                if command:
+                    self.commands.append(command)
+            self.ready.notify_all()
+        return len(data)
+
+    def read(self, size=1):
+        with self.ready:
+            if not self.output:
+                self.ready.wait_for(lambda: self.output or not self.running, self.timeout)
+            data = bytes(self.output[:size])
+            del self.output[:size]
+            return data
+
+    def emit(self, lines):
+        with self.ready:
+            self.output += ''.join(line + '\r\n' for line in lines).encode('utf-8')
+            self.ready.notify_all()
+
+    def respond(self, command):
+        recorded = self.replay.get(command)
+        lines, status = next(recorded) if recorded is not None else ([], "OK")
+        return ([command] if self.echo else []) + list(lines) + [status]
+
+    def answer_loop(self):
+        while self.running:
+            with self.ready:
+                self.ready.wait_for(lambda: self.commands or not self.running)
+                if not self.running:
+                    return
+                command = self.commands.pop(0)
+            wait = self.delay + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if wait:
+                time.sleep(wait)
+            self.emit(self.respond(command))
+            self.answered += 1
+
+    def urc_loop(self, interval, urcs):
+        for urc in itertools.cycle(urcs):
+            time.sleep(interval)
+            if not self.running:
+                return
+            self.emit([urc])
+
+    def close(self):
+        with self.ready:
+            self.running = False
+            self.ready.notify_all()
+
+def serve_pty(modem):
+    """Expose a FakeModem on a pseudo-terminal so unmodified scripts can open it like /dev/ttyUSB2"""
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    print("Fake modem on", os.ttyname(slave), flush=True)
+
+    def forward_input():
+        while modem.running:
+            try:
+                data = os.read(master, 1024)
+            except OSError:
+                break
+            modem.write(data)
+
+    threading.Thread(target=forward_input, daemon=True).start()
+    try:
+        while True:
+            data = modem.read(4096)
+            if data:
+                os.write(master, data)
+    except KeyboardInterrupt:
+        modem.close()
+
+def benchmark(modem, commands, cycles):
+    """Run the fg.py batch against the fake modem and report the AT + parse pipeline rate"""
+    from atengine import ATEngine
+    from qeng import parse_servingcell, parse_neighbours
+
+    engine = ATEngine(modem)
+    start = time.monotonic()
+    parsed = 0
+    for _ in range(cycles):
+        for handle in engine.query_many(commands):
+            lines = handle.check()
+            if handle.command == 'AT+QENG="servingcell"':
+                parsed += bool(parse_servingcell(lines))
+            elif handle.command == 'AT+QENG="neighbourcell"':
+                parsed += len(parse_neighbours(lines))
+    elapsed = time.monotonic() - start
+    engine.close()
+    print(f"{cycles} cycles of {len(commands)} commands in {elapsed:.2f} s: "
+          f"{cycles / elapsed:.0f} cycles/s, {cycles * len(commands) / elapsed:.0f} commands/s, {parsed} records parsed")
+
+def mismatches(expected, actual, where):
+    """Differences between expected and actual; dicts only need the expected keys to match"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        problems = []
+        for key, value in expected.items():
+            if key not in actual:
+                problems.append(f"{where}: missing {key!r}")
+            else:
+                problems += mismatches(value, actual[key], f"{where}.{key}")
+        return problems
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{where}: {len(actual)} entries, expected {len(expected)}"]
+        return [p for i, (e, a) in enumerate(zip(expected, actual)) for p in mismatches(e, a, f"{where}[{i}]")]
+    return [] if expected == actual else [f"{where}: {actual!r}, expected {expected!r}"]
+
+def regression(path=REGRESSION_TRANSCRIPT, expected=REGRESSION_EXPECTED):
+    """Replay a transcript through ATEngine and the qeng parsers and compare with expected; returns the failures.
+
+    URCs are interleaved with the responses, so a URC leaking into a command
+    or a response landing on the wrong command also shows up as a failure.
+    """
+    from atengine import ATEngine
+    from qeng import parse_servingcell, parse_neighbours
+
+    parsers = {"servingcell": parse_servingcell, "neighbourcell": parse_neighbours, None: lambda lines: lines}
+    modem = FakeModem(load_transcript(path), urc_interval=0.001)
+    engine = ATEngine(modem)
+    failures = []
+    try:
+        for n, (command, parser, fields) in enumerate(expected):
+            try:
+                lines = engine.query(command)
+            except Exception as ex:
+                failures.append(f"{n} {command}: {ex}")
+                continue
+            failures += mismatches(fields, parsers[parser](lines), f"{n} {command}")
+    finally:
+        engine.close()
+        modem.close()
+    return failures
+
+def main():
+    args = sys.argv[1:]
+    if args == ["--check"]:
+        failures = regression()
+        for failure in failures:
+            print("FAIL", failure)
+        print(f"{len(REGRESSION_EXPECTED)} responses checked, {len(failures)} failures")
+        sys.exit(1 if failures else 0)
+    if not args or args[0].startswith("--"):
+        print(f"Usage: {sys.argv[0]} transcript.log [--delay s] [--jitter s] [--urc-interval s] [--bench cycles]\n"
+              f"       {sys.argv[0]} --check")
+        sys.exit(1)
+    options = dict(zip(args[1::2], args[2::2]))
+    responses = load_transcript(args[0])
+    print("Loaded", ", ".join(f"{len(r)} x {c}" for c, r in responses.items()), flush=True)
+    modem = FakeModem(responses,
+                      delay=float(options.get("--delay", RESPONSE_DELAY)),
+                      jitter=float(options.get("--jitter", RESPONSE_JITTER)),
+                      urc_interval=float(options["--urc-interval"]) if "--urc-interval" in options else URC_INTERVAL)
+    if "--bench" in options:
+        benchmark(modem, ['AT+QENG="servingcell"', 'AT+QENG="neighbourcell"', 'AT+QCAINFO'], int(options["--bench"]))
+    else:
+        serve_pty(modem)
+
+if __name__ == "__main__":
+    main()
@@ -1,145 +1,125 @@
 #!/usr/bin/env python3
 import subprocess
-import re
 import time
-import json
 import os
+import sys
 from datetime import datetime
 
+from recordlog import RecordWriter
+from sampler import FixedRateSampler, RateReport, calibrate
+from qeng import parse_servingcell, parse_neighbours
+from arfcnscan import ArfcnScanner, ScanSummary
+
+# --scan: lock each ARFCN in arfcn_seq in turn and log per-ARFCN measurements instead
+SCAN_MODE = "--scan" in sys.argv
+# --port <device>: e.g. the pty printed by fakemodem.py when testing without hardware
+MODEM_PORT = sys.argv[sys.argv.index("--port") + 1] if "--port" in sys.argv else '/dev/ttyUSB2'
+
 # Create logs folder if it doesn't exist
 if not os.path.exists("logs"):
     os.makedirs("logs")
     print("Created logs folder")
 
-# Create timestamped log file name
+# Create timestamped log file name (JSON Lines: one record appended per line)
 timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-log_file = f"logs/modem_status_{timestamp_str}.json"
+log_file = f"logs/{'arfcn_scan' if SCAN_MODE else 'modem_status'}_{timestamp_str}.jsonl"
+
+# Records are appended as they arrive; read back with recordlog.load_columns()
+writer = RecordWriter(log_file)
 
-# Load existing data if file exists
-try:
-    with open(log_file, "r") as f:
-        data = json.load(f)
-    print("Loaded old data, size: ", len(data))
-except Exception as ex:
-    print("Old data could not be loaded", str(ex))
-    data = []
+# Sampling: every cycle sends the whole batch back to back on a fixed monotonic cadence
+SAMPLE_PERIOD = None   # seconds between samples; None → calibrate to what the modem sustains
+BATCH = ['AT+QENG="servingcell"', 'AT+QENG="neighbourcell"', 'AT+QCAINFO']
+BATCH_KEYS = {'AT+QENG="neighbourcell"': 'neighbourcell', 'AT+QCAINFO': 'cainfo'}
+BATCH_PARSERS = {'AT+QENG="neighbourcell"': parse_neighbours}
 
+# ARFCN scan (--scan only); tuning of settle/prune timing lives in arfcnscan.py
 arfcn_seq = [638016]
 #arfcn_seq = range(638016,638200,2)
 #arfcn_seq = range(620000,653332,2*100) # 2* because 30kHz
 #https://www.sqimway.com/nr_band.php
 # Band n78 min/max arfcn: 620000 653332 for 30kHz
 
-arfcn_state = -1
-arfcn_iterations = 9999999
+arfcn_state = -1            # Index into arfcn_seq of the locked ARFCN; -1 before the first lock
+arfcn_iterations = 9999999  # Passes over arfcn_seq; empty ARFCNs get pruned from later passes
 
 class ModemWrapper(object):
     def __init__(self, port):
-        import serial
-        self.port = serial.Serial(port,baudrate=115200,timeout=1)
-        import time
-        #time.sleep(2) # Nice race condition in quectel fw otherwise!
-        
-        # consume all stale output
-        while True:
-            resp = self.port.readline()
-            print(resp)
-            if resp == b'':
-                break
-        
-        self.port.write('AT\r\n'.encode('utf-8'))
-        print(self.port.readline())
-        print(self.port.readline())
-        print(self.port.readline())
-        print(self.port.readline())
+        from atengine import open_engine
+        # Reader thread owns the port; stale output is flushed instead of read line by line
+        self.engine = open_engine(port)
+        print(self.engine.query('AT'))
         print("Connection ready")
-        #print("Setting: ",self.port)
     
     def query(self, s):
-        self.port.write((s+'\r\n').encode('utf-8'))
-        results = []
-        for read_idx in range(10):
-            resp = self.port.readline()
-            if resp == b'\r\n':
-                continue
-            #print("read_idx=",read_idx,"got line",resp.decode('utf-8').strip())
-            if resp == b'OK\r\n':
-                if len(results)>0:
-                    #print("returning",results)
-                    return results
-                else:
-                    raise Exception("No result from query \"",s,"\"")
-            #print("appending")
-            results.append(resp.decode('utf-8').strip())
-        raise Exception("Timeout from query \"",s,"\"")
+        results = self.engine.query(s)
+        if len(results)==0:
+            raise Exception("No result from query \"",s,"\"")
+        return results
     
     def query_servingcell(self):
-        raw_list = self.query('AT+QENG="servingcell"')
-        results = {}
-        for raw in raw_list:
-            #raw = '+QENG: "servingcell","NOCONN","LTE","FDD",302,720,99B815,0,675,2,4,4,73A0,-67,-6,-42,26,0,-,60'
-            #raw = '+QENG: "NR5G-NSA",302,720,0,-60,30,-11,638016,78,8,1'
-            #print("raw=",raw)
-            import re
-            if raw.find("LTE")!=-1:
-                res1 = re.match(r'\+QENG: "LTE","(?P<is_tdd>.*?)",(?P<MCC>.*?),(?P<MNC>.*?),(?P<cellid>.*?),(?P<pcid>.*?),(?P<earfcn>.*?),(?P<freq_band_ind>.*?),(?P<UL_bandwidth>.*?),(?P<DL_bandwidth>.*?),(?P<TAC>.*?),(?P<RSRP>.*?),(?P<RSRQ>.*?),(?P<RSSI>.*?),(?P<SINR>.*?),(?P<CQI>.*?),(?P<tx_power>.*?),(?P<SRXLEV>.*?)',raw)
-                res2 = re.match(r'\+QENG: "servingcell","NOCONN","LTE","(?P<is_tdd>.*?)",(?P<MCC>.*?),(?P<MNC>.*?),(?P<cellid>.*?),(?P<pcid>.*?),(?P<earfcn>.*?),(?P<freq_band_ind>.*?),(?P<UL_bandwidth>.*?),(?P<DL_bandwidth>.*?),(?P<TAC>.*?),(?P<RSRP>.*?),(?P<RSRQ>.*?),(?P<RSSI>.*?),(?P<CQI>.*?),(?P<tx_power>.*?),(?P<SRXLEV>.*?),(?P<dltime>.*?)',raw)
-                if not res1 and not res2:
-                    print("Failed to match response: \""+raw+"\"")
-                    continue
-                if res1 and res2:
-                    print("LTE mode: logic error")
-                    continue
-                if res1:
-                    res = res1
-                if res2:
-                    res = res2
-                #print("LTE mode, res=",res)
-                results.update({'LTE': res.groupdict()})
-            elif raw.find("NR5G-NSA")!=-1:
-                res = re.match(r'\+QENG: "NR5G-NSA",(?P<MCC>.*?),(?P<MNC>.*?),(?P<pcid>.*?),(?P<rsrp>.*?),(?P<sinr>.*?),(?P<rsrq>.*?),(?P<arfcn>.*?),(?P<band>.*?),(?P<NR_DL_bandwidth>.*?),(?P<scs>.*?)',raw)
-                if not res:
-                    print("Failed to match response: \""+raw+"\"")
-                    continue
-                #print("5G mode, res=",res)
-                results.update({'5G': res.groupdict()})
-            elif raw=='+QENG: "servingcell","NOCONN"':
-                #print("normal result")
-                pass
-            elif raw=='AT+QENG="servingcell"':
-                #print("normal result")
-                pass
-            else:
-                print("connection type unknown",raw)
-        return results
+        return parse_servingcell(self.query('AT+QENG="servingcell"'))
 
-m = ModemWrapper('/dev/ttyUSB2')
+m = ModemWrapper(MODEM_PORT)
 
-counter = 0
+if SCAN_MODE:
+    scanner = ArfcnScanner(m.engine)
+    # Records go to the log; only per-ARFCN aggregates stay in memory
+    summary = ScanSummary()
+    locks = 0
+    pass_no = 0
+    start = time.monotonic()
+    try:
+        for record in scanner.scan(arfcn_seq, passes=arfcn_iterations):
+            arfcn_state = record['arfcn_state']
+            print(record, flush=True)
+            writer.write(record)
+            summary.add(record)
+            locks += 1
+            if record['pass'] > pass_no:
+                # Summary of the passes so far, as the next pass starts
+                pass_no = record['pass']
+                summary.print()
+    except KeyboardInterrupt:
+        pass
+    writer.close()
+    print(f"Scanned {locks} ARFCN locks in {time.monotonic() - start:.0f} s, log in {log_file}")
+    summary.print()
+    sys.exit(0)
+
+period = SAMPLE_PERIOD or calibrate(lambda: m.engine.query_many(BATCH))
+print(f"Sampling every {period}s ({1 / period:.2f} Hz)", flush=True)
+sampler = FixedRateSampler(period)
+report = RateReport(period)
 
 while True:
+    tick = sampler.wait()
     blob = {
-        'timestamp': time.time()}
+        'timestamp': time.time(),
+        'tick': tick}
     
-    try:
-        blob.update(m.query_servingcell())
-    except Exception as ex:
-        print("Exception getting serving cell info",ex, flush=True)
+    handles = m.engine.query_many(BATCH, timeout=max(2.0, period))
+    for handle in handles:
+        try:
+            lines = handle.check()
+            if handle.command == 'AT+QENG="servingcell"':
+                blob.update(parse_servingcell(lines))
+            else:
+                parse = BATCH_PARSERS.get(handle.command)
+                blob[BATCH_KEYS[handle.command]] = parse(lines) if parse else lines
+        except Exception as ex:
+            print("Exception getting", handle.command, ex, flush=True)
+    latencies = {handle.command: handle.latency for handle in handles}
+    blob['latency_ms'] = {BATCH_KEYS.get(c, 'servingcell'): round(l * 1000, 1)
+                          for c, l in latencies.items() if l is not None}
+    if sampler.skipped:
+        blob['skipped'] = sampler.skipped
+    report.add(latencies)
     
     print(blob, flush=True)
     
     try:
-        data.append(blob)
-        
-        # Append to the timestamped JSON file
-        with open(log_file, "w") as f:
-            json.dump(data, f, indent=2)
-        
-        # Set file permissions to 666 (read/write for everyone)
-        os.chmod(log_file, 0o666)
-        
-        print(f"Appended to {log_file} (total entries: {len(data)})", flush=True)
+        writer.write(blob)
+        print(f"Appended to {log_file} (total entries: {writer.count})", flush=True)
     except Exception as ex:
         print("Exception",ex, flush=True)
-    
-    time.sleep(1)
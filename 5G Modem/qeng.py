@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+import sys
+import time
+from datetime import datetime
+
+PREFIX = "+QENG: "
+MISSING = ("-", "")        # Fields the modem reports as not available
+
+# Field tables in response order (Quectel RM5xx AT manual, AT+QENG).
+# Kinds: "int" decimal, "hex" hexadecimal (cell id, TAC), "str" kept as text
+LTE_FIELDS = (
+    ("is_tdd", "str"), ("MCC", "int"), ("MNC", "int"), ("cellid", "hex"), ("pcid", "int"),
+    ("earfcn", "int"), ("freq_band_ind", "int"), ("UL_bandwidth", "int"), ("DL_bandwidth", "int"),
+    ("TAC", "hex"), ("RSRP", "int"), ("RSRQ", "int"), ("RSSI", "int"), ("SINR", "int"),
+    ("CQI", "int"), ("tx_power", "int"), ("SRXLEV", "int"))
+NSA_FIELDS = (
+    ("MCC", "int"), ("MNC", "int"), ("pcid", "int"), ("rsrp", "int"), ("sinr", "int"),
+    ("rsrq", "int"), ("arfcn", "int"), ("band", "int"), ("NR_DL_bandwidth", "int"), ("scs", "int"))
+SA_FIELDS = (
+    ("duplex_mode", "str"), ("MCC", "int"), ("MNC", "int"), ("cellid", "hex"), ("pcid", "int"),
+    ("TAC", "hex"), ("arfcn", "int"), ("band", "int"), ("NR_DL_bandwidth", "int"), ("rsrp", "int"),
+    ("rsrq", "int"), ("sinr", "int"), ("scs", "int"), ("srxlev", "int"))
+LTE_NEIGHBOUR_FIELDS = (
+    ("earfcn", "int"), ("pcid", "int"), ("RSRQ", "int"), ("RSRP", "int"), ("RSSI", "int"),
+    ("SINR", "int"), ("SRXLEV", "int"), ("cell_resel_priority", "int"))
+NR_NEIGHBOUR_FIELDS = (
+    ("arfcn", "int"), ("pcid", "int"), ("rsrp", "int"), ("rsrq", "int"), ("sinr", "int"))
+
+def to_number(s):
+    if s in MISSING:
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        return float(s)
+
+def to_hex(s):
+    return None if s in MISSING else int(s, 16)
+
+def hex_to_float(s):
+    return float(int(s, 16))
+
+def or_nan(convert, s):
+    """convert(s), or NaN for a missing or malformed field (e.g. a line cut off mid-value)"""
+    if s in MISSING:
+        return float("nan")
+    try:
+        return convert(s)
+    except ValueError:
+        return float("nan")
+
+def to_str(s):
+    return s
+
+CONVERTERS = {"int": to_number, "hex": to_hex, "str": to_str}
+
+class CellRecord(object):
+    """Typed fields of one +QENG line; subclasses set NAME, KEY (key in fg.py records) and FIELDS"""
+    __slots__ = ()
+    NAME = None
+    KEY = None
+    FIELDS = ()
+
+    def __init__(self, values):
+        for (name, kind), value in zip(self.FIELDS, values):
+            setattr(self, name, CONVERTERS[kind](value))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name, _ in self.FIELDS}
+
+    @classmethod
+    def dtype(cls):
+        """Structured-array layout for bulk parsing: numbers as float64 so missing fields are NaN"""
+        import numpy as np
+        return np.dtype([("line", np.int64), ("time", np.float64)] +
+                        [(name, "U8" if kind == "str" else np.float64) for name, kind in cls.FIELDS])
+
+class LteCell(CellRecord):
+    NAME = "LTE"
+    KEY = "LTE"
+    FIELDS = LTE_FIELDS
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class NsaCell(CellRecord):
+    NAME = "NR5G-NSA"
+    KEY = "5G"
+    FIELDS = NSA_FIELDS
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class SaCell(CellRecord):
+    NAME = "NR5G-SA"
+    KEY = "5G"
+    FIELDS = SA_FIELDS
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class LteIntraNeighbour(CellRecord):
+    NAME = "LTE intra"
+    FIELDS = LTE_NEIGHBOUR_FIELDS + (("s_non_intra_search", "int"), ("thresh_serving_low", "int"), ("s_intra_search", "int"))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class LteInterNeighbour(CellRecord):
+    NAME = "LTE inter"
+    FIELDS = LTE_NEIGHBOUR_FIELDS + (("threshX_low", "int"), ("threshX_high", "int"))
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+class NrNeighbour(CellRecord):
+    NAME = "NR"
+    FIELDS = NR_NEIGHBOUR_FIELDS
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+# (first quoted field, RAT field) → record type. Serving cell lines carry a state
+# before the RAT; in EN-DC mode the LTE and NR5G-NSA lines start with the RAT itself
+LAYOUTS = {
+    ("servingcell", "LTE"): LteCell,
+    ("servingcell", "NR5G-SA"): SaCell,
+    ("LTE", None): LteCell,
+    ("NR5G-NSA", None): NsaCell,
+    ("neighbourcell intra", "LTE"): LteIntraNeighbour,
+    ("neighbourcell inter", "LTE"): LteInterNeighbour,
+    ("neighbourcell", "NR"): NrNeighbour,
+    ("neighbourcell", "NR5G"): NrNeighbour,
+}
+PADDING = ["-"] * max(len(cls.FIELDS) for cls in LAYOUTS.values())
+
+def split(line, at=0):
+    """'+QENG: "servingcell","NOCONN","LTE",...' → (layout key, state, field strings)"""
+    parts = line[at + len(PREFIX):].rstrip().replace('"', '').split(',')
+    head = parts[0]
+    if head == "servingcell":
+        if len(parts) < 3:
+            return (head, None), parts[1] if len(parts) > 1 else None, []
+        return (head, parts[2]), parts[1], parts[3:]
+    if head.startswith("neighbourcell"):
+        return (head, parts[1] if len(parts) > 1 else None), None, parts[2:]
+    return (head, None), None, parts[1:]
+
+def parse_line(line):
+    """Parse one +QENG line into (state, record); raises ValueError on an unknown layout"""
+    key, state, values = split(line)
+    if key == ("servingcell", None):
+        return state, None
+    cls = LAYOUTS.get(key)
+    if cls is None:
+        raise ValueError("Unknown +QENG layout: " + line)
+    if len(values) < len(cls.FIELDS):
+        values = values + PADDING[:len(cls.FIELDS) - len(values)]
+    return state, cls(values)
+
+def parse_servingcell(lines):
+    """AT+QENG="servingcell" response → {'state': ..., 'rat': ..., 'LTE': {...}, '5G': {...}}"""
+    results = {}
+    for line in lines:
+        if not line.startswith(PREFIX):
+            continue  # command echo
+        try:
+            state, record = parse_line(line)
+        except ValueError:
+            print("Failed to match response: \"" + line + "\"", flush=True)
+            continue
+        if state is not None:
+            results['state'] = state
+        if record is not None:
+            results[record.KEY] = record.as_dict()
+            results['rat'] = record.NAME
+    return results
+
+def parse_neighbours(lines):
+    """AT+QENG="neighbourcell" response → list of dicts, each tagged with its 'cell' type"""
+    neighbours = []
+    for line in lines:
+        if not line.startswith(PREFIX):
+            continue
+        try:
+            _, record = parse_line(line)
+        except ValueError:
+            print("Failed to match response: \"" + line + "\"", flush=True)
+            continue
+        if record is not None:
+            neighbours.append(dict(cell=record.NAME, **record.as_dict()))
+    return neighbours
+
+def parse_time(prefix):
+    """Transcript line prefix ('12.345' seconds or '2025-11-10 13:49:29') → seconds, NaN if none"""
+    prefix = prefix.strip()
+    if not prefix:
+        return float("nan")
+    try:
+        return float(prefix)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(prefix[:19], "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return float("nan")
+
+def parse_transcript(lines):
+    """Bulk-parse AT transcript lines into one structured array per record type (keyed by NAME).
+
+    Lines are only split per row; conversion then runs a column at a time,
+    so the per-line cost is a split and a dict lookup. Each row keeps its
+    transcript line number and the optional timestamp written before '+QENG:'.
+    """
+    import numpy as np
+
+    tables = {}
+    for n, line in enumerate(lines):
+        at = line.find(PREFIX)
+        if at < 0:
+            continue
+        key, _, values = split(line, at)
+        cls = LAYOUTS.get(key)
+        if cls is None:
+            continue
+        width = len(cls.FIELDS)
+        if len(values) != width:
+            values = (values + PADDING)[:width]
+        table = tables.get(cls)
+        if table is None:
+            table = tables[cls] = ([], [], [])
+        table[0].append(values)
+        table[1].append(n)
+        table[2].append(line[:at])
+
+    arrays = {}
+    for cls, (rows, numbers, prefixes) in tables.items():
+        array = np.empty(len(rows), dtype=cls.dtype())
+        array["line"] = numbers
+        array["time"] = [parse_time(p) for p in prefixes] if any(prefixes) else np.nan
+        # Transpose once, then convert whole columns; only columns holding a '-' or a bad value take the slow path
+        for (name, kind), column in zip(cls.FIELDS, zip(*rows)):
+            if kind == "str":
+                array[name] = column
+                continue
+            convert = float if kind == "int" else hex_to_float
+            values = None
+            if "-" not in column and "" not in column:
+                try:
+                    values = np.fromiter(map(convert, column), dtype=np.float64, count=len(column))
+                except ValueError:
+                    pass
+            if values is None:
+                values = np.fromiter((or_nan(convert, v) for v in column), dtype=np.float64, count=len(column))
+            array[name] = values
+        arrays[cls.NAME] = array
+    return arrays
+
+def parse_files(paths):
+    """parse_transcript over several files, concatenating arrays of the same record type"""
+    import numpy as np
+
+    parts = {}
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for name, array in parse_transcript(f).items():
+                parts.setdefault(name, []).append(array)
+    return {name: np.concatenate(arrays) for name, arrays in parts.items()}
+
+def main():
+    import numpy as np
+
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} [--npz out.npz] transcript.log ...")
+        sys.exit(1)
+    args = sys.argv[1:]
+    npz_path = None
+    if args[0] == "--npz":
+        npz_path, args = args[1], args[2:]
+
+    start = time.monotonic()
+    arrays = parse_files(args)
+    elapsed = time.monotonic() - start
+    total = sum(len(a) for a in arrays.values())
+    print(f"Parsed {total} records from {len(args)} files in {elapsed:.2f} s")
+    print("{:<12} {:<10} {:<12} {:<12}".format("Type", "Records", "Mean RSRP", "Mean SINR"))
+    for name, array in sorted(arrays.items()):
+        rsrp = array["RSRP" if "RSRP" in array.dtype.names else "rsrp"]
+        sinr = array["SINR" if "SINR" in array.dtype.names else "sinr"]
+        print("{:<12} {:<10} {:<12.2f} {:<12.2f}".format(name, len(array), np.nanmean(rsrp), np.nanmean(sinr)))
+
+    if npz_path:
+        np.savez(npz_path, **{name.replace(" ", "_").replace("-", "_"): a for name, a in arrays.items()})
+        print(f"Wrote {npz_path}")
+
+if __name__ == "__main__":
+    main()
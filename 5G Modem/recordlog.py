@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import time
+
+# Configuration
+FSYNC_INTERVAL = 5.0       # Seconds between fsyncs; a crash loses at most this much data
+FSYNC_RECORDS = 50         # ...or this many records, whichever comes first
+
+class RecordWriter(object):
+    """Append-only JSON Lines log: one record per line, flushed every write, fsynced in batches"""
+
+    def __init__(self, path, mode=0o666):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        try:
+            os.chmod(path, mode)
+        except OSError as ex:
+            print("Could not set permissions on", path, ex, flush=True)
+        self.count = 0
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.file.flush()
+        self.count += 1
+        self.unsynced += 1
+        if self.unsynced >= FSYNC_RECORDS or time.monotonic() - self.last_sync >= FSYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+
+def iter_records(path):
+    """Yield records from a .jsonl log, or from an old-style .json array log"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            for record in json.load(f):
+                yield record
+            return
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Last line of a log cut off mid-write
+                print("Skipping truncated record in", path, file=sys.stderr)
+
+def flatten(record, prefix=""):
+    """{'LTE': {'RSRP': '-67'}} → {'LTE.RSRP': '-67'}"""
+    flat = {}
+    for key, value in record.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        else:
+            flat[name] = value
+    return flat
+
+def to_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def load_columns(path):
+    """Load a log into a dict of numpy arrays, one per flattened field.
+
+    Fields whose values are all numeric (or missing) become float arrays with
+    NaN for missing entries; anything else becomes an object array.
+    """
+    import numpy as np
+
+    columns = {}
+    n = 0
+    for record in iter_records(path):
+        for key, value in flatten(record).items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [None] * n
+            column.append(value)
+        n += 1
+        for column in columns.values():
+            if len(column) < n:
+                column.append(None)
+
+    arrays = {}
+    for key, values in columns.items():
+        numbers = [to_number(v) for v in values]
+        if all(x is not None or v is None or v == "-" for x, v in zip(numbers, values)):
+            arrays[key] = np.array([np.nan if x is None else x for x in numbers], dtype=float)
+        else:
+            arrays[key] = np.array(values, dtype=object)
+    return arrays
+
+def main():
+    import numpy as np
+
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} log.jsonl ...")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        columns = load_columns(path)
+        n = len(next(iter(columns.values()))) if columns else 0
+        print(f"{path}: {n} records")
+        for key, values in sorted(columns.items()):
+            if values.dtype == float:
+                valid = values[~np.isnan(values)]
+                summary = f"mean {valid.mean():.2f}" if len(valid) else "empty"
+                print(f"  {key:<28} float  {len(valid):>7} values  {summary}")
+            else:
+                print(f"  {key:<28} text   {len(values):>7} values")
+
+if __name__ == "__main__":
+    main()
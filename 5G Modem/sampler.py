@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import time
+
+# Configuration
+MIN_PERIOD = 0.05          # Never poll faster than 20 Hz
+CALIBRATION_CYCLES = 10    # Back-to-back batches used to measure what the modem sustains
+HEADROOM = 1.2             # Period = slowest calibration cycle * HEADROOM
+REPORT_INTERVAL = 10.0     # Seconds between rate/latency reports
+
+class FixedRateSampler(object):
+    """Ticks at start + k * period on the monotonic clock, so sampling never drifts.
+
+    A cycle that overruns its slot skips the ticks it missed (counted in
+    self.skipped) instead of firing them back to back.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.start = time.monotonic()
+        self.tick = 0
+        self.skipped = 0
+
+    def wait(self):
+        """Sleep until the next tick and return its index"""
+        self.tick += 1
+        target = self.start + self.tick * self.period
+        now = time.monotonic()
+        if now > target:
+            missed = int((now - target) // self.period) + 1
+            self.skipped += missed
+            self.tick += missed
+            target = self.start + self.tick * self.period
+        time.sleep(max(0.0, target - time.monotonic()))
+        return self.tick
+
+def calibrate(run_cycle, cycles=CALIBRATION_CYCLES):
+    """Run cycles back to back and return a period the modem can sustain"""
+    durations = []
+    for _ in range(cycles):
+        start = time.monotonic()
+        run_cycle()
+        durations.append(time.monotonic() - start)
+    period = max(MIN_PERIOD, max(durations) * HEADROOM)
+    # Round up to 10 ms so the logged cadence is a readable number
+    return round(-(-period // 0.01) * 0.01, 2)
+
+class RateReport(object):
+    """Collects per-cycle timings and per-command latencies, printing a summary every REPORT_INTERVAL"""
+
+    def __init__(self, period):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.window_start = time.monotonic()
+        self.cycles = 0
+        self.latencies = {}
+
+    def add(self, latencies):
+        self.cycles += 1
+        for command, latency in latencies.items():
+            if latency is not None:
+                self.latencies.setdefault(command, []).append(latency)
+        elapsed = time.monotonic() - self.window_start
+        if elapsed >= REPORT_INTERVAL:
+            self.report(elapsed)
+            self.reset()
+
+    def report(self, elapsed):
+        print(f"Sampling at {self.cycles / elapsed:.2f} Hz (target {1 / self.period:.2f} Hz)", flush=True)
+        for command, values in self.latencies.items():
+            values = sorted(values)
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            print(f"  {command:<28} mean {sum(values) / len(values) * 1000:7.1f} ms  "
+                  f"p95 {p95 * 1000:7.1f} ms  max {values[-1] * 1000:7.1f} ms", flush=True)
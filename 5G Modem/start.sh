@@ -49,8 +49,13 @@ else
     SELECTED_SCRIPT="down.py"
 fi
 
-# Copy fg.py
+# Copy fg.py and the modules it imports
 cp "$RUNNING_DIR/fg.py" "$TARGET_DIR/"
+cp "$RUNNING_DIR/atengine.py" "$TARGET_DIR/"
+cp "$RUNNING_DIR/recordlog.py" "$TARGET_DIR/"
+cp "$RUNNING_DIR/sampler.py" "$TARGET_DIR/"
+cp "$RUNNING_DIR/qeng.py" "$TARGET_DIR/"
+cp "$RUNNING_DIR/arfcnscan.py" "$TARGET_DIR/"
 
 # ============================
 # STEP 4: Launch Python tasks with delay in separate terminals
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+
+import numpy as np
+
+from latency import fmt
+
+# Default join rules, per stream: how a grid time t picks its value
+GRID_STEP = 1.0            # s, spacing of the output time grid
+PING_RULE = ("window", 0.5, 0.5)    # mean RTT of pings in [t - 0.5, t + 0.5)
+IPERF_RULE = ("nearest", 1.0)       # iperf interval line within 1 s
+MODEM_RULE = ("backward", 2.0)      # last fg.py sample no older than 2 s
+ARUBA_RULE = ("backward", 5.0)      # last client-table snapshot no older than 5 s
+
+class Stream(object):
+    """A time series: sorted epoch-second times plus named float columns"""
+
+    def __init__(self, name, t, columns, rule):
+        order = np.argsort(t, kind="stable")
+        self.name = name
+        self.t = np.asarray(t, dtype=float)[order]
+        self.columns = {key: np.asarray(values, dtype=float)[order] for key, values in columns.items()}
+        self.rule = rule
+
+def ping_stream(path, rule=PING_RULE):
+    from latency import load_ping
+    packets = load_ping(path)
+    return Stream("ping", packets["timestamp_ms"] / 1000.0, {"rtt": packets["rtt"]}, rule)
+
+def iperf_stream(path, rule=IPERF_RULE):
+    from throughput import load_iperf
+    intervals, _ = load_iperf(path)
+    intervals = intervals[~np.isnan(intervals["timestamp"])]
+    return Stream("iperf", intervals["timestamp"], {"mbps": intervals["mbps"], "retr": intervals["retr"]}, rule)
+
+def modem_stream(path, rule=MODEM_RULE):
+    """Numeric columns of an fg.py log (LTE.RSRP, 5G.SINR, latency_ms, ...)"""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "5G Modem"))
+    from recordlog import load_columns
+    columns = load_columns(path)
+    t = columns.pop("timestamp")
+    numeric = {key: values for key, values in columns.items() if values.dtype == float and key != "tick"}
+    return Stream("modem", t, numeric, rule)
+
+def aruba_stream(path, mac, rule=ARUBA_RULE):
+    from aruba import load_aruba
+    clients, _ = load_aruba(path)
+    rows = clients[clients["mac"] == mac.lower()]
+    return Stream("aruba", rows["timestamp_ms"] / 1000.0,
+                  {field: rows[field] for field in ("ack_snr", "rx_snr", "tx_rate", "rx_rate")}, rule)
+
+def asof(left, right, tolerance, direction="backward"):
+    """Index into right for each left time, -1 where nothing is within tolerance.
+
+    backward: last right <= t; forward: first right >= t; nearest: either,
+    ties going backward. Both inputs must be sorted.
+    """
+    n = len(right)
+    if not n:
+        return np.full(len(left), -1)
+    after = np.searchsorted(right, left, side="left")      # first right >= t
+    before = np.searchsorted(right, left, side="right") - 1  # last right <= t
+    if direction == "backward":
+        index = before
+    elif direction == "forward":
+        index = np.where(after < n, after, -1)
+    elif direction == "nearest":
+        back_gap = np.where(before >= 0, left - right[np.maximum(before, 0)], np.inf)
+        fwd_gap = np.where(after < n, right[np.minimum(after, n - 1)] - left, np.inf)
+        index = np.where(back_gap <= fwd_gap, before, np.where(after < n, after, -1))
+    else:
+        raise ValueError(f"Unknown as-of direction {direction!r}")
+    valid = index >= 0
+    gap = np.full(len(left), np.inf)
+    gap[valid] = np.abs(left[valid] - right[index[valid]])
+    return np.where(gap <= tolerance, index, -1)
+
+def window(left, right, before, after):
+    """[lo, hi) index ranges of right times in [t - before, t + after) for each left time"""
+    return np.searchsorted(right, left - before, side="left"), np.searchsorted(right, left + after, side="left")
+
+def window_mean(values, lo, hi):
+    """NaN-aware mean and count of values[lo:hi] for every range, from prefix sums"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    n = counts[hi] - counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[hi] - sums[lo]) / n, np.nan), n
+
+def window_extreme(values, lo, hi, reduce=np.fmax):
+    """NaN-aware max (or min with np.fmin) of values[lo:hi] for every range.
+
+    Builds the power-of-two levels of a sparse table, then answers each
+    range from two overlapping blocks, one level at a time.
+    """
+    out = np.full(len(lo), np.nan)
+    width = hi - lo
+    levels = [values]
+    while 2 ** len(levels) <= max(1, int(width.max(initial=0))):
+        prev = levels[-1]
+        step = 2 ** (len(levels) - 1)
+        levels.append(reduce(prev[:-step], prev[step:]))
+    level = np.zeros(len(lo), dtype=np.int64)
+    nonempty = width > 0
+    level[nonempty] = np.floor(np.log2(width[nonempty])).astype(np.int64)
+    for k in np.unique(level[nonempty]):
+        sel = nonempty & (level == k)
+        table = levels[k]
+        out[sel] = reduce(table[lo[sel]], table[hi[sel] - 2 ** k])
+    return out
+
+def join(grid, stream):
+    """Columns of stream sampled onto grid times under the stream's rule"""
+    kind = stream.rule[0]
+    out = {}
+    if kind == "window":
+        lo, hi = window(grid, stream.t, stream.rule[1], stream.rule[2])
+        for key, values in stream.columns.items():
+            out[f"{stream.name}.{key}"], _ = window_mean(values, lo, hi)
+            out[f"{stream.name}.{key}_max"] = window_extreme(values, lo, hi)
+        out[f"{stream.name}.count"] = (hi - lo).astype(float)
+    else:
+        index = asof(grid, stream.t, stream.rule[1], kind)
+        hit = index >= 0
+        for key, values in stream.columns.items():
+            column = np.full(len(grid), np.nan)
+            valid = ~np.isnan(values)
+            if valid.all():
+                column[hit] = values[index[hit]]
+            elif valid.any():
+                # Match against this column's own samples, so a "-" doesn't hide an older value
+                matched = asof(grid, stream.t[valid], stream.rule[1], kind)
+                column[matched >= 0] = values[valid][matched[matched >= 0]]
+            # else: no sample at all (e.g. Retr on a -R log), the column stays NaN
+            out[f"{stream.name}.{key}"] = column
+        age = np.full(len(grid), np.nan)
+        age[hit] = grid[hit] - stream.t[index[hit]]
+        out[f"{stream.name}.age"] = age
+    return out
+
+def align(streams, step=GRID_STEP, start=None, end=None):
+    """One columnar dataset on a regular time grid over the span all streams share"""
+    spans = [(s.t[0], s.t[-1]) for s in streams if len(s.t)]
+    if not spans:
+        return {"time": np.empty(0)}
+    start = max(a for a, _ in spans) if start is None else start
+    end = min(b for _, b in spans) if end is None else end
+    grid = np.arange(np.ceil(start), end + step / 2, step) if end >= start else np.empty(0)
+    columns = {"time": grid}
+    for stream in streams:
+        columns.update(join(grid, stream))
+    return columns
+
+def save(columns, path):
+    if path.endswith(".npz"):
+        np.savez_compressed(path, **columns)
+    else:
+        names = list(columns)
+        np.savetxt(path, np.column_stack([columns[k] for k in names]), delimiter=",",
+                   header=",".join(names), comments="", fmt="%.15g")
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--ping ping.txt] [--iperf iperf3.txt] [--modem modem_status.jsonl] "
+              "[--aruba ap.txt MAC] [--step s] [--tolerance name s] [--out aligned.npz|.csv]")
+        sys.exit(1)
+    sources = []
+    tolerances = {}
+    step = GRID_STEP
+    out_path = None
+    while args:
+        option = args.pop(0)
+        if option in ("--ping", "--iperf", "--modem"):
+            sources.append((option[2:], [args.pop(0)]))
+        elif option == "--aruba":
+            sources.append(("aruba", [args.pop(0), args.pop(0)]))
+        elif option == "--step":
+            step = float(args.pop(0))
+        elif option == "--tolerance":
+            name = args.pop(0)
+            tolerances[name] = float(args.pop(0))
+        elif option == "--out":
+            out_path = args.pop(0)
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    loaders = {"ping": ping_stream, "iperf": iperf_stream, "modem": modem_stream, "aruba": aruba_stream}
+    start = time.monotonic()
+    streams = [loaders[kind](*paths) for kind, paths in sources]
+    names = [s.name for s in streams]
+    for i, stream in enumerate(streams):
+        if names.count(stream.name) > 1:
+            stream.name += str(names[:i].count(stream.name) + 1)      # aruba1, aruba2, ...
+        if stream.name in tolerances:
+            rule = stream.rule
+            stream.rule = (rule[0], tolerances[stream.name], tolerances[stream.name]) if rule[0] == "window" \
+                else (rule[0], tolerances[stream.name])
+    loaded = time.monotonic()
+    columns = align(streams, step)
+    joined = time.monotonic()
+    grid = columns["time"]
+    print(f"Loaded {sum(len(s.t) for s in streams)} samples in {loaded - start:.2f} s, "
+          f"joined onto {len(grid)} grid points in {joined - loaded:.2f} s\n")
+
+    print("{:<24} {:<10} {:<10} {:<10} {:<10}".format("Column", "Coverage%", "Mean", "Min", "Max"))
+    for key, values in columns.items():
+        if key == "time":
+            continue
+        valid = values[~np.isnan(values)]
+        print("{:<24} {:<10} {:<10} {:<10} {:<10}".format(
+            key[:24], fmt(len(valid) / len(values) * 100 if len(values) else 0, 1),
+            fmt(valid.mean() if len(valid) else np.nan), fmt(valid.min() if len(valid) else np.nan),
+            fmt(valid.max() if len(valid) else np.nan)))
+
+    if out_path:
+        save(columns, out_path)
+        print(f"\nWrote {out_path}")
+
+if __name__ == "__main__":
+    main()
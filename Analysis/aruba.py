@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from latency import fmt, local_to_epoch_ms
+
+# Aruba captures (commands.txt) are command outputs separated by "/////", each
+# with a "LocalBeginTime: <n> (2025-10-27T14:43:05.123)" header
+SECTION_SEPARATOR = "/////"
+TIME_RE = re.compile(r'LocalBeginTime:\s*(\d+)\s*\(([^)]+)\)')
+SNAPSHOT_MARKERS = ("Client Table", "Number of Clients")
+
+# "show ap debug client-table" rows, columns 0-16 as snr.html reads them:
+# 0 MAC, 1 ESSID, 2 BSSID, 3 Assoc_State, 4 HT_State, 5 AID, 6 PS_State, 7 UAPSD, 8 TWT,
+# 9 Tx_Pkts, 10 Rx_Pkts, 11 PS_Qlen, 12 Tx_Retries, 13 Tx_Rate, 14 Rx_Rate,
+# 15 Last_ACK_SNR, 16 Last_Rx_SNR
+MAC = r'[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}'
+NUMBER = r'(-?\d+(?:\.\d+)?)?\S*'    # leading number of "866", "24(0)"; empty for "-"
+CLIENT_RE = re.compile(
+    rf'^[ \t]*({MAC})[ \t]+(\S+)[ \t]+({MAC})[ \t]+(\S+)[ \t]+\S+[ \t]+\S+[ \t]+\S+[ \t]+\S+[ \t]+\S+'
+    r'[ \t]+(\d+)[ \t]+(\d+)[ \t]+\S+[ \t]+(\d+)[ \t]+' + r'[ \t]+'.join([NUMBER] * 4),
+    re.MULTILINE)
+
+CLIENT_DTYPE = np.dtype([
+    ("timestamp_ms", np.float64),  # LocalBeginTime of the section, epoch ms
+    ("ap", np.int16),              # index of the capture file (AP1, AP2, ... in the HTML tools)
+    ("mac", "U17"),
+    ("essid", "U32"),
+    ("bssid", "U17"),
+    ("associated", np.bool_),
+    ("tx_pkts", np.int64),         # cumulative counters
+    ("rx_pkts", np.int64),
+    ("tx_retries", np.int64),
+    ("tx_rate", np.float32),       # Mbps; NaN when the AP prints no number
+    ("rx_rate", np.float32),
+    ("ack_snr", np.float32),       # Last_ACK_SNR, dB; NaN when not a number
+    ("rx_snr", np.float32),        # Last_Rx_SNR
+])
+
+def section_times(stamps):
+    """LocalBeginTime strings (fraction dropped, as snr.html does) → epoch ms"""
+    return local_to_epoch_ms(np.array([s.split(".")[0] for s in stamps], dtype="datetime64[s]"))
+
+def parse_aruba_text(text, ap=0):
+    """Aruba capture → (client rows, snapshot times in epoch ms).
+
+    Rows are every client-table entry for every client. Snapshot times are
+    the sections that printed a client table or client count; a client
+    missing from one was absent at that time (present=0 in snr.html).
+    """
+    stamps = []
+    row_section = []
+    rows = []
+    snapshots = []
+    current = -1
+    for section in text.split(SECTION_SEPARATOR):
+        m = TIME_RE.search(section)
+        if m:
+            stamps.append(m.group(2))
+            current = len(stamps) - 1
+        if current < 0:
+            continue
+        found = CLIENT_RE.findall(section)
+        if found or any(marker in section for marker in SNAPSHOT_MARKERS):
+            snapshots.append(current)
+        if found:
+            rows += found
+            row_section += [current] * len(found)
+
+    times = section_times(stamps) if stamps else np.empty(0)
+    clients = np.empty(len(rows), dtype=CLIENT_DTYPE)
+    if rows:
+        mac, essid, bssid, state, tx, rx, retries, tx_rate, rx_rate, ack, rx_snr = zip(*rows)
+        clients["timestamp_ms"] = times[np.array(row_section)]
+        clients["ap"] = ap
+        clients["mac"] = np.char.lower(np.array(mac))
+        clients["essid"] = essid
+        clients["bssid"] = np.char.lower(np.array(bssid))
+        clients["associated"] = np.array(state) == "Associated"
+        clients["tx_pkts"] = np.fromiter(map(int, tx), np.int64, len(rows))
+        clients["rx_pkts"] = np.fromiter(map(int, rx), np.int64, len(rows))
+        clients["tx_retries"] = np.fromiter(map(int, retries), np.int64, len(rows))
+        for field, column in (("tx_rate", tx_rate), ("rx_rate", rx_rate), ("ack_snr", ack), ("rx_snr", rx_snr)):
+            clients[field] = np.fromiter((float(v) if v else np.nan for v in column), np.float64, len(rows))
+    snapshot_times = np.unique(times[np.array(snapshots, dtype=np.int64)]) if snapshots else np.empty(0)
+    return clients, snapshot_times
+
+def load_aruba(path, ap=0):
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return parse_aruba_text(f.read(), ap)
+
+class ClientTable(object):
+    """All clients of one or more Aruba captures, indexed for per-MAC time slices.
+
+    Rows are grouped by (ap, mac) and sorted by time within each group, so
+    one client's rows are a contiguous block and a time slice of that block
+    is two binary searches.
+    """
+
+    def __init__(self, clients, snapshots):
+        self.snapshots = snapshots      # {ap: sorted snapshot times}
+        keys = np.char.add(clients["ap"].astype("U4"), np.char.add("/", clients["mac"]))
+        self.keys, codes = np.unique(keys, return_inverse=True)
+        order = np.lexsort((clients["timestamp_ms"], codes))
+        self.clients = clients[order]
+        self.bounds = np.searchsorted(codes[order], np.arange(len(self.keys) + 1))
+
+    @classmethod
+    def from_files(cls, paths):
+        parsed = [load_aruba(path, ap) for ap, path in enumerate(paths)]
+        clients = np.concatenate([c for c, _ in parsed]) if parsed else np.empty(0, dtype=CLIENT_DTYPE)
+        return cls(clients, {ap: s for ap, (_, s) in enumerate(parsed)})
+
+    def macs(self, ap=None):
+        pairs = [key.split("/", 1) for key in self.keys]
+        return sorted({mac for a, mac in pairs if ap is None or int(a) == ap})
+
+    def client(self, mac, ap=0, start_ms=None, end_ms=None):
+        """Rows of one client on one AP with start_ms <= time <= end_ms"""
+        i = np.searchsorted(self.keys, f"{ap}/{mac.lower()}")
+        if i == len(self.keys) or self.keys[i] != f"{ap}/{mac.lower()}":
+            return self.clients[:0]
+        block = self.clients[self.bounds[i]:self.bounds[i + 1]]
+        t = block["timestamp_ms"]
+        lo = 0 if start_ms is None else np.searchsorted(t, start_ms, side="left")
+        hi = len(block) if end_ms is None else np.searchsorted(t, end_ms, side="right")
+        return block[lo:hi]
+
+    def presence(self, mac, ap=0, start_ms=None, end_ms=None):
+        """(snapshot times, 1/0 present) for one client, as snr.html plots it"""
+        snaps = self.snapshots.get(ap, np.empty(0))
+        lo = 0 if start_ms is None else np.searchsorted(snaps, start_ms, side="left")
+        hi = len(snaps) if end_ms is None else np.searchsorted(snaps, end_ms, side="right")
+        snaps = snaps[lo:hi]
+        seen = self.client(mac, ap, start_ms, end_ms)["timestamp_ms"]
+        return snaps, np.isin(snaps, seen).astype(np.int8)
+
+def counter_delta(values):
+    """Increase of a cumulative counter, ignoring drops (client re-association resets it)"""
+    steps = np.diff(values)
+    return int(steps[steps > 0].sum())
+
+def client_stats(rows, snapshots=None):
+    if not len(rows):
+        return None
+    tx = counter_delta(rows["tx_pkts"])
+    retries = counter_delta(rows["tx_retries"])
+    result = {
+        "samples": len(rows),
+        "bssids": ",".join(np.unique(rows["bssid"])),
+        "present_percent": len(rows) / len(snapshots) * 100 if snapshots is not None and len(snapshots) else 100.0,
+        "tx_pkts": tx,
+        "rx_pkts": counter_delta(rows["rx_pkts"]),
+        "retry_percent": retries / tx * 100 if tx else 0.0,
+    }
+    for field in ("ack_snr", "rx_snr", "tx_rate", "rx_rate"):
+        values = rows[field][~np.isnan(rows[field])]
+        result[f"{field}_mean"] = float(values.mean()) if len(values) else np.nan
+        result[f"{field}_min"] = float(values.min()) if len(values) else np.nan
+        result[f"{field}_max"] = float(values.max()) if len(values) else np.nan
+    return result
+
+def iperf_slice(path):
+    """(first, last) timestamp of an iperf3 --timestamps log in epoch ms, as handleSliceFile() reads it"""
+    from throughput import load_iperf
+    intervals, _ = load_iperf(path)
+    stamps = intervals["timestamp"][~np.isnan(intervals["timestamp"])]
+    return (stamps[0] * 1000, stamps[-1] * 1000) if len(stamps) else None
+
+def clock_slice(table, start, end):
+    """HH:MM:SS slice → epoch ms on the day of the capture's first snapshot"""
+    first = min((s[0] for s in table.snapshots.values() if len(s)), default=0)
+    midnight = time.mktime(time.localtime(first / 1000)[:3] + (0, 0, 0, 0, 0, -1))
+    def ms(clock):
+        h, m, s = map(int, clock.split(":"))
+        return (midnight + h * 3600 + m * 60 + s) * 1000
+    return ms(start), ms(end)
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} aruba_ap1.txt [aruba_ap2.txt ...] [--mac MAC ...] "
+              "[--slice HH:MM:SS HH:MM:SS ...] [--slice-from iperf.txt ...]")
+        sys.exit(1)
+    paths, macs, clock_slices, iperf_logs = [], [], [], []
+    while args:
+        option = args.pop(0)
+        if option == "--mac":
+            macs.append(args.pop(0).lower())
+        elif option == "--slice":
+            clock_slices.append((args.pop(0), args.pop(0)))
+        elif option == "--slice-from":
+            iperf_logs.append(args.pop(0))
+        elif option.startswith("--"):
+            print("Unknown option", option)
+            sys.exit(1)
+        else:
+            paths.append(option)
+
+    start = time.monotonic()
+    table = ClientTable.from_files(paths)
+    print(f"{len(table.clients)} client rows, {len(table.keys)} clients on {len(paths)} APs, "
+          f"parsed in {time.monotonic() - start:.2f} s")
+
+    slices = [(f"{a}-{b}", *clock_slice(table, a, b)) for a, b in clock_slices]
+    for path in iperf_logs:
+        bounds = iperf_slice(path)
+        if bounds is None:
+            print(f"Could not find valid time range in {path}")
+        else:
+            slices.append((os.path.basename(path), *bounds))
+    if not slices:
+        slices = [("all", None, None)]
+
+    for label, start_ms, end_ms in slices:
+        print(f"\nSlice {label}")
+        print("{:<4} {:<18} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            "AP", "MAC", "Samples", "Present%", "AckSNR", "RxSNR", "MinSNR", "TxRate", "RxRate", "Retry%"))
+        for ap in range(len(paths)):
+            snaps = table.snapshots[ap]
+            lo = 0 if start_ms is None else np.searchsorted(snaps, start_ms, side="left")
+            hi = len(snaps) if end_ms is None else np.searchsorted(snaps, end_ms, side="right")
+            for mac in macs or table.macs(ap):
+                s = client_stats(table.client(mac, ap, start_ms, end_ms), snaps[lo:hi])
+                if s is None:
+                    continue
+                print("{:<4} {:<18} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+                    f"AP{ap + 1}", mac, s["samples"], fmt(s["present_percent"], 1), fmt(s["ack_snr_mean"], 1),
+                    fmt(s["rx_snr_mean"], 1), fmt(float(np.fmin(s["ack_snr_min"], s["rx_snr_min"])), 0),
+                    fmt(s["tx_rate_mean"], 0), fmt(s["rx_rate_mean"], 0), fmt(s["retry_percent"])))
+
+if __name__ == "__main__":
+    main()
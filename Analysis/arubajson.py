@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import json
+import re
+import sys
+import time
+
+from aruba import CLIENT_RE, MAC, SECTION_SEPARATOR, TIME_RE
+from latency import local_to_epoch_ms
+
+READ_CHUNK = 1 << 22       # Bytes read per step; memory stays at about one chunk plus one section
+ARROW_BATCH = 65536        # Client rows per Arrow record batch
+
+NOISE_RE = re.compile(r'Current Noise Floor\s+(\d+)')
+CLIENT_COUNT_RE = re.compile(r'Number of Clients\s*:\s*(\d+)')
+# "show clients" rows carry the signal as "39(good)"
+SIGNAL_RE = re.compile(rf'^.*?({MAC}).*?\s(\d+)\((?:good|fair|poor)\)', re.MULTILINE)
+
+CLIENT_FIELDS = ("mac", "essid", "bssid", "assoc_state", "tx_pkts", "rx_pkts", "tx_retries",
+                 "tx_rate", "rx_rate", "last_ack_snr", "last_rx_snr")
+
+def iter_sections(f, chunk=READ_CHUNK):
+    """Yield the "/////"-separated sections of an open log without reading it all"""
+    pending = ""
+    while True:
+        data = f.read(chunk)
+        if not data:
+            break
+        parts = (pending + data).split(SECTION_SEPARATOR)
+        pending = parts.pop()
+        for part in parts:
+            yield part
+    if pending:
+        yield pending
+
+def number(text):
+    if not text:
+        return None
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+def client_row(match):
+    mac, essid, bssid, state, tx, rx, retries, tx_rate, rx_rate, ack, rx_snr = match
+    return {"mac": mac.lower(), "essid": essid, "bssid": bssid.lower(), "assoc_state": state,
+            "tx_pkts": int(tx), "rx_pkts": int(rx), "tx_retries": int(retries),
+            "tx_rate": number(tx_rate), "rx_rate": number(rx_rate),
+            "last_ack_snr": number(ack), "last_rx_snr": number(rx_snr)}
+
+def iter_records(f):
+    """One record per section that has data, stamped with the latest LocalBeginTime.
+
+    Keys appear only when the section has them: clients (client-table rows),
+    noise_floor (radio-stats), signals ({mac: signal} from show clients) and
+    client_count.
+    """
+    timestamp = None
+    for section in iter_sections(f):
+        m = TIME_RE.search(section)
+        if m:
+            timestamp = m.group(2)
+        if timestamp is None:
+            continue
+        record = {}
+        clients = CLIENT_RE.findall(section)
+        if clients:
+            record["clients"] = [client_row(c) for c in clients]
+        else:
+            signals = SIGNAL_RE.findall(section)
+            if signals:
+                record["signals"] = {mac.lower(): int(signal) for mac, signal in signals}
+        m = NOISE_RE.search(section)
+        if m:
+            record["noise_floor"] = int(m.group(1))
+        m = CLIENT_COUNT_RE.search(section)
+        if m:
+            record["client_count"] = int(m.group(1))
+        if record:
+            yield dict(timestamp=timestamp, **record)
+
+def iter_mac_records(records, mac):
+    """toJson.html parseLog() records for one MAC; noise floor and signal carry over from earlier sections"""
+    mac = mac.lower()
+    noise = signal = None
+    for record in records:
+        noise = record.get("noise_floor", noise)
+        signal = record.get("signals", {}).get(mac, signal)
+        for row in record.get("clients", ()):
+            if (row["mac"] == mac and row["assoc_state"] == "Associated"
+                    and row["last_ack_snr"] is not None and row["last_rx_snr"] is not None):
+                yield {"timestamp": record["timestamp"], "mac_address": mac,
+                       "last_ack_snr": row["last_ack_snr"], "last_rx_snr": row["last_rx_snr"],
+                       "noise_floor": noise, "signal": signal}
+
+def write_jsonl(records, out):
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+def write_json_array(records, out):
+    """A JSON array written element by element, for processJson.html"""
+    count = 0
+    out.write("[")
+    for record in records:
+        out.write(("," if count else "") + "\n" + json.dumps(record))
+        count += 1
+    out.write("\n]\n")
+    return count
+
+def write_arrow(records, path):
+    """Client rows as an Arrow IPC file (one row per client per section), written in batches"""
+    import numpy as np
+    import pyarrow as pa
+
+    schema = pa.schema([("timestamp_ms", pa.float64()), ("mac", pa.string()), ("essid", pa.string()),
+                        ("bssid", pa.string()), ("assoc_state", pa.string()), ("tx_pkts", pa.int64()),
+                        ("rx_pkts", pa.int64()), ("tx_retries", pa.int64()), ("tx_rate", pa.float64()),
+                        ("rx_rate", pa.float64()), ("last_ack_snr", pa.float64()), ("last_rx_snr", pa.float64()),
+                        ("noise_floor", pa.float64()), ("signal", pa.float64())])
+    columns = {name: [] for name in schema.names}
+    count = 0
+    noise = None
+    signals = {}
+
+    def flush(writer):
+        stamps = np.array(columns["timestamp_ms"], dtype="datetime64[s]")
+        columns["timestamp_ms"] = local_to_epoch_ms(stamps).tolist() if len(stamps) else []
+        writer.write_batch(pa.record_batch([pa.array(columns[name], type=field.type)
+                                            for name, field in zip(schema.names, schema)], schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for record in records:
+            noise = record.get("noise_floor", noise)
+            signals.update(record.get("signals", {}))
+            stamp = record["timestamp"].split(".")[0]
+            for row in record.get("clients", ()):
+                columns["timestamp_ms"].append(stamp)
+                for name in CLIENT_FIELDS:
+                    columns[name].append(row[name])
+                columns["noise_floor"].append(noise)
+                columns["signal"].append(signals.get(row["mac"]))
+                count += 1
+            if len(columns["mac"]) >= ARROW_BATCH:
+                flush(writer)
+        if columns["mac"]:
+            flush(writer)
+    return count
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} aruba.txt [--mac MAC] [--json] [--out out.jsonl|out.json|out.arrow]")
+        sys.exit(1)
+    path = args.pop(0)
+    mac = out_path = None
+    array = False
+    while args:
+        option = args.pop(0)
+        if option == "--mac":
+            mac = args.pop(0)
+        elif option == "--json":
+            array = True
+        elif option == "--out":
+            out_path = args.pop(0)
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    start = time.monotonic()
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        records = iter_records(f)
+        if mac:
+            records = iter_mac_records(records, mac)
+        if out_path and out_path.endswith(".arrow"):
+            if mac:
+                print("--mac writes toJson.html records; use .jsonl or .json")
+                sys.exit(1)
+            count = write_arrow(records, out_path)
+        else:
+            out = open(out_path, "w", encoding="utf-8") if out_path else sys.stdout
+            try:
+                count = (write_json_array if array or (out_path or "").endswith(".json") else write_jsonl)(records, out)
+            finally:
+                if out_path:
+                    out.close()
+    if out_path:
+        print(f"Wrote {count} {'rows' if out_path.endswith('.arrow') else 'records'} to {out_path} "
+              f"in {time.monotonic() - start:.2f} s")
+
+if __name__ == "__main__":
+    main()
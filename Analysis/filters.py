@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import sys
+import time
+
+import numpy as np
+
+from latency import fmt
+
+HAMPEL_SIGMAS = 3.0        # Hampel: reject points more than this many scaled MADs from the median
+MAD_SCALE = 1.4826         # MAD → standard deviation for normal data
+IQR_FACTOR = 1.5           # Tukey fences: [Q1 - 1.5 IQR, Q3 + 1.5 IQR]
+SPIKE_LIMIT_MS = 500.0     # Latency spike limit used by outlier filtration.html
+BLOCK = 1 << 21            # Window elements (rows x w) sorted per step by the rolling median; bounds memory
+
+def rolling_mean(values, w, out=None):
+    """smooth(data, w): mean of the non-NaN values in each centred window, O(n) from prefix sums"""
+    values = np.asarray(values, dtype=float)
+    if out is None:
+        out = np.empty(len(values))
+    if w <= 1:
+        out[:] = values
+        return out
+    # Prefix sums over the series padded so every window is w long; padding and NaNs add nothing
+    half = w // 2
+    tail = w - half - 1
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.concatenate([np.zeros(half + 1), np.where(valid, values, 0.0), np.zeros(tail)]))
+    np.subtract(sums[w:], sums[:-w], out=out)
+    if valid.all():
+        n = np.full(len(values), w, dtype=np.int32)
+        n[:half] -= np.arange(half, 0, -1, dtype=np.int32)[:len(values)]
+        if tail:
+            n[-tail:] -= np.arange(1, tail + 1, dtype=np.int32)[-len(values):]
+    else:
+        counts = np.cumsum(np.concatenate([np.zeros(half + 1, dtype=np.int32), valid.astype(np.int32),
+                                           np.zeros(tail, dtype=np.int32)]), dtype=np.int32)
+        n = counts[w:] - counts[:-w]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        np.divide(out, n, out=out)
+    out[n == 0] = np.nan
+    return out
+
+def sorted_windows(values, w, lo_row, hi_row):
+    """Windows lo_row..hi_row-1 of the NaN-padded series, sorted with NaNs last, and their valid counts"""
+    # Pad only the slice these rows cover: values[lo_row - half : hi_row + w - half - 1]
+    half = w // 2
+    first, last = lo_row - half, hi_row + w - half - 1
+    padded = np.concatenate([np.full(max(0, -first), np.nan), values[max(0, first):min(len(values), last)],
+                             np.full(max(0, last - len(values)), np.nan)])
+    view = np.lib.stride_tricks.sliding_window_view(padded, w)
+    return np.sort(view, axis=1), np.count_nonzero(~np.isnan(view), axis=1)
+
+def middle(rows, counts):
+    """Median of the first counts[i] entries of each sorted row, NaN where counts is 0"""
+    k = np.maximum(counts - 1, 0)
+    r = np.arange(len(rows))
+    med = (rows[r, k // 2] + rows[r, (k + 1) // 2]) / 2
+    return np.where(counts > 0, med, np.nan)
+
+def rolling_median(values, w, out=None, mad=None):
+    """NaN-aware median of each centred window; optionally the window's MAD into mad.
+
+    Every window is sorted, so this is O(n w log w), not O(n) like
+    rolling_mean. Windows are sorted as strided views, BLOCK // w rows at a
+    time, so no Python loop runs per point and the scratch memory stays
+    near BLOCK elements whatever w is.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if out is None:
+        out = np.empty(n)
+    if w <= 1:
+        out[:] = values
+        if mad is not None:
+            mad[:] = np.where(np.isnan(values), np.nan, 0.0)
+        return out
+    result = np.empty(n)
+    step = max(1, BLOCK // w)
+    for lo in range(0, n, step):
+        hi = min(n, lo + step)
+        rows, counts = sorted_windows(values, w, lo, hi)
+        med = middle(rows, counts)
+        result[lo:hi] = med
+        if mad is not None:
+            mad[lo:hi] = middle(np.sort(np.abs(rows - med[:, None]), axis=1), counts)
+    out[:] = result
+    return out
+
+def hampel(values, w, sigmas=HAMPEL_SIGMAS, replace=True, out=None):
+    """Hampel filter: points more than sigmas scaled MADs from their window median are outliers.
+
+    Outliers become the window median (replace=True) or NaN. Returns
+    (filtered, outlier mask). The median and MAD cost O(n w log w).
+    """
+    values = np.asarray(values, dtype=float)
+    med = np.empty(len(values))
+    mad = np.empty(len(values))
+    rolling_median(values, w, med, mad)
+    with np.errstate(invalid="ignore"):
+        outliers = np.abs(values - med) > sigmas * MAD_SCALE * mad
+    if out is None:
+        out = values.copy()
+    elif out is not values:
+        out[:] = values
+    out[outliers] = med[outliers] if replace else np.nan
+    return out, outliers
+
+def iqr_filter(values, factor=IQR_FACTOR, out=None):
+    """Points outside the Tukey fences of the whole series become NaN. Returns (filtered, outlier mask)."""
+    values = np.asarray(values, dtype=float)
+    if out is None:
+        out = values.copy()
+    elif out is not values:
+        out[:] = values
+    if np.isnan(values).all():
+        return out, np.zeros(len(values), dtype=bool)
+    q1, q3 = np.nanpercentile(values, [25, 75])
+    spread = factor * (q3 - q1)
+    with np.errstate(invalid="ignore"):
+        outliers = (values < q1 - spread) | (values > q3 + spread)
+    out[outliers] = np.nan
+    return out, outliers
+
+def hard_limit(values, upper=SPIKE_LIMIT_MS, lower=None, mode="hold", out=None):
+    """Handle values above upper (or below lower). Returns (filtered, outlier mask).
+
+    mode "hold" does what outlier filtration.html does to latency spikes. A
+    spike takes the value just before it, if there is one. Otherwise it
+    takes the next in-limit value, and otherwise NaN. Mode "clip" clamps
+    to the limits, and mode "nan" drops the spike.
+    """
+    values = np.asarray(values, dtype=float)
+    if out is None:
+        out = values.copy()
+    elif out is not values:
+        out[:] = values
+    with np.errstate(invalid="ignore"):
+        outliers = values > upper if upper is not None else np.zeros(len(values), dtype=bool)
+        if lower is not None:
+            outliers |= values < lower
+    if mode == "clip":
+        np.clip(out, lower, upper, out=out)
+        return out, outliers
+    if mode == "nan":
+        out[outliers] = np.nan
+        return out, outliers
+    if mode != "hold":
+        raise ValueError(f"Unknown hard-limit mode {mode!r}")
+    if not outliers.any():
+        return out, outliers
+    # Runs of consecutive spikes: each run takes the value just before it, else the next in-limit value
+    starts = np.flatnonzero(outliers & ~np.concatenate([[False], outliers[:-1]]))
+    ends = np.flatnonzero(outliers & ~np.concatenate([outliers[1:], [False]])) + 1
+    held = np.where(starts > 0, values[np.maximum(starts - 1, 0)], np.nan)
+    good = np.flatnonzero(~outliers & ~np.isnan(values))
+    following = np.searchsorted(good, ends)
+    if len(good):
+        ahead = np.where(following < len(good), values[good[np.minimum(following, len(good) - 1)]], np.nan)
+    else:
+        ahead = np.full(len(ends), np.nan)
+    out[outliers] = np.repeat(np.where(np.isnan(held), ahead, held), ends - starts)
+    return out, outliers
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} aligned.npz [--smooth column w] [--median column w] [--hampel column w] "
+              "[--iqr column] [--limit column max] [--out filtered.npz]")
+        sys.exit(1)
+    path = args.pop(0)
+    columns = dict(np.load(path))
+    out_path = None
+    steps = []
+    while args:
+        option = args.pop(0)
+        if option in ("--smooth", "--median", "--hampel", "--limit"):
+            column = args.pop(0)
+            steps.append((option[2:], column, float(args.pop(0))))
+        elif option == "--iqr":
+            steps.append(("iqr", args.pop(0), IQR_FACTOR))
+        elif option == "--out":
+            out_path = args.pop(0)
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    print("{:<10} {:<24} {:<8} {:<10} {:<10} {:<10}".format("Filter", "Column", "Param", "Outliers", "Mean", "ms"))
+    for name, column, param in steps:
+        values = columns[column].astype(float)
+        start = time.monotonic()
+        outliers = None
+        if name == "smooth":
+            rolling_mean(values, int(param), out=values)
+        elif name == "median":
+            rolling_median(values, int(param), out=values)
+        elif name == "hampel":
+            _, outliers = hampel(values, int(param), out=values)
+        elif name == "iqr":
+            _, outliers = iqr_filter(values, param, out=values)
+        else:
+            _, outliers = hard_limit(values, param, out=values)
+        elapsed = (time.monotonic() - start) * 1000
+        columns[column] = values
+        print("{:<10} {:<24} {:<8} {:<10} {:<10} {:<10}".format(
+            name, column[:24], f"{param:g}", "-" if outliers is None else int(outliers.sum()),
+            fmt(np.nanmean(values) if not np.isnan(values).all() else np.nan), fmt(elapsed, 1)))
+
+    if out_path:
+        np.savez_compressed(out_path, **columns)
+        print(f"\nWrote {out_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from latency import analyze, fmt, latex_aggregate_table, load_ping, percentiles, time_seconds
+from streamstats import ewma
+
+HIGH_LATENCY_MS = 800.0    # JitterAnalayzerDownlink.html: RTTs at or above this count as lost
+JITTER_PERCENTILES = (50, 75, 90, 95, 99)
+
+def seq_pairs(packets):
+    """(jitter, time of the later packet in s) for consecutive-seq pairs, in seq order"""
+    by_seq = packets[np.argsort(packets["seq"], kind="stable")]
+    consecutive = np.diff(by_seq["seq"]) == 1
+    t = (by_seq["timestamp_ms"][1:] - packets["timestamp_ms"].min()) / 1000.0
+    return np.abs(np.diff(by_seq["rtt"]))[consecutive], t[consecutive]
+
+def rfc3550(jitter):
+    """RFC 3550 smoothed jitter after each pair (J += (|D| - J) / 16, starting from 0)"""
+    return ewma(jitter, 0.0) if len(jitter) else np.empty(0)
+
+def jitter_stats(jitter, smoothed=None):
+    """Mean, percentiles and max of jitter differences; rfc3550 is the smoothed value after the last pair"""
+    p = percentiles(jitter, JITTER_PERCENTILES)
+    if smoothed is None:
+        smoothed = rfc3550(jitter)
+    return {
+        "pairs": len(jitter),
+        "avg_jitter": float(jitter.mean()) if len(jitter) else 0.0,
+        "med_jitter": p[50], "p75": p[75], "p90": p[90], "p95": p[95], "p99": p[99],
+        "max_jitter": float(jitter.max()) if len(jitter) else 0.0,
+        "rfc3550": float(smoothed[-1]) if len(smoothed) else 0.0,
+    }
+
+def analyze_downlink(packets, high_latency_ms=HIGH_LATENCY_MS):
+    """analyzePingText() from JitterAnalayzerDownlink.html: RTTs >= high_latency_ms count as lost"""
+    if not len(packets):
+        return None
+    seq = packets["seq"]
+    min_seq, max_seq = int(seq.min()), int(seq.max())
+    expected = max_seq - min_seq + 1
+    valid = packets[packets["rtt"] < high_latency_ms]
+    valid = valid[np.argsort(valid["seq"], kind="stable")]
+    high = len(packets) - len(valid)
+    lost = expected - len(packets) + high
+    rtt = valid["rtt"]
+    out_of_order = int(np.count_nonzero(np.diff(valid["seq"]) <= 0))
+    jitter = np.abs(np.diff(rtt))[np.diff(valid["seq"]) == 1]
+    p = percentiles(jitter, (25, 50, 75))
+    iqr = p[75] - p[25]
+    spike = (jitter < p[25] - 1.5 * iqr) | (jitter > p[75] + 1.5 * iqr)
+    spike_t = jitter >= 3 * p[50]
+    result = {
+        "min_seq": min_seq, "max_seq": max_seq,
+        "total_expected": expected, "received": len(packets), "valid_received": len(valid),
+        "high_latency_ms": high_latency_ms, "high_latency_count": high, "lost": lost, "lost_percent": lost / expected * 100,
+        "lost_seqs": np.setdiff1d(np.arange(min_seq, max_seq + 1), valid["seq"]),
+        "min_rtt": float(rtt.min()) if len(rtt) else 0.0, "max_rtt": float(rtt.max()) if len(rtt) else 0.0,
+        "out_of_order": out_of_order, "out_of_order_percent": out_of_order / len(valid) * 100 if len(valid) else 0.0,
+        "jitter": jitter,
+        "normal_avg": float(jitter[~spike].mean()) if (~spike).any() else 0.0,
+        "spike_avg": float(jitter[spike].mean()) if spike.any() else 0.0,
+        "spike_rate": spike.mean() * 100 if len(jitter) else 0.0,
+        "threshold_normal_avg": float(jitter[~spike_t].mean()) if (~spike_t).any() else 0.0,
+        "threshold_spike_avg": float(jitter[spike_t].mean()) if spike_t.any() else 0.0,
+        "threshold_spike_rate": spike_t.mean() * 100 if len(jitter) else 0.0,
+    }
+    result.update(jitter_stats(jitter))
+    return result
+
+def segment_jitter(packets, seconds, high_latency_ms=None):
+    """jitter_stats() per [k*seconds, (k+1)*seconds) segment, placing each pair at its later packet.
+
+    The RFC 3550 estimate runs over the whole log, so each segment reports
+    its value at the segment's last pair.
+    """
+    if high_latency_ms is not None:
+        packets = packets[packets["rtt"] < high_latency_ms]
+    if not len(packets):
+        return []
+    jitter, t = seq_pairs(packets)
+    smoothed = rfc3550(jitter)
+    segment = (t // seconds).astype(np.int64)
+    count = int(time_seconds(packets)[-1] // seconds) + 1
+    order = np.argsort(segment, kind="stable")
+    bounds = np.searchsorted(segment[order], np.arange(count + 1))
+    result = []
+    for k in range(count):
+        pick = order[bounds[k]:bounds[k + 1]]
+        if not len(pick):
+            result.append(None)
+            continue
+        stats = jitter_stats(jitter[pick], smoothed[pick])
+        stats["rfc3550"] = float(smoothed[pick.max()])
+        result.append(stats)
+    return result
+
+def process_file(path, downlink=False, segment=None):
+    packets = load_ping(path)
+    if downlink:
+        a = analyze_downlink(packets)
+    else:
+        a = analyze(packets)
+        if a is not None:
+            a.update(jitter_stats(a["jitter"]))
+    segments = segment_jitter(packets, segment, HIGH_LATENCY_MS if downlink else None) if segment else []
+    return {"path": path, "analysis": a, "segments": segments}
+
+def latex_downlink_aggregate_table(name, a):
+    """latexAggregateTable() from JitterAnalayzerDownlink.html, labelled with the threshold actually applied"""
+    return f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{Ping analysis — {name}}}
+\\begin{{tabular}}{{|l|r|}}
+\\hline
+Metric & Value \\\\
+\\hline
+Packets expected & {a['total_expected']} \\\\
+Valid packets (RTT < {a['high_latency_ms']:g}ms) & {a['valid_received']} \\\\
+High latency (RTT >= {a['high_latency_ms']:g}ms) & {a['high_latency_count']} \\\\
+Total lost & {a['lost']} ({fmt(a['lost_percent'])}\\%) \\\\
+Min RTT (ms) & {fmt(a['min_rtt'])} \\\\
+Max RTT (ms) & {fmt(a['max_rtt'])} \\\\
+Avg jitter (ms) & {fmt(a['avg_jitter'])} \\\\
+Median jitter (ms) & {fmt(a['med_jitter'])} \\\\
+99th jitter (ms) & {fmt(a['p99'])} \\\\
+Out-of-order & {a['out_of_order']} ({fmt(a['out_of_order_percent'])}\\%) \\\\
+\\hline
+\\end{{tabular}}
+\\end{{table}}"""
+
+def latex_merged_table(analyses, downlink=False):
+    """latexMergedTable(): LatencyJitterAnalyzer.html layout, or JitterAnalayzerDownlink.html's with downlink"""
+    extra_cols = "c|" if downlink else ""
+    extra_head = "Valid & High Lat & " if downlink else ""
+    extra_unit = "Pkts & Pkts & " if downlink else ""
+    p95_head, p95_unit = ("", "") if downlink else ("95\\% & ", "(ms) & ")
+    latex = f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{Merged Ping Analysis Summary}}
+\\begin{{tabular}}{{|c|c|c|c|c|c|c|c|{extra_cols}}}
+\\hline
+Iteration & {extra_head}Avg Jitter & Median & 75\\% & 90\\% & {p95_head}99\\% & Loss \\\\
+ & {extra_unit}(ms) & (ms) & (ms) & (ms) & {p95_unit}(ms) & (\\%) \\\\
+\\hline
+"""
+    for i, a in enumerate([a for a in analyses if a is not None], 1):
+        middle = f"{a['valid_received']} & {a['high_latency_count']} & " if downlink else ""
+        p95 = "" if downlink else f"{fmt(a['p95'])} & "
+        latex += (f"{i} & {middle}{fmt(a['avg_jitter'])} & {fmt(a['med_jitter'])} & {fmt(a['p75'])} & "
+                  f"{fmt(a['p90'])} & {p95}{fmt(a['p99'])} & {fmt(a['lost_percent'])} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def latex_segment_table(segments, label):
+    latex = f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{{label}}}
+\\begin{{tabular}}{{|c|c|c|c|c|c|c|c|c|}}
+\\hline
+Seg & Pairs & Avg & P50 & P90 & P95 & P99 & Max & RFC3550 \\\\
+\\hline
+"""
+    for i, s in enumerate(segments, 1):
+        if s is None:
+            latex += f"{i} & \\multicolumn{{8}}{{c|}}{{No data}} \\\\\n"
+            continue
+        latex += (f"{i} & {s['pairs']} & {fmt(s['avg_jitter'])} & {fmt(s['med_jitter'])} & {fmt(s['p90'])} & "
+                  f"{fmt(s['p95'])} & {fmt(s['p99'])} & {fmt(s['max_jitter'])} & {fmt(s['rfc3550'])} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def latex_group_table(groups):
+    """One pooled row per group (direction / AP / 5G)"""
+    latex = """\\begin{table}[htbp]
+\\centering
+\\caption{Jitter by Link and Direction}
+\\begin{tabular}{|l|c|c|c|c|c|c|c|}
+\\hline
+Group & Runs & Avg Jitter & Median & 95\\% & 99\\% & RFC3550 & Loss \\\\
+ & & (ms) & (ms) & (ms) & (ms) & (ms) & (\\%) \\\\
+\\hline
+"""
+    for name, runs, s, loss in groups:
+        latex += (f"{name} & {runs} & {fmt(s['avg_jitter'])} & {fmt(s['med_jitter'])} & {fmt(s['p95'])} & "
+                  f"{fmt(s['p99'])} & {fmt(s['rfc3550'])} & {fmt(loss)} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--segment s] [--latex out.tex] [--workers N] "
+              "--up NAME ping.txt ... [--down NAME ping.txt ...] ...")
+        sys.exit(1)
+    segment = latex_path = workers = None
+    groups = []                 # [name, downlink, paths]
+    while args:
+        option = args.pop(0)
+        if option == "--segment":
+            segment = float(args.pop(0))
+        elif option == "--latex":
+            latex_path = args.pop(0)
+        elif option == "--workers":
+            workers = int(args.pop(0))
+        elif option in ("--up", "--down"):
+            groups.append([args.pop(0), option == "--down", []])
+        elif option.startswith("--") or not groups:
+            print("Unknown option", option)
+            sys.exit(1)
+        else:
+            groups[-1][2].append(option)
+
+    jobs = [(path, downlink) for _, downlink, paths in groups for path in paths]
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(process_file, [p for p, _ in jobs], [d for _, d in jobs], [segment] * len(jobs)))
+    print(f"Analyzed {len(results)} logs in {time.monotonic() - start:.2f} s")
+
+    latex = []
+    summary = []
+    index = 0
+    for name, downlink, paths in groups:
+        runs = results[index:index + len(paths)]
+        index += len(paths)
+        analyses = [r["analysis"] for r in runs]
+        print(f"\n{name} ({'downlink' if downlink else 'uplink'})")
+        print("{:<30} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            "File", "Pairs", "Loss%", "AvgJ", "MedJ", "P95", "P99", "RFC3550"))
+        for r in runs:
+            a = r["analysis"]
+            label = os.path.basename(r["path"])[-30:]
+            if a is None:
+                print(f"{label:<30} No valid ping entries found")
+                continue
+            print("{:<30} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+                label, a["pairs"], fmt(a["lost_percent"]), fmt(a["avg_jitter"]), fmt(a["med_jitter"]),
+                fmt(a["p95"]), fmt(a["p99"]), fmt(a["rfc3550"])))
+        valid = [a for a in analyses if a is not None]
+        if valid:
+            # Pooled over runs; the RFC 3550 column is the mean of the per-run final values
+            pooled = jitter_stats(np.concatenate([a["jitter"] for a in valid]))
+            pooled["rfc3550"] = float(np.mean([a["rfc3550"] for a in valid]))
+            loss = sum(a["lost"] for a in valid) / sum(a["total_expected"] for a in valid) * 100
+            summary.append((name, len(valid), pooled, loss))
+        latex.append(latex_merged_table(analyses, downlink))
+        for r in runs:
+            if r["analysis"] is None:
+                continue
+            file_name = os.path.basename(r["path"])
+            latex.append((latex_downlink_aggregate_table if downlink else latex_aggregate_table)(file_name, r["analysis"]))
+            if r["segments"]:
+                latex.append(latex_segment_table(r["segments"], f"{name}: {file_name}, {segment:g} s segments"))
+
+    if summary:
+        print("\n{:<24} {:<6} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            "Group", "Runs", "AvgJ", "MedJ", "P95", "P99", "RFC3550", "Loss%"))
+        for name, runs, s, loss in summary:
+            print("{:<24} {:<6} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+                name[:24], runs, fmt(s["avg_jitter"]), fmt(s["med_jitter"]), fmt(s["p95"]), fmt(s["p99"]),
+                fmt(s["rfc3550"]), fmt(loss)))
+        latex.insert(0, latex_group_table(summary))
+
+    if latex_path:
+        with open(latex_path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(latex) + "\n")
+        print(f"\nWrote {latex_path}")
+
+if __name__ == "__main__":
+    main()
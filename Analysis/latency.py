@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# ping.py lines: "2025-11-13 11:01:09 64 bytes from ...: icmp_seq=10 ttl=64 time=57.7 ms"
+# ping -D lines:  "[1763407040.100313] 64 bytes from ...: icmp_seq=403 ttl=64 time=80.7 ms"
+PING_RE = re.compile(
+    r'^(?:\[?(\d+\.\d+)\]?|(\d{4}-\d\d-\d\d)\s+(\d\d:\d\d:\d\d))\s+.*?icmp_seq=(\d+).*?time=([\d.]+)\s*ms',
+    re.MULTILINE | re.IGNORECASE)
+
+PING_DTYPE = np.dtype([
+    ("timestamp_ms", np.float64),  # arrival time, Unix epoch
+    ("seq", np.int64),             # icmp_seq, unwrapped past 65535
+    ("rtt", np.float64),           # ms
+])
+
+EXTREME_RTT_MS = 1000.0    # RTTs at or above this count as extreme
+PERCENTILES = (50, 75, 90, 95, 99)
+
+def fmt(value, digits=2):
+    """safeToFixed: 'NaN' for missing/infinite values"""
+    return f"{value:.{digits}f}" if value is not None and math.isfinite(value) else "NaN"
+
+def local_to_epoch_ms(stamps):
+    """datetime64[s] wall-clock times (local time, as ping.py writes them) → epoch ms"""
+    naive = stamps.astype("datetime64[s]").astype(np.int64)
+    offsets = np.empty(len(naive), dtype=np.int64)
+    # The UTC offset only changes at DST switches, so look it up once per distinct hour
+    hours, inverse = np.unique(naive // 3600, return_inverse=True)
+    for i, hour in enumerate(hours):
+        t = time.localtime(int(hour) * 3600)
+        offsets[inverse == i] = t.tm_gmtoff
+    return (naive - offsets) * 1000.0
+
+def unwrap_seq(seq):
+    """icmp_seq wraps at 65536; make it monotonic again in arrival order"""
+    wraps = np.cumsum(np.diff(seq, prepend=seq[:1]) < -32768)
+    return seq + wraps * 65536
+
+def parse_ping_text(text):
+    """Ping log text → PING_DTYPE array sorted by arrival time"""
+    rows = PING_RE.findall(text)
+    packets = np.empty(len(rows), dtype=PING_DTYPE)
+    if not rows:
+        return packets
+    epoch, dates, times, seq, rtt = (np.array(column) for column in zip(*rows))
+    stamped = epoch != ""
+    ts = np.empty(len(rows))
+    ts[stamped] = epoch[stamped].astype(float) * 1000.0
+    if not stamped.all():
+        wall = np.char.add(np.char.add(dates[~stamped], "T"), times[~stamped])
+        ts[~stamped] = local_to_epoch_ms(wall.astype("datetime64[s]"))
+    packets["timestamp_ms"] = ts
+    packets["seq"] = unwrap_seq(seq.astype(np.int64))
+    packets["rtt"] = rtt.astype(float)
+    return packets[np.lexsort((packets["seq"], packets["timestamp_ms"]))]
+
+def load_ping(path):
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return parse_ping_text(f.read())
+
+def time_seconds(packets):
+    """Seconds since the first packet (timeSeconds in LatencySegmenter.html)"""
+    return (packets["timestamp_ms"] - packets["timestamp_ms"][0]) / 1000.0 if len(packets) else np.empty(0)
+
+def consecutive_jitter(packets):
+    """|RTT[n] - RTT[n-1]| for packets whose seq numbers are consecutive"""
+    by_seq = packets[np.argsort(packets["seq"], kind="stable")]
+    consecutive = np.diff(by_seq["seq"]) == 1
+    return np.abs(np.diff(by_seq["rtt"]))[consecutive]
+
+def lost_seqs(packets):
+    seq = np.unique(packets["seq"])
+    if not len(seq):
+        return seq
+    return np.setdiff1d(np.arange(seq[0], seq[-1] + 1), seq, assume_unique=True)
+
+def percentiles(values, ps=PERCENTILES):
+    """Linear-interpolated percentiles (same rule as percentile() in the HTML tools); 0 when empty"""
+    if not len(values):
+        return {p: 0.0 for p in ps}
+    return dict(zip(ps, np.percentile(values, ps).tolist()))
+
+def analyze(packets):
+    """Whole-run summary, equivalent to analyzePingText() in LatencyAnalyzer.html"""
+    if not len(packets):
+        return None
+    seq = packets["seq"]
+    rtt = packets["rtt"]
+    min_seq, max_seq = int(seq.min()), int(seq.max())
+    expected = max_seq - min_seq + 1
+    lost = lost_seqs(packets)
+    sorted_seq = np.sort(seq)
+    out_of_order = int(np.count_nonzero(np.diff(sorted_seq) <= 0))
+    jitter = consecutive_jitter(packets)
+    p = percentiles(jitter, (25, 50, 75, 90, 95, 99))
+    extreme = int(np.count_nonzero(rtt >= EXTREME_RTT_MS))
+
+    iqr = p[75] - p[25]
+    lb, ub = p[25] - 1.5 * iqr, p[75] + 1.5 * iqr
+    spike = (jitter < lb) | (jitter > ub)
+    threshold = 3 * p[50]
+    spike_t = jitter >= threshold
+    return {
+        "min_seq": min_seq, "max_seq": max_seq,
+        "total_expected": expected, "received": len(packets),
+        "lost": expected - len(packets), "lost_percent": (expected - len(packets)) / expected * 100,
+        "lost_seqs": lost,
+        "min_rtt": float(rtt.min()), "max_rtt": float(rtt.max()),
+        "extreme_count": extreme, "extreme_percent": extreme / len(packets) * 100,
+        "out_of_order": out_of_order, "out_of_order_percent": out_of_order / len(packets) * 100,
+        "jitter": jitter,
+        "avg_jitter": float(jitter.mean()) if len(jitter) else 0.0,
+        "med_jitter": p[50], "p75": p[75], "p90": p[90], "p95": p[95], "p99": p[99],
+        "max_jitter": float(jitter.max()) if len(jitter) else 0.0,
+        "normal_avg": float(jitter[~spike].mean()) if (~spike).any() else 0.0,
+        "spike_avg": float(jitter[spike].mean()) if spike.any() else 0.0,
+        "spike_rate": spike.mean() * 100 if len(jitter) else 0.0,
+        "threshold_normal_avg": float(jitter[~spike_t].mean()) if (~spike_t).any() else 0.0,
+        "threshold_spike_avg": float(jitter[spike_t].mean()) if spike_t.any() else 0.0,
+        "threshold_spike_rate": spike_t.mean() * 100 if len(jitter) else 0.0,
+    }
+
+def compute_stats(packets, duration_minutes):
+    """RTT statistics of a packet subset, equivalent to computeStats() in LatencySegmenter.html.
+
+    'std' is the sample standard deviation (what the HTML tool labels "Std
+    Err"); 'stderr' is the standard error of the mean, std / sqrt(n).
+    """
+    if not len(packets):
+        return None
+    rtt = packets["rtt"]
+    std = float(rtt.std(ddof=1)) if len(rtt) > 1 else 0.0
+    p = percentiles(rtt)
+    jitter = consecutive_jitter(packets)
+    lost = len(lost_seqs(packets))
+    return {
+        "count": len(packets),
+        "min": float(rtt.min()), "max": float(rtt.max()), "mean": float(rtt.mean()),
+        "std": std, "stderr": std / math.sqrt(len(rtt)),
+        "p50": p[50], "p75": p[75], "p90": p[90], "p95": p[95], "p99": p[99],
+        "avg_jitter": float(jitter.mean()) if len(jitter) else 0.0,
+        "lost": lost,
+        "loss_per_min": lost / duration_minutes if duration_minutes > 0 else 0.0,
+    }
+
+def filter_by_time(packets, start_s, end_s):
+    """Packets with start_s <= timeSeconds <= end_s (filterPacketsByTimeRange), by binary search"""
+    t = time_seconds(packets)
+    return packets[np.searchsorted(t, start_s, side="left"):np.searchsorted(t, end_s, side="right")]
+
+def range_stats(packets, start_s, end_s):
+    """(in-range stats, outside-range stats) as updateAllStats() computes them"""
+    t = time_seconds(packets)
+    lo, hi = np.searchsorted(t, start_s, side="left"), np.searchsorted(t, end_s, side="right")
+    outside = np.concatenate([packets[:lo], packets[hi:]])
+    duration = t[-1] if len(t) else 0.0
+    return (compute_stats(packets[lo:hi], (end_s - start_s) / 60),
+            compute_stats(outside, (duration - (end_s - start_s)) / 60))
+
+def segment_stats(packets, seconds):
+    """Stats for consecutive fixed-length segments [k*seconds, (k+1)*seconds)"""
+    t = time_seconds(packets)
+    if not len(t):
+        return []
+    edges = np.arange(int(t[-1] // seconds) + 2) * seconds
+    bounds = np.searchsorted(t, edges, side="left")
+    return [compute_stats(packets[a:b], seconds / 60) for a, b in zip(bounds[:-1], bounds[1:])]
+
+def latex_aggregate_table(name, a):
+    """latexAggregateTable() from LatencyAnalyzer.html"""
+    return f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{Ping analysis — {name}}}
+\\begin{{tabular}}{{|l|r|}}
+\\hline
+Metric & Value \\\\
+\\hline
+Packets expected & {a['total_expected']} \\\\
+Packets received & {a['received']} \\\\
+Packets lost & {a['lost']} ({fmt(a['lost_percent'])}\\%) \\\\
+Min RTT (ms) & {fmt(a['min_rtt'])} \\\\
+Max RTT (ms) & {fmt(a['max_rtt'])} \\\\
+Avg jitter (ms) & {fmt(a['avg_jitter'])} \\\\
+Median jitter (ms) & {fmt(a['med_jitter'])} \\\\
+99th jitter (ms) & {fmt(a['p99'])} \\\\
+Extreme RTTs (>=1000 ms) & {a['extreme_count']} ({fmt(a['extreme_percent'])}\\%) \\\\
+Out-of-order & {a['out_of_order']} ({fmt(a['out_of_order_percent'])}\\%) \\\\
+\\hline
+\\end{{tabular}}
+\\end{{table}}"""
+
+def latex_combined_table(results):
+    """latexCombinedTable() from LatencyAnalyzer.html; results is a list of (file name, analysis)"""
+    latex = """\\begin{table}[htbp]
+\\centering
+\\caption{Combined Ping Analysis Comparison}
+\\small
+\\begin{tabular}{|l|r|r|r|r|r|r|r|r|r|}
+\\hline
+File & Exp & Rcvd & Lost(\\%) & MinRTT & MaxRTT & AvgJ & MedJ & P99 & Spike(\\%) \\\\
+\\hline
+"""
+    for name, a in results:
+        short = name[:22] + "..." if len(name) > 25 else name
+        latex += (f"{short} & {a['total_expected']} & {a['received']} & {fmt(a['lost_percent'], 1)} & "
+                  f"{fmt(a['min_rtt'], 1)} & {fmt(a['max_rtt'], 1)} & {fmt(a['avg_jitter'], 1)} & "
+                  f"{fmt(a['med_jitter'], 1)} & {fmt(a['p99'], 1)} & {fmt(a['spike_rate'], 1)} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def latex_stats_table(all_stats, label):
+    """latexStatsTable() from LatencySegmenter.html; SE is the standard error of the mean"""
+    latex = f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{{label}}}
+\\begin{{tabular}}{{|c|c|c|c|c|c|c|c|c|c|c|c|c|}}
+\\hline
+Iter & Pkts & Min & Max & Avg & SE & P50 & P75 & P90 & P95 & P99 & Jitter & Loss/min \\\\
+\\hline
+"""
+    for i, s in enumerate(all_stats, 1):
+        if s is None:
+            latex += f"{i} & \\multicolumn{{12}}{{c|}}{{No data}} \\\\\n"
+            continue
+        latex += (f"{i} & {s['count']} & {fmt(s['min'])} & {fmt(s['max'])} & {fmt(s['mean'])} & {fmt(s['stderr'])} & "
+                  f"{fmt(s['p50'])} & {fmt(s['p75'])} & {fmt(s['p90'])} & {fmt(s['p95'])} & {fmt(s['p99'])} & "
+                  f"{fmt(s['avg_jitter'])} & {fmt(s['loss_per_min'])} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def process_file(path, time_range=None, segment=None):
+    """Everything the CLI reports for one log (runs in a worker process)"""
+    packets = load_ping(path)
+    result = {"path": path, "analysis": analyze(packets)}
+    if time_range and len(packets):
+        result["in_range"], result["out_range"] = range_stats(packets, *time_range)
+    if segment and len(packets):
+        result["segments"] = segment_stats(packets, segment)
+    return result
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--range start_s end_s] [--segment seconds] [--latex out.tex] [--workers N] ping.txt ...")
+        sys.exit(1)
+    time_range = segment = latex_path = None
+    workers = None
+    while args and args[0].startswith("--"):
+        option = args.pop(0)
+        if option == "--range":
+            time_range = (float(args.pop(0)), float(args.pop(0)))
+        elif option == "--segment":
+            segment = float(args.pop(0))
+        elif option == "--latex":
+            latex_path = args.pop(0)
+        elif option == "--workers":
+            workers = int(args.pop(0))
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(process_file, args, [time_range] * len(args), [segment] * len(args)))
+    print(f"Analyzed {len(results)} logs in {time.monotonic() - start:.2f} s\n")
+
+    valid = [(os.path.basename(r["path"]), r["analysis"]) for r in results if r["analysis"]]
+    print("{:<30} {:<8} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+        "File", "Exp", "Rcvd", "Lost%", "MinRTT", "MaxRTT", "AvgJ", "MedJ", "P99J"))
+    for name, a in valid:
+        print("{:<30} {:<8} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            name[-30:], a["total_expected"], a["received"], fmt(a["lost_percent"]), fmt(a["min_rtt"]),
+            fmt(a["max_rtt"]), fmt(a["avg_jitter"]), fmt(a["med_jitter"]), fmt(a["p99"])))
+    for r in results:
+        if not r["analysis"]:
+            print(f"{r['path']}: no valid ping entries found")
+
+    tables = []
+    if len(valid) > 1:
+        tables.append(latex_combined_table(valid))
+    tables += [latex_aggregate_table(name, a) for name, a in valid]
+    if time_range:
+        label = f"In Range {time_range[0]:g}s-{time_range[1]:g}s"
+        tables.append(latex_stats_table([r.get("in_range") for r in results], label))
+        tables.append(latex_stats_table([r.get("out_range") for r in results], "Outside Range"))
+    if segment:
+        for r in results:
+            if r.get("segments"):
+                label = f"{os.path.basename(r['path'])}: {segment:g} s segments"
+                tables.append(latex_stats_table(r["segments"], label))
+
+    if latex_path:
+        with open(latex_path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(tables) + "\n")
+        print(f"\nWrote {len(tables)} LaTeX tables to {latex_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+import math
+import sys
+import time
+
+import numpy as np
+
+from latency import PERCENTILES, compute_stats, fmt, latex_stats_table, load_ping
+
+class SparseTable(object):
+    """O(1) range min/max after an O(n log n) build"""
+
+    def __init__(self, values):
+        self.mins = [np.asarray(values)]
+        self.maxs = [np.asarray(values)]
+        width = 1
+        while 2 * width <= len(values):
+            prev_min, prev_max = self.mins[-1], self.maxs[-1]
+            self.mins.append(np.minimum(prev_min[:-width], prev_min[width:]))
+            self.maxs.append(np.maximum(prev_max[:-width], prev_max[width:]))
+            width *= 2
+
+    def query(self, lo, hi):
+        """(min, max) of values[lo:hi]; hi > lo"""
+        level = (hi - lo).bit_length() - 1
+        right = hi - (1 << level)
+        return (min(self.mins[level][lo], self.mins[level][right]),
+                max(self.maxs[level][lo], self.maxs[level][right]))
+
+class WaveletMatrix(object):
+    """k-th smallest value in any range in O(log sigma), sigma = number of distinct values.
+
+    With weights, below() also sums the weights of the entries it counts.
+    """
+
+    def __init__(self, values, weights=None):
+        self.alphabet, codes = np.unique(values, return_inverse=True)
+        self.levels = max(1, int(len(self.alphabet) - 1).bit_length())
+        self.zeros = []         # zeros[level][i]: number of 0 bits among the first i codes at this level
+        self.total_zeros = []
+        self.weight_zeros = [] if weights is not None else None   # same, summing weights instead of counting
+        if weights is not None:
+            self.cum_weights = np.concatenate([[0.0], np.cumsum(weights)])
+        codes = codes.astype(np.int64)
+        for level in range(self.levels):
+            bits = (codes >> (self.levels - 1 - level)) & 1
+            is_zero = bits == 0
+            self.zeros.append(np.concatenate([[0], np.cumsum(is_zero)]).astype(np.int64))
+            self.total_zeros.append(int(is_zero.sum()))
+            codes = np.concatenate([codes[is_zero], codes[~is_zero]])
+            if weights is not None:
+                self.weight_zeros.append(np.concatenate([[0.0], np.cumsum(np.where(is_zero, weights, 0.0))]))
+                weights = np.concatenate([weights[is_zero], weights[~is_zero]])
+
+    def kth(self, lo, hi, k):
+        """k-th smallest (0-based) of values[lo:hi]"""
+        code = 0
+        for level in range(self.levels):
+            zeros = self.zeros[level]
+            zl, zr = int(zeros[lo]), int(zeros[hi])
+            if k < zr - zl:
+                lo, hi = zl, zr
+            else:
+                k -= zr - zl
+                lo = self.total_zeros[level] + lo - zl
+                hi = self.total_zeros[level] + hi - zr
+                code |= 1 << (self.levels - 1 - level)
+        return float(self.alphabet[code])
+
+    def count_below(self, lo, hi, value):
+        """Number of entries of values[lo:hi] smaller than value"""
+        return self.below(lo, hi, value)[0]
+
+    def below(self, lo, hi, value):
+        """(count, weight sum) of the entries of values[lo:hi] smaller than value; the sum is 0 without weights"""
+        code = int(np.searchsorted(self.alphabet, value, side="left"))
+        if code >= len(self.alphabet):
+            return hi - lo, float(self.cum_weights[hi] - self.cum_weights[lo]) if self.weight_zeros is not None else 0.0
+        count, weight = 0, 0.0
+        for level in range(self.levels):
+            zeros = self.zeros[level]
+            zl, zr = int(zeros[lo]), int(zeros[hi])
+            if (code >> (self.levels - 1 - level)) & 1:
+                count += zr - zl
+                if self.weight_zeros is not None:
+                    weight += self.weight_zeros[level][hi] - self.weight_zeros[level][lo]
+                lo = self.total_zeros[level] + lo - zl
+                hi = self.total_zeros[level] + hi - zr
+            else:
+                lo, hi = zl, zr
+        return count, weight
+
+    def percentile(self, lo, hi, p):
+        """Linear-interpolated percentile of values[lo:hi], the rule percentile() uses in the HTML tools"""
+        rank = p / 100 * (hi - lo - 1)
+        below = int(math.floor(rank))
+        value = self.kth(lo, hi, below)
+        if rank > below:
+            value += (self.kth(lo, hi, below + 1) - value) * (rank - below)
+        return value
+
+class SegmentIndex(object):
+    """Precomputed index over a ping run: stats for any time or seq range in O(log n).
+
+    Prefix sums give count, mean, variance and consecutive-seq jitter (pairs
+    taken in seq order, like compute_stats(); pairs whose packets arrived
+    apart go in a weighted wavelet matrix instead); a sparse table gives the
+    seq span (for loss) and a wavelet matrix gives min/max/percentiles of RTT. Loss counts distinct seqs, like lost_seqs():
+    when the log has DUP replies, a second wavelet matrix over each packet's
+    previous same-seq position counts the first copies inside a range.
+    key="time" indexes seconds since the first packet, key="seq" indexes
+    icmp_seq.
+    """
+
+    def __init__(self, packets, key="time"):
+        self.key = key
+        if key == "seq":
+            packets = packets[np.argsort(packets["seq"], kind="stable")]
+        self.packets = packets
+        self.t = (packets["timestamp_ms"] - packets["timestamp_ms"].min()) / 1000.0 if len(packets) else np.empty(0)
+        self.keys = self.t if key == "time" else packets["seq"]
+        rtt = packets["rtt"]
+        seq = packets["seq"]
+        self.cum_rtt = np.concatenate([[0.0], np.cumsum(rtt)])
+        self.cum_rtt2 = np.concatenate([[0.0], np.cumsum(rtt * rtt)])
+        # Jitter pairs join neighbours in seq order, as consecutive_jitter() does; each sits at the
+        # row of its later packet. Pairs of adjacent rows go in prefix sums by row, the rest (reordered
+        # packets) in a wavelet matrix over their earlier row, so a range can drop pairs that start before it.
+        by_seq = np.argsort(seq, kind="stable")
+        consecutive = np.diff(seq[by_seq]) == 1
+        first, second = by_seq[:-1][consecutive], by_seq[1:][consecutive]
+        earlier, later = np.minimum(first, second), np.maximum(first, second)
+        jitter = np.abs(rtt[second] - rtt[first])
+        adjacent = later - earlier == 1
+        self.cum_jitter = np.concatenate([[0.0], np.cumsum(np.bincount(later[adjacent], jitter[adjacent], len(seq)))])
+        self.cum_pairs = np.concatenate([[0], np.cumsum(np.bincount(later[adjacent], minlength=len(seq)))])
+        order = np.argsort(later[~adjacent], kind="stable")
+        self.far_end = later[~adjacent][order]
+        self.cum_far_jitter = np.concatenate([[0.0], np.cumsum(jitter[~adjacent][order])])
+        self.far_start = WaveletMatrix(earlier[~adjacent][order], jitter[~adjacent][order]) if len(order) else None
+        self.seq_span = SparseTable(seq) if len(seq) else None
+        # previous[i]: position of the last earlier packet with the same seq, -1 if none
+        repeat = np.diff(seq[by_seq]) == 0
+        previous = np.full(len(seq), -1, dtype=np.int64)
+        previous[by_seq[1:][repeat]] = by_seq[:-1][repeat]
+        self.previous = WaveletMatrix(previous) if repeat.any() else None
+        self.rtt_order = WaveletMatrix(rtt) if len(rtt) else None
+
+    def positions(self, start, end):
+        """Index range [lo, hi) of packets with start <= key <= end (inclusive, like filterPacketsByTimeRange)"""
+        return int(np.searchsorted(self.keys, start, side="left")), int(np.searchsorted(self.keys, end, side="right"))
+
+    def stats(self, start, end, duration_minutes=None):
+        """computeStats() for the packets whose key lies in [start, end]"""
+        lo, hi = self.positions(start, end)
+        n = hi - lo
+        if n <= 0:
+            return None
+        total = self.cum_rtt[hi] - self.cum_rtt[lo]
+        mean = total / n
+        variance = max(0.0, (self.cum_rtt2[hi] - self.cum_rtt2[lo] - total * mean) / (n - 1)) if n > 1 else 0.0
+        std = math.sqrt(variance)
+        # Adjacent pairs fully inside the range are those ending at positions lo+1 .. hi-1
+        pairs = int(self.cum_pairs[hi] - self.cum_pairs[lo + 1])
+        total_jitter = self.cum_jitter[hi] - self.cum_jitter[lo + 1]
+        if self.far_start is not None:
+            a, b = np.searchsorted(self.far_end, lo), np.searchsorted(self.far_end, hi)
+            outside, outside_jitter = self.far_start.below(a, b, lo)
+            pairs += int(b - a) - outside
+            total_jitter += self.cum_far_jitter[b] - self.cum_far_jitter[a] - outside_jitter
+        jitter = total_jitter / pairs if pairs else 0.0
+        min_seq, max_seq = self.seq_span.query(lo, hi)
+        # A seq counts once in the range: only packets with no earlier copy in [lo, hi)
+        distinct = self.previous.count_below(lo, hi, lo) if self.previous is not None else n
+        lost = int(max_seq - min_seq + 1 - distinct)
+        if duration_minutes is None:
+            duration_minutes = (end - start) / 60 if self.key == "time" else (self.t[hi - 1] - self.t[lo]) / 60
+        result = {
+            "count": n,
+            "min": self.rtt_order.kth(lo, hi, 0), "max": self.rtt_order.kth(lo, hi, n - 1),
+            "mean": mean, "std": std, "stderr": std / math.sqrt(n),
+            "avg_jitter": jitter,
+            "lost": lost,
+            "loss_per_min": lost / duration_minutes if duration_minutes > 0 else 0.0,
+        }
+        for p in PERCENTILES:
+            result[f"p{p}"] = self.rtt_order.percentile(lo, hi, p)
+        return result
+
+def check(index, trials=1000, seed=0):
+    """Compare stats() with compute_stats() on random ranges; returns the mismatches found"""
+    rng = np.random.default_rng(seed)
+    order = index.keys
+    failures = []
+    if not len(order):
+        return failures
+    for _ in range(trials):
+        start, end = sorted(rng.uniform(order[0], order[-1], 2))
+        if index.key == "seq":
+            start, end = math.floor(start), math.ceil(end)
+        lo, hi = index.positions(start, end)
+        duration = (end - start) / 60 if index.key == "time" else (index.t[hi - 1] - index.t[lo]) / 60 if hi > lo else 0
+        got, want = index.stats(start, end), compute_stats(index.packets[lo:hi], duration)
+        if (got is None) != (want is None):
+            failures.append((start, end, "count", got, want))
+            continue
+        if got is None:
+            continue
+        for field in ("count", "lost", "loss_per_min", "mean", "std", "avg_jitter", "min", "max") + tuple(f"p{p}" for p in PERCENTILES):
+            if not math.isclose(got[field], want[field], rel_tol=1e-9, abs_tol=1e-9):
+                failures.append((start, end, field, got[field], want[field]))
+    return failures
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} ping.txt [--seq] [--range start end ...] [--every seconds] [--latex out.tex] "
+              "[--check trials]")
+        sys.exit(1)
+    path = args.pop(0)
+    key = "time"
+    ranges = []
+    every = latex_path = trials = None
+    while args:
+        option = args.pop(0)
+        if option == "--seq":
+            key = "seq"
+        elif option == "--range":
+            ranges.append((float(args.pop(0)), float(args.pop(0))))
+        elif option == "--every":
+            every = float(args.pop(0))
+        elif option == "--latex":
+            latex_path = args.pop(0)
+        elif option == "--check":
+            trials = int(args.pop(0))
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    start = time.monotonic()
+    packets = load_ping(path)
+    loaded = time.monotonic()
+    index = SegmentIndex(packets, key)
+    built = time.monotonic()
+    print(f"{len(packets)} packets: parsed in {loaded - start:.2f} s, indexed in {built - loaded:.2f} s")
+    if trials:
+        failures = check(index, trials)
+        for start_key, end_key, field, got, want in failures[:20]:
+            print(f"MISMATCH {start_key:g}-{end_key:g} {field}: index {got}, compute_stats {want}")
+        print(f"{trials} random ranges checked against compute_stats: {len(failures)} mismatches")
+        sys.exit(1 if failures else 0)
+    if every:
+        end = index.keys[-1] if len(index.keys) else 0
+        ranges += [(a, a + every) for a in np.arange(index.keys[0] if key == "seq" else 0.0, end, every)]
+    if not ranges:
+        ranges = [(float(index.keys[0]), float(index.keys[-1]))] if len(index.keys) else []
+
+    query_start = time.monotonic()
+    results = [index.stats(a, b) for a, b in ranges]
+    elapsed = time.monotonic() - query_start
+    unit = "s" if key == "time" else "seq"
+    print(f"{len(ranges)} ranges in {elapsed * 1000:.1f} ms ({elapsed / max(1, len(ranges)) * 1e6:.0f} us per range)\n")
+    print("{:<22} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+        f"Range ({unit})", "Pkts", "Min", "Max", "Avg", "SE", "P50", "P99", "Jitter", "Loss/min"))
+    for (a, b), s in zip(ranges, results):
+        label = f"{a:g}-{b:g}"
+        if s is None:
+            print(f"{label:<22} No data")
+            continue
+        print("{:<22} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            label, s["count"], fmt(s["min"]), fmt(s["max"]), fmt(s["mean"]), fmt(s["stderr"]),
+            fmt(s["p50"]), fmt(s["p99"]), fmt(s["avg_jitter"]), fmt(s["loss_per_min"])))
+
+    if latex_path:
+        with open(latex_path, "w", encoding="utf-8") as f:
+            f.write(latex_stats_table(results, f"{path}: {len(ranges)} ranges") + "\n")
+        print(f"\nWrote {latex_path}")
+
+if __name__ == "__main__":
+    main()
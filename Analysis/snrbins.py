@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+import json
+import math
+import sys
+
+import numpy as np
+
+from latency import fmt
+from streamstats import GAMMA, HIST_MIN, LogHistogram
+
+# SNR rows: one per dB from SNR_MIN to SNR_MAX; values outside land in the end rows
+SNR_MIN = 0
+SNR_MAX = 80
+QUANTILES = (50, 90, 95, 99)
+
+class SnrHistogram(object):
+    """2-D histogram of a metric (RTT, Mbps) against SNR, one LogHistogram row per dB.
+
+    Per-row count, sum and sum of squares give exact means and standard
+    deviations. Percentiles come from the log bins, to within about 0.5%.
+    Histograms merge by adding arrays, so per-run histograms add up to the
+    fleet one.
+    """
+    rows = SNR_MAX - SNR_MIN + 1
+
+    def __init__(self, snr="snr", metric="value"):
+        self.snr = snr
+        self.metric = metric
+        self.counts = np.zeros((self.rows, LogHistogram.bins), dtype=np.int64)
+        self.sums = np.zeros(self.rows)
+        self.squares = np.zeros(self.rows)
+        self.mins = np.full(self.rows, math.inf)
+        self.maxs = np.full(self.rows, -math.inf)
+
+    @classmethod
+    def row_index(cls, snr):
+        return np.clip(np.rint(snr).astype(np.int64) - SNR_MIN, 0, cls.rows - 1)
+
+    def add(self, snr, values):
+        """Add paired samples; pairs where either side is NaN are skipped"""
+        snr = np.asarray(snr, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(snr) & ~np.isnan(values)
+        snr, values = snr[keep], values[keep]
+        if not len(values):
+            return self
+        row = self.row_index(snr)
+        flat = row * LogHistogram.bins + LogHistogram.index(values)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+        self.sums += np.bincount(row, weights=values, minlength=self.rows)
+        self.squares += np.bincount(row, weights=values * values, minlength=self.rows)
+        np.minimum.at(self.mins, row, values)
+        np.maximum.at(self.maxs, row, values)
+        return self
+
+    def merge(self, other):
+        if (other.snr, other.metric) != (self.snr, self.metric):
+            raise ValueError(f"Cannot merge {other.metric} by {other.snr} into {self.metric} by {self.snr}")
+        self.counts += other.counts
+        self.sums += other.sums
+        self.squares += other.squares
+        np.minimum(self.mins, other.mins, out=self.mins)
+        np.maximum(self.maxs, other.maxs, out=self.maxs)
+        return self
+
+    def table(self, bucket=1):
+        """Per-SNR-bucket rows (bucket dB wide): count, mean, std, min, max and QUANTILES"""
+        result = []
+        for lo in range(0, self.rows, bucket):
+            hi = min(self.rows, lo + bucket)
+            n = int(self.counts[lo:hi].sum())
+            if not n:
+                continue
+            hist = LogHistogram()
+            hist.counts = self.counts[lo:hi].sum(axis=0)
+            hist.min, hist.max = float(self.mins[lo:hi].min()), float(self.maxs[lo:hi].max())
+            total = self.sums[lo:hi].sum()
+            mean = total / n
+            variance = max(0.0, (self.squares[lo:hi].sum() - total * mean) / (n - 1)) if n > 1 else 0.0
+            row = {"snr_lo": lo + SNR_MIN, "snr_hi": hi - 1 + SNR_MIN, "count": n, "mean": mean,
+                   "std": math.sqrt(variance), "min": hist.min, "max": hist.max}
+            for p in QUANTILES:
+                row[f"p{p}"] = hist.quantile(p)
+            result.append(row)
+        return result
+
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.counts)
+        used = np.flatnonzero(self.counts.sum(axis=1))
+        return {"snr": self.snr, "metric": self.metric, "gamma": GAMMA, "min_edge": HIST_MIN,
+                "snr_min": SNR_MIN, "snr_max": SNR_MAX,
+                "cells": nonzero.tolist(), "counts": self.counts.flat[nonzero].tolist(),
+                "rows": used.tolist(), "sums": self.sums[used].tolist(), "squares": self.squares[used].tolist(),
+                "mins": self.mins[used].tolist(), "maxs": self.maxs[used].tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        if (d["gamma"], d["min_edge"], d["snr_min"], d["snr_max"]) != (GAMMA, HIST_MIN, SNR_MIN, SNR_MAX):
+            raise ValueError("Histogram was saved with different bin settings")
+        h = cls(d["snr"], d["metric"])
+        h.counts.flat[d["cells"]] = d["counts"]
+        for field in ("sums", "squares", "mins", "maxs"):
+            getattr(h, field)[d["rows"]] = d[field]
+        return h
+
+def latex_snr_table(h, bucket=1):
+    label = f"{h.metric} by {h.snr}"
+    latex = f"""\\begin{{table}}[htbp]
+\\centering
+\\caption{{{label}}}
+\\begin{{tabular}}{{|c|c|c|c|c|c|c|c|c|}}
+\\hline
+SNR (dB) & Samples & Mean & Std & Min & P50 & P90 & P95 & P99 \\\\
+\\hline
+"""
+    for r in h.table(bucket):
+        snr = str(r["snr_lo"]) if r["snr_lo"] == r["snr_hi"] else f"{r['snr_lo']}--{r['snr_hi']}"
+        latex += (f"{snr} & {r['count']} & {fmt(r['mean'])} & {fmt(r['std'])} & {fmt(r['min'])} & "
+                  f"{fmt(r['p50'])} & {fmt(r['p90'])} & {fmt(r['p95'])} & {fmt(r['p99'])} \\\\\n")
+    return latex + """\\hline
+\\end{tabular}
+\\end{table}"""
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} --snr column --metric column [--bucket dB] [--save hist.json] "
+              "[--latex out.tex] aligned.npz|hist.json ...")
+        sys.exit(1)
+    snr_column = metric_column = save_path = latex_path = None
+    bucket = 1
+    paths = []
+    while args:
+        option = args.pop(0)
+        if option == "--snr":
+            snr_column = args.pop(0)
+        elif option == "--metric":
+            metric_column = args.pop(0)
+        elif option == "--bucket":
+            bucket = int(args.pop(0))
+        elif option == "--save":
+            save_path = args.pop(0)
+        elif option == "--latex":
+            latex_path = args.pop(0)
+        elif option.startswith("--"):
+            print("Unknown option", option)
+            sys.exit(1)
+        else:
+            paths.append(option)
+
+    total = None
+    for path in paths:
+        if path.endswith(".json"):
+            with open(path) as f:
+                h = SnrHistogram.from_dict(json.load(f))
+        else:
+            columns = np.load(path)
+            h = SnrHistogram(snr_column, metric_column).add(columns[snr_column], columns[metric_column])
+        total = h if total is None else total.merge(h)
+    if total is None:
+        print("No input")
+        sys.exit(1)
+
+    print(f"{total.metric} by {total.snr}: {int(total.counts.sum())} samples from {len(paths)} inputs\n")
+    print("{:<10} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+        "SNR", "Samples", "Mean", "Std", "P50", "P90", "P95", "P99"))
+    for r in total.table(bucket):
+        print("{:<10} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            f"{r['snr_lo']}-{r['snr_hi']}" if bucket > 1 else r["snr_lo"], r["count"], fmt(r["mean"]),
+            fmt(r["std"]), fmt(r["p50"]), fmt(r["p90"]), fmt(r["p95"]), fmt(r["p99"])))
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump(total.to_dict(), f)
+        print(f"\nWrote {save_path}")
+    if latex_path:
+        with open(latex_path, "w", encoding="utf-8") as f:
+            f.write(latex_snr_table(total, bucket) + "\n")
+        print(f"\nWrote {latex_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+import json
+import math
+import sys
+
+import numpy as np
+
+from latency import PING_RE, fmt
+
+# Log histogram: bin k covers [HIST_MIN * GAMMA**(k-1), HIST_MIN * GAMMA**k); bin 0 is
+# everything below HIST_MIN (including 0), the last bin everything above HIST_MAX
+HIST_MIN = 1e-3            # ms (or Mbps, for throughput)
+HIST_MAX = 1e6
+GAMMA = 1.01               # Quantiles come back within ~0.5% of the exact value
+JITTER_GAIN = 1 / 16       # RFC 3550: J += (|D| - J) / 16
+EWMA_BLOCK = 256           # Block length for the vectorized jitter recursion
+READ_CHUNK = 1 << 22       # Bytes of log text parsed per step; bounds memory per file
+QUANTILES = (50, 75, 90, 95, 99)
+
+class Welford(object):
+    """Running count/mean/variance; batches and other instances merge exactly (Chan et al.)"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def add_array(self, values):
+        values = np.asarray(values, dtype=float)
+        if len(values):
+            self.merge(Welford(len(values), float(values.mean()), float(((values - values.mean()) ** 2).sum())))
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        return self.std / math.sqrt(self.count) if self.count else 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["count"], d["mean"], d["m2"])
+
+class LogHistogram(object):
+    """Fixed log-spaced bins: bounded memory, exact merges by adding counts"""
+    bins = int(math.ceil(math.log(HIST_MAX / HIST_MIN) / math.log(GAMMA))) + 2
+
+    def __init__(self):
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def index(cls, values):
+        values = np.asarray(values, dtype=float)
+        index = np.zeros(len(values), dtype=np.int64)
+        above = values >= HIST_MIN
+        index[above] = np.floor(np.log(values[above] / HIST_MIN) / math.log(GAMMA)).astype(np.int64) + 1
+        return np.minimum(index, cls.bins - 1)
+
+    def add_array(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.counts += np.bincount(self.index(values), minlength=self.bins)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        self.counts += other.counts
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def quantile(self, p):
+        """p-th percentile (0-100): geometric centre of the bin holding that rank, clamped to [min, max]"""
+        n = self.count
+        if not n:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        k = int(np.searchsorted(cumulative, p / 100 * (n - 1), side="right"))
+        if k == 0:
+            value = self.min
+        else:
+            value = HIST_MIN * GAMMA ** (k - 0.5)
+        return float(min(max(value, self.min), self.max))
+
+    def to_dict(self):
+        nonzero = np.nonzero(self.counts)[0]
+        return {"gamma": GAMMA, "min_edge": HIST_MIN, "min": self.min, "max": self.max,
+                "bins": nonzero.tolist(), "counts": self.counts[nonzero].tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        if d["gamma"] != GAMMA or d["min_edge"] != HIST_MIN:
+            raise ValueError("Histogram was saved with different bin settings")
+        h = cls()
+        h.counts[d["bins"]] = d["counts"]
+        h.min, h.max = d["min"], d["max"]
+        return h
+
+def ewma(values, start, gain=JITTER_GAIN):
+    """J[k] = J[k-1] + (values[k] - J[k-1]) * gain, vectorized a block at a time"""
+    out = np.empty(len(values))
+    decay = 1 - gain
+    powers = decay ** np.arange(1, EWMA_BLOCK + 1)
+    j = start
+    for lo in range(0, len(values), EWMA_BLOCK):
+        block = values[lo:lo + EWMA_BLOCK]
+        p = powers[:len(block)]
+        # J[k] = decay^k * (J0 + gain * sum_{i<=k} v[i] / decay^i)
+        out[lo:lo + len(block)] = p * (j + gain * np.cumsum(block / p))
+        j = out[lo + len(block) - 1]
+    return out
+
+class LatencySummary(object):
+    """One-pass, mergeable RTT/loss/jitter summary for ping streams.
+
+    Jitter uses |RTT[n] - RTT[n-1]| between consecutive sequence numbers in
+    arrival order, the same differences LatencyAnalyzer.html uses; the RFC
+    3550 smoothed value runs over those differences. A merged summary keeps
+    exact counts, means and histograms; its RFC 3550 value is the mean of
+    the per-stream final values.
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.rtt = Welford()
+        self.rtt_hist = LogHistogram()
+        self.jitter = Welford()
+        self.jitter_hist = LogHistogram()
+        self.rfc3550 = Welford()    # final smoothed jitter of each stream
+        self.expected = 0
+        self.received = 0
+        self.streams = 0
+        self.reset_stream()
+
+    def reset_stream(self):
+        self.first_seq = self.max_seq = None
+        self.last_seq = self.last_raw = self.last_rtt = None
+        self.offset = 0             # added to icmp_seq after it wraps at 65536
+        self.smoothed = 0.0
+
+    def add_ping(self, seq, rtt):
+        """Feed the next packets of the current stream, in arrival order"""
+        raw = np.asarray(seq, dtype=np.int64)
+        rtt = np.asarray(rtt, dtype=float)
+        if not len(raw):
+            return
+        steps = np.diff(raw, prepend=raw[0] if self.last_raw is None else self.last_raw)
+        seq = raw + self.offset + np.cumsum(steps < -32768) * 65536
+        self.offset = int(seq[-1] - raw[-1])
+        self.last_raw = int(raw[-1])
+
+        if self.last_seq is None:
+            self.first_seq = self.max_seq = int(seq[0])
+            pair_seq, pair_rtt = seq, rtt
+        else:
+            # Include the pair that straddles the previous chunk
+            pair_seq = np.concatenate([[self.last_seq], seq])
+            pair_rtt = np.concatenate([[self.last_rtt], rtt])
+        jitter = np.abs(np.diff(pair_rtt))[np.diff(pair_seq) == 1]
+        self.first_seq = min(self.first_seq, int(seq.min()))
+        self.max_seq = max(self.max_seq, int(seq.max()))
+        self.last_seq, self.last_rtt = int(seq[-1]), float(rtt[-1])
+
+        self.rtt.add_array(rtt)
+        self.rtt_hist.add_array(rtt)
+        self.received += len(rtt)
+        if len(jitter):
+            self.jitter.add_array(jitter)
+            self.jitter_hist.add_array(jitter)
+            self.smoothed = float(ewma(jitter, self.smoothed)[-1])
+
+    def finish(self):
+        """Close the current stream so its loss and smoothed jitter count towards the totals"""
+        if self.first_seq is not None:
+            self.expected += self.max_seq - self.first_seq + 1
+            self.streams += 1
+            self.rfc3550.add(self.smoothed)
+        self.reset_stream()
+        return self
+
+    def merge(self, other):
+        for field in ("rtt", "rtt_hist", "jitter", "jitter_hist", "rfc3550"):
+            getattr(self, field).merge(getattr(other, field))
+        self.expected += other.expected
+        self.received += other.received
+        self.streams += other.streams
+        return self
+
+    def report(self):
+        lost = self.expected - self.received
+        result = {
+            "streams": self.streams, "expected": self.expected, "received": self.received,
+            "lost": lost, "lost_percent": lost / self.expected * 100 if self.expected else 0.0,
+            "mean": self.rtt.mean, "std": self.rtt.std, "stderr": self.rtt.stderr,
+            "min": self.rtt_hist.min, "max": self.rtt_hist.max,
+            "avg_jitter": self.jitter.mean, "rfc3550_jitter": self.rfc3550.mean,
+        }
+        for p in QUANTILES:
+            result[f"p{p}"] = self.rtt_hist.quantile(p)
+            result[f"jitter_p{p}"] = self.jitter_hist.quantile(p)
+        return result
+
+    def to_dict(self):
+        return {"name": self.name, "expected": self.expected, "received": self.received, "streams": self.streams,
+                "rtt": self.rtt.to_dict(), "rtt_hist": self.rtt_hist.to_dict(),
+                "jitter": self.jitter.to_dict(), "jitter_hist": self.jitter_hist.to_dict(),
+                "rfc3550": self.rfc3550.to_dict()}
+
+    @classmethod
+    def from_dict(cls, d):
+        s = cls(d["name"])
+        s.expected, s.received, s.streams = d["expected"], d["received"], d["streams"]
+        s.rtt, s.jitter, s.rfc3550 = Welford.from_dict(d["rtt"]), Welford.from_dict(d["jitter"]), Welford.from_dict(d["rfc3550"])
+        s.rtt_hist, s.jitter_hist = LogHistogram.from_dict(d["rtt_hist"]), LogHistogram.from_dict(d["jitter_hist"])
+        return s
+
+def summarize_ping(path):
+    """Stream a ping log through a LatencySummary, READ_CHUNK bytes at a time"""
+    summary = LatencySummary(path)
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        while True:
+            lines = f.readlines(READ_CHUNK)
+            if not lines:
+                break
+            rows = PING_RE.findall("".join(lines))
+            if rows:
+                summary.add_ping([int(r[3]) for r in rows], [float(r[4]) for r in rows])
+    return summary.finish()
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--save fleet.json] ping.txt|summary.json ...")
+        sys.exit(1)
+    save_path = None
+    if args[0] == "--save":
+        save_path, args = args[1], args[2:]
+
+    fleet = LatencySummary("fleet")
+    print("{:<30} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+        "File", "Rcvd", "Lost%", "Mean", "SE", "P50", "P99", "AvgJ", "RFC3550"))
+    for path in args:
+        if path.endswith(".json"):
+            with open(path) as f:
+                summary = LatencySummary.from_dict(json.load(f))
+        else:
+            summary = summarize_ping(path)
+        fleet.merge(summary)
+        r = summary.report()
+        print("{:<30} {:<8} {:<8} {:<9} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            path[-30:], r["received"], fmt(r["lost_percent"]), fmt(r["mean"]), fmt(r["stderr"], 3),
+            fmt(r["p50"]), fmt(r["p99"]), fmt(r["avg_jitter"]), fmt(r["rfc3550_jitter"])))
+
+    r = fleet.report()
+    print(f"\nAll {r['streams']} streams: {r['received']} packets, {fmt(r['lost_percent'])}% lost")
+    print("  RTT    " + "  ".join(f"P{p} {fmt(r[f'p{p}'])}" for p in QUANTILES) + f"  mean {fmt(r['mean'])} ± {fmt(r['stderr'], 3)}")
+    print("  Jitter " + "  ".join(f"P{p} {fmt(r[f'jitter_p{p}'])}" for p in QUANTILES) + f"  RFC 3550 {fmt(r['rfc3550_jitter'])}")
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump(fleet.to_dict(), f)
+        print(f"\nWrote {save_path}")
+
+if __name__ == "__main__":
+    main()
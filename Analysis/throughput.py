@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from latency import fmt
+from streamstats import LogHistogram, Welford
+
+# iperf3 --timestamps interval/summary lines (up.py, down.py, Windows/iperf.py):
+# "Mon Oct 27 14:43:07 2025 [  5]   8.02-9.01   sec  62.9 MBytes   531 Mbits/sec   12   1.23 MBytes"
+# "Mon Oct 27 17:13:06 2025 [  5]   0.00-9000.00 sec  55.1 GBytes  52.6 Mbits/sec  1234   sender"
+IPERF_RE = re.compile(
+    r'^(?:(\w{3} \w{3} +\d+ \d\d:\d\d:\d\d \d{4}) +)?\[\s*(\d+|SUM)\]\s+([\d.]+)-\s*([\d.]+)\s+sec\s+'
+    r'([\d.]+)\s+([KMGT]?)Bytes\s+([\d.]+)\s+([KMGT]?)bits/sec'
+    r'(?:\s+(\d+))?(?:\s+([\d.]+)\s+([KMGT]?)Bytes)?\s*(sender|receiver)?',
+    re.MULTILINE)
+SERVER_OUTPUT = "Server output:"
+
+BITS = {"": 1e-6, "K": 1e-3, "M": 1.0, "G": 1e3, "T": 1e6}             # → Mbits
+BYTES = {"": 1 / 1048576, "K": 1 / 1024, "M": 1.0, "G": 1024.0, "T": 1048576.0}  # → MBytes, as throughputAnalyzer.html
+
+IPERF_DTYPE = np.dtype([
+    ("timestamp", np.float64),     # Unix time of the line (--timestamps), NaN without
+    ("stream", np.int32),          # iperf stream id, -1 for [SUM]
+    ("start", np.float64),         # interval start/end, seconds into the test
+    ("end", np.float64),
+    ("mbytes", np.float64),
+    ("mbps", np.float64),
+    ("retr", np.float64),          # sender side only; NaN when not reported
+    ("cwnd_mbytes", np.float64),
+])
+
+# Steady state: windows whose rolling mean sits within STEADY_TOLERANCE of the run's
+# median and whose rolling coefficient of variation is at most STEADY_MAX_CV
+STEADY_WINDOW = 30         # intervals
+STEADY_TOLERANCE = 0.1
+STEADY_MAX_CV = 0.5
+MIN_INTERVAL_FRACTION = 0.5  # Drop the short last interval (e.g. 9000.00-9000.04)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+def parse_timestamps(stamps):
+    """'%c' timestamps → Unix time; each distinct string is parsed once"""
+    cache = {}
+    out = np.full(len(stamps), np.nan)
+    for i, stamp in enumerate(stamps):
+        if not stamp:
+            continue
+        value = cache.get(stamp)
+        if value is None:
+            value = cache[stamp] = time.mktime(datetime.strptime(" ".join(stamp.split()), "%a %b %d %H:%M:%S %Y").timetuple())
+        out[i] = value
+    return out
+
+def parse_rows(rows):
+    if not rows:
+        return np.empty(0, dtype=IPERF_DTYPE)
+    stamp, stream, start, end, size, size_unit, rate, rate_unit, retr, cwnd, cwnd_unit, _ = (np.array(c) for c in zip(*rows))
+    out = np.empty(len(rows), dtype=IPERF_DTYPE)
+    out["timestamp"] = parse_timestamps(stamp)
+    out["stream"] = np.where(stream == "SUM", "-1", stream).astype(np.int32)
+    out["start"] = start.astype(float)
+    out["end"] = end.astype(float)
+    out["mbytes"] = size.astype(float) * np.vectorize(BYTES.get)(size_unit)
+    out["mbps"] = rate.astype(float) * np.vectorize(BITS.get)(rate_unit)
+    out["retr"] = np.where(retr == "", "nan", retr).astype(float)
+    out["cwnd_mbytes"] = np.where(cwnd == "", "nan", cwnd).astype(float) * np.vectorize(lambda u: BYTES.get(u, 1.0))(cwnd_unit)
+    return out
+
+def parse_iperf_text(text):
+    """iperf3 log → (interval array, summary dict) for the client side of the log.
+
+    With several parallel streams only the [SUM] lines are kept. Summary
+    lines ('sender'/'receiver') are returned separately so they don't
+    count as intervals.
+    """
+    client = text.split(SERVER_OUTPUT, 1)[0]
+    rows = IPERF_RE.findall(client)
+    intervals = parse_rows([r for r in rows if not r[-1]])
+    summary = {}
+    for r in rows:
+        if r[-1]:
+            line = parse_rows([r])[0]
+            if r[-1] not in summary or line["stream"] == -1:
+                summary[r[-1]] = line
+    if (intervals["stream"] == -1).any():
+        intervals = intervals[intervals["stream"] == -1]
+    elif len(np.unique(intervals["stream"])) > 1:
+        # Parallel streams without [SUM] lines: add them up per interval
+        starts, inverse = np.unique(intervals["start"], return_inverse=True)
+        merged = np.zeros(len(starts), dtype=IPERF_DTYPE)
+        first = np.unique(inverse, return_index=True)[1]
+        for field in ("timestamp", "start", "end"):
+            merged[field] = intervals[field][first]
+        for field in ("mbytes", "mbps", "retr", "cwnd_mbytes"):
+            merged[field] = np.bincount(inverse, weights=intervals[field], minlength=len(starts))
+        merged["stream"] = -1
+        intervals = merged
+    return intervals, summary
+
+def load_iperf(path):
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        return parse_iperf_text(f.read())
+
+def rolling(values, window):
+    """Rolling mean and std over windows values[i:i+window], from cumulative sums"""
+    c1 = np.concatenate([[0.0], np.cumsum(values)])
+    c2 = np.concatenate([[0.0], np.cumsum(values * values)])
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    mean = s1 / window
+    return mean, np.sqrt(np.maximum(s2 / window - mean * mean, 0.0))
+
+def steady_state(mbps, window=STEADY_WINDOW, tolerance=STEADY_TOLERANCE, max_cv=STEADY_MAX_CV):
+    """[lo, hi) of the steady part of a run: from the first stable window to the end of the last one.
+
+    A window is stable when its mean is within tolerance of the run's
+    median and its std/mean is at most max_cv. A boundary window can still
+    straddle the ramp, so the cut then moves inward to the first and last
+    interval that are themselves within tolerance (if none is, e.g. a run
+    alternating between two levels, the window bounds stand). Runs too
+    short for one window, or with no stable window, are returned whole.
+    """
+    n = len(mbps)
+    if n < window:
+        return 0, n
+    mean, std = rolling(mbps, window)
+    median = np.median(mbps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.where(mean > 0, std / mean, np.inf)
+    stable = np.nonzero((np.abs(mean - median) <= tolerance * median) & (cv <= max_cv))[0]
+    if not len(stable):
+        return 0, n
+    lo, hi = int(stable[0]), int(stable[-1] + window)
+    close = np.nonzero(np.abs(mbps[lo:hi] - median) <= tolerance * median)[0]
+    if not len(close):
+        return lo, hi
+    return lo + int(close[0]), lo + int(close[-1]) + 1
+
+def interval_stats(intervals):
+    """min/max/mean/std (population, as steadystatethroughput.html) and percentiles of interval Mbps"""
+    mbps = intervals["mbps"]
+    if not len(mbps):
+        return None
+    duration = float((intervals["end"] - intervals["start"]).sum())
+    retr = intervals["retr"]
+    has_retr = not np.isnan(retr).all()
+    result = {
+        "intervals": len(mbps),
+        "seconds": duration,
+        "min": float(mbps.min()), "max": float(mbps.max()),
+        "mean": float(mbps.mean()), "std": float(mbps.std()),
+        "total_mb": float(intervals["mbytes"].sum()),
+        "retr": float(np.nansum(retr)) if has_retr else math.nan,
+        "retr_per_s": float(np.nansum(retr)) / duration if has_retr and duration > 0 else math.nan,
+        "retr_per_gb": float(np.nansum(retr)) / (intervals["mbytes"].sum() / 1024) if has_retr and intervals["mbytes"].sum() > 0 else math.nan,
+    }
+    for p, value in zip(PERCENTILES, np.percentile(mbps, PERCENTILES)):
+        result[f"p{p}"] = float(value)
+    return result
+
+def analyze(intervals, summary):
+    """Whole-run and steady-state statistics for one log"""
+    if not len(intervals):
+        return None
+    lengths = intervals["end"] - intervals["start"]
+    nominal = np.median(lengths)
+    intervals = intervals[lengths >= MIN_INTERVAL_FRACTION * nominal]
+    lo, hi = steady_state(intervals["mbps"])
+    result = {
+        "all": interval_stats(intervals),
+        "steady": interval_stats(intervals[lo:hi]),
+        "steady_start": float(intervals["start"][lo]),
+        "steady_end": float(intervals["end"][hi - 1]),
+        "start_time": float(intervals["timestamp"][0]),
+    }
+    for side in ("sender", "receiver"):
+        line = summary.get(side)
+        result[f"{side}_mbps"] = float(line["mbps"]) if line is not None else math.nan
+        if side == "sender":
+            result["sender_retr"] = float(line["retr"]) if line is not None else math.nan
+    return result
+
+def process_file(path):
+    intervals, summary = load_iperf(path)
+    return {"path": path, "analysis": analyze(intervals, summary), "mbps": intervals["mbps"]}
+
+def latex_results_table(results):
+    """displayResults() table from throughputAnalyzer.html (whole run, summary lines excluded)"""
+    latex = """\\begin{table}[htbp]
+\\centering
+\\caption{iPerf Analysis Results}
+\\label{tab:iperf_analysis}
+\\resizebox{\\textwidth}{!}{%
+\\begin{tabular}{|c|c|c|c|c|}
+\\hline
+\\rowcolor{gray!30}
+\\textbf{Iteration} & \\textbf{Min Throughput (Mbps)} & \\textbf{Max Throughput (Mbps)} & \\textbf{Avg Throughput (Mbps)} & \\textbf{Total Transfer (MB)} \\\\
+\\hline
+"""
+    for i, r in enumerate(results, 1):
+        a = r["analysis"]
+        if a is None:
+            latex += f"{i} & \\multicolumn{{4}}{{c|}}{{Error: No valid iPerf data}} \\\\\n\\hline\n"
+        else:
+            s = a["all"]
+            latex += f"{i} & {s['min']:.2f} & {s['max']:.2f} & {s['mean']:.2f} & {s['total_mb']:.2f} \\\\\n\\hline\n"
+    return latex + """\\end{tabular}%
+}
+\\end{table}"""
+
+def latex_steady_table(results):
+    latex = """\\begin{table}[htbp]
+\\centering
+\\caption{iPerf Steady-State Throughput}
+\\label{tab:iperf_steady}
+\\resizebox{\\textwidth}{!}{%
+\\begin{tabular}{|c|c|c|c|c|c|c|c|}
+\\hline
+\\rowcolor{gray!30}
+\\textbf{Iteration} & \\textbf{Window (s)} & \\textbf{Avg (Mbps)} & \\textbf{Std (Mbps)} & \\textbf{P5} & \\textbf{P50} & \\textbf{P95} & \\textbf{Retr/s} \\\\
+\\hline
+"""
+    for i, r in enumerate(results, 1):
+        a = r["analysis"]
+        if a is None:
+            latex += f"{i} & \\multicolumn{{7}}{{c|}}{{Error: No valid iPerf data}} \\\\\n\\hline\n"
+            continue
+        s = a["steady"]
+        latex += (f"{i} & {a['steady_start']:.0f}--{a['steady_end']:.0f} & {fmt(s['mean'])} & {fmt(s['std'])} & "
+                  f"{fmt(s['p5'])} & {fmt(s['p50'])} & {fmt(s['p95'])} & {fmt(s['retr_per_s'])} \\\\\n\\hline\n")
+    return latex + """\\end{tabular}%
+}
+\\end{table}"""
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(f"Usage: {sys.argv[0]} [--latex out.tex] [--workers N] iperf3_*.txt ...")
+        sys.exit(1)
+    latex_path = None
+    workers = None
+    while args and args[0].startswith("--"):
+        option = args.pop(0)
+        if option == "--latex":
+            latex_path = args.pop(0)
+        elif option == "--workers":
+            workers = int(args.pop(0))
+        else:
+            print("Unknown option", option)
+            sys.exit(1)
+
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(process_file, args))
+    print(f"Analyzed {len(results)} logs in {time.monotonic() - start:.2f} s\n")
+
+    fleet = Welford()
+    fleet_hist = LogHistogram()
+    print("{:<30} {:<9} {:<9} {:<9} {:<13} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+        "File", "Intervals", "Avg", "Sender", "Steady (s)", "S.Avg", "S.Std", "S.P5", "S.P95", "Retr/s"))
+    for r in results:
+        a = r["analysis"]
+        name = os.path.basename(r["path"])[-30:]
+        if a is None:
+            print(f"{name:<30} no valid iPerf data")
+            continue
+        s = a["steady"]
+        print("{:<30} {:<9} {:<9} {:<9} {:<13} {:<9} {:<9} {:<9} {:<9} {:<9}".format(
+            name, a["all"]["intervals"], fmt(a["all"]["mean"]), fmt(a["sender_mbps"]),
+            f"{a['steady_start']:.0f}-{a['steady_end']:.0f}", fmt(s["mean"]), fmt(s["std"]),
+            fmt(s["p5"]), fmt(s["p95"]), fmt(s["retr_per_s"])))
+        fleet.add_array(r["mbps"])
+        fleet_hist.add_array(r["mbps"])
+    if fleet.count:
+        print(f"\nAll intervals: {fleet.count}, mean {fmt(fleet.mean)} ± {fmt(fleet.stderr, 3)} Mbps, "
+              + ", ".join(f"P{p} {fmt(fleet_hist.quantile(p))}" for p in PERCENTILES))
+
+    if latex_path:
+        with open(latex_path, "w", encoding="utf-8") as f:
+            f.write(latex_results_table(results) + "\n\n" + latex_steady_table(results) + "\n")
+        print(f"\nWrote {latex_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import asyncio
+import socket
+import struct
+import sys
+import time
+
+# Configuration
+PORT = 5005
+PACKET_SIZE = 65535        # Only used for oversized datagrams, real sizes are counted otherwise
+IDLE_TIMEOUT = 1.0         # Seconds of silence → burst ends
+IDLE_CHECK = 0.25          # How often the idle timer looks at each endpoint
+
+class BurstProtocol(asyncio.DatagramProtocol):
+    """Counts datagrams for one port/group and closes bursts from a periodic idle timer"""
+
+    def __init__(self, name, statistics):
+        self.name = name
+        self.statistics = statistics
+        self.packets = 0
+        self.bytes = 0
+        self.burst_count = 0
+        self.burst_bytes = 0
+        self.burst_start = None
+        self.burst_last = None
+        self.transport = None
+        self.idle_handle = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        loop = asyncio.get_running_loop()
+        self.idle_handle = loop.call_later(IDLE_CHECK, self.check_idle)
+
+    def datagram_received(self, data, addr):
+        now = time.time()
+        if self.burst_count == 0:
+            self.burst_start = now
+        self.burst_last = now
+        self.burst_count += 1
+        self.burst_bytes += len(data)
+        self.packets += 1
+        self.bytes += len(data)
+
+    def error_received(self, exc):
+        if getattr(exc, 'winerror', None) == 10040:
+            self.datagram_received(b'', None)
+            self.burst_bytes += PACKET_SIZE
+            self.bytes += PACKET_SIZE
+        else:
+            print(f"{self.name}: Socket error: {exc}")
+
+    def check_idle(self):
+        if self.burst_count > 0 and time.time() - self.burst_last >= IDLE_TIMEOUT:
+            self.end_burst()
+        loop = asyncio.get_running_loop()
+        self.idle_handle = loop.call_later(IDLE_CHECK, self.check_idle)
+
+    def end_burst(self):
+        elapsed = self.burst_last - self.burst_start
+        mb_recv = self.burst_bytes / (1024 * 1024)
+        mbps = mb_recv * 8 / elapsed if elapsed > 0 else 0
+        self.statistics.append((self.name, self.burst_start, self.burst_last, self.burst_count, mb_recv, mbps))
+        self.burst_count = 0
+        self.burst_bytes = 0
+        self.burst_start = None
+        self.burst_last = None
+
+    def connection_lost(self, exc):
+        if self.idle_handle is not None:
+            self.idle_handle.cancel()
+        if self.burst_count > 0:
+            self.end_burst()
+
+def make_socket(port, group=None):
+    """Broadcast socket bound to port, joined to a multicast group when one is given"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 0)
+    except Exception:
+        pass
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+    sock.bind(("", port))
+    if group:
+        mreq = struct.pack("4s4s", socket.inet_aton(group), socket.inet_aton("0.0.0.0"))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+    sock.setblocking(False)
+    return sock
+
+async def receive(endpoints, statistics, stop_event):
+    """Serve every (port, group) endpoint from one event loop until stop_event is set"""
+    loop = asyncio.get_running_loop()
+    transports = []
+    protocols = []
+    for port, group in endpoints:
+        name = f"{group}:{port}" if group else f"port-{port}"
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda name=name: BurstProtocol(name, statistics),
+            sock=make_socket(port, group))
+        transports.append(transport)
+        protocols.append(protocol)
+        print(f"{name}: Listening...")
+
+    try:
+        await stop_event.wait()
+    finally:
+        for transport in transports:
+            transport.close()
+        # Let connection_lost run so open bursts are flushed
+        await asyncio.sleep(0)
+    return protocols
+
+def parse_endpoint(text):
+    """'5005' → (5005, None), '5006@239.1.1.1' → (5006, '239.1.1.1')"""
+    port, _, group = text.partition('@')
+    return int(port), group or None
+
+def main():
+    endpoints = [parse_endpoint(arg) for arg in sys.argv[1:]] or [(PORT, None)]
+    statistics = []
+    print("Press Ctrl+C to stop...")
+    try:
+        asyncio.run(receive(endpoints, statistics, asyncio.Event()))
+    except KeyboardInterrupt:
+        print("\nInterrupted by user")
+
+    print("\nSummary of Burst Throughputs:")
+    print("{:<20} {:<10} {:<10} {:<10} {:<10}".format("Endpoint", "Start", "End", "Packets", "Mbps"))
+    for name, burst_start, burst_last, count, mb_recv, mbps in sorted(statistics, key=lambda x: x[1]):
+        start_str = time.strftime('%H:%M:%S', time.localtime(burst_start))
+        end_str = time.strftime('%H:%M:%S', time.localtime(burst_last))
+        print("{:<20} {:<10} {:<10} {:<10} {:<10.2f}".format(name, start_str, end_str, count, mbps))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+
+import asyncrecv
+import recv
+
+# Configuration
+PORT = 5015                # Separate from the experiment port so a running receiver is not disturbed
+PAYLOAD = 1024
+DURATION = 5.0             # Seconds the sender blasts packets
+TARGET = "127.0.0.1"       # Use the broadcast address to benchmark on the real network
+
+def sender(port, duration, payload, target, sent_count):
+    """Send datagrams as fast as possible for duration seconds (runs in its own process)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    data = b'x' * payload
+    end = time.monotonic() + duration
+    sent = 0
+    while time.monotonic() < end:
+        for _ in range(100):
+            try:
+                sock.sendto(data, (target, port))
+                sent += 1
+            except OSError:
+                pass
+    sock.close()
+    sent_count.value = sent
+
+def measure(run_backend):
+    """Run a backend against a sender process, returning (sent, best receiver, all receivers, CPU seconds).
+
+    On a broadcast target every thread gets its own copy, so loss is taken
+    against the thread that received the most, as receiverGUI does.
+    """
+    sent_count = multiprocessing.Value('q', 0)
+    proc = multiprocessing.Process(target=sender, args=(PORT, DURATION, PAYLOAD, TARGET, sent_count))
+    cpu_start = time.process_time()
+    statistics = run_backend(proc)
+    cpu = time.process_time() - cpu_start
+    per_thread = {}
+    for stat in statistics:
+        per_thread[stat[0]] = per_thread.get(stat[0], 0) + stat[3]
+    return sent_count.value, max(per_thread.values(), default=0), sum(per_thread.values()), cpu
+
+def thread_backend(num_threads):
+    def run_backend(proc):
+        recv.PORT = PORT
+        stop_event = threading.Event()
+        statistics = []
+        lock = threading.Lock()
+        threads = [threading.Thread(target=recv.receiver_function, args=(stop_event, statistics, lock),
+                                    name=f"T{i+1}") for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)
+        proc.start()
+        proc.join()
+        time.sleep(recv.IDLE_TIMEOUT)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        return statistics
+    return run_backend
+
+def asyncio_backend(proc):
+    async def run_backend():
+        statistics = []
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(asyncrecv.receive([(PORT, None)], statistics, stop_event))
+        await asyncio.sleep(0.2)
+        proc.start()
+        await asyncio.get_running_loop().run_in_executor(None, proc.join)
+        await asyncio.sleep(asyncrecv.IDLE_TIMEOUT)
+        stop_event.set()
+        await task
+        return statistics
+    return asyncio.run(run_backend())
+
+def main():
+    num_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    backends = [(f"threads x{num_threads}", thread_backend(num_threads)), ("asyncio", asyncio_backend)]
+
+    print(f"Benchmarking receivers: {DURATION}s of {PAYLOAD}-byte datagrams to {TARGET}:{PORT}")
+    print("{:<15} {:<12} {:<12} {:<12} {:<10} {:<10} {:<10} {:<15}".format(
+        "Backend", "Sent", "Best rx", "Total rx", "Loss %", "pps", "CPU s", "CPU us/packet"))
+    print("-" * 99)
+    for name, run_backend in backends:
+        sent, best, packets, cpu = measure(run_backend)
+        loss = (sent - best) / sent * 100 if sent else 0
+        pps = best / DURATION
+        # CPU is spent on every copy handled, so it is spread over all threads' packets
+        per_packet = cpu / packets * 1e6 if packets else float('inf')
+        print("{:<15} {:<12} {:<12} {:<12} {:<10.1f} {:<10.0f} {:<10.2f} {:<15.2f}".format(
+            name, sent, best, packets, loss, pps, cpu, per_packet))
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from tqdm import tqdm
 PORT = 5005
 PACKET_SIZE = 1024  # Big enough for any UDP datagram
 IDLE_TIMEOUT = 1.0  # Seconds of silence → burst ends
+GROUP_GAP = 0.1  # Bursts separated by less than this (in seconds) belong to the same group
 
 def receiver_function(stop_event, statistics, lock):
     # Set up UDP socket for broadcast
@@ -72,6 +73,43 @@ def receiver_function(stop_event, statistics, lock):
     sock.close()
     print(f"{thread_name}: Stopped.")
 
+def group_bursts(statistics, gap=GROUP_GAP):
+    """Group per-thread bursts whose [start, end] intervals overlap (or nearly touch).
+
+    Sweeps the intervals in start order keeping the running maximum end, so a
+    group grows for as long as the next burst starts before the group ends.
+    Returns a list of (group_start, group_end, union_seconds, stats) tuples,
+    where union_seconds is the time covered by at least one receiver.
+    """
+    order = sorted(range(len(statistics)), key=lambda i: statistics[i][1])
+    starts = [statistics[i][1] for i in order]
+    ends = [statistics[i][2] for i in order]
+
+    groups = []
+    first = 0
+    for k in range(len(order)):
+        if k == first:
+            group_end = ends[k]
+            union = 0.0
+            segment_start = starts[k]
+        elif starts[k] > group_end + gap:
+            union += group_end - segment_start
+            groups.append((starts[first], group_end, union, [statistics[i] for i in order[first:k]]))
+            first = k
+            group_end = ends[k]
+            union = 0.0
+            segment_start = starts[k]
+        else:
+            if starts[k] > group_end:
+                # Small gap inside the group: close the covered segment
+                union += group_end - segment_start
+                segment_start = starts[k]
+            group_end = max(group_end, ends[k])
+    if order:
+        union += group_end - segment_start
+        groups.append((starts[first], group_end, union, [statistics[i] for i in order[first:]]))
+    return groups
+
 def main():
     # Prompt user for number of threads
     N = int(input("Enter the number of threads: "))
@@ -102,44 +140,33 @@ def main():
         stop_event.set()
         for thread in threads:
             thread.join()
-    # Group statistics by burst
-    sorted_stats = sorted(statistics, key=lambda x: x[1])
-    groups = []
-    current_group = []
-    delta = 0.1  # Threshold for grouping bursts (in seconds)
-    for stat in sorted_stats:
-        if not current_group:
-            current_group.append(stat)
-        elif abs(stat[1] - current_group[0][1]) < delta:
-            current_group.append(stat)
-        else:
-            groups.append(current_group)
-            current_group = [stat]
-    if current_group:
-        groups.append(current_group)
+    thread_order = {thread.name: i for i, thread in enumerate(threads)}
+    groups = group_bursts(statistics)
     # Display summary
     print("\nSummary of Burst Throughputs:")
     print("{:<20} {:<20} {:<}".format("Start Time", "End Time", "Throughputs (Mbps)"))
     burst_averages = []
-    for group in groups:
-        # Sort group by thread number
-        group.sort(key=lambda x: int(x[0].split('-')[1]))
-        # Get start and end times
-        burst_start = group[0][1]
-        burst_last = group[0][2]
+    burst_aggregates = []
+    for burst_start, burst_last, union, group in groups:
+        group.sort(key=lambda x: thread_order.get(x[0], len(thread_order)))
         start_str = time.strftime('%H:%M:%S', time.localtime(burst_start))
         end_str = time.strftime('%H:%M:%S', time.localtime(burst_last))
         # Collect throughputs
         throughputs = [f"{s[0]}: {s[5]:.2f}" for s in group]
         thread_mbps = [s[5] for s in group]
         avg_mbps = sum(thread_mbps) / len(thread_mbps) if thread_mbps else 0
+        # Aggregate goodput: everything the receivers got over the union of their burst intervals
+        aggregate_mbps = sum(s[4] for s in group) * 8 / union if union > 0 else 0
         burst_averages.append(avg_mbps)
-        throughputs_str = ', '.join(throughputs) + f", Average: {avg_mbps:.2f}"
+        burst_aggregates.append(aggregate_mbps)
+        throughputs_str = ', '.join(throughputs) + f", Average: {avg_mbps:.2f}, Aggregate: {aggregate_mbps:.2f}"
         print("{:<20} {:<20} ({})".format(start_str, end_str, throughputs_str))
     # Calculate and print average of all burst averages
     if burst_averages:
         overall_avg = sum(burst_averages) / len(burst_averages)
+        overall_aggregate = sum(burst_aggregates) / len(burst_aggregates)
         print(f"\nAverage of all bursts: {overall_avg:.2f} Mbps")
+        print(f"Average aggregate goodput of all bursts: {overall_aggregate:.2f} Mbps")
 
 if __name__ == "__main__":
     main()
@@ -4,7 +4,7 @@ import threading
 from collections import deque
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import queue
+import bisect
 import subprocess
 import platform
 
@@ -12,22 +12,40 @@ class UDPReceiverGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("UDP Broadcast Receiver")
-        self.root.geometry("800x600")
+        self.root.geometry("800x750")
         
         # Configuration
         self.PACKET_SIZE = 65535
         self.IDLE_TIMEOUT = 1.0
+        self.FRAME_INTERVAL_MS = 200   # GUI samples the receive counters at 5 fps
+        self.LOG_INTERVAL_MS = 100
+        self.MAX_LOG_LINES = 500       # Log pane keeps only the most recent lines
+        self.HISTORY_FRAMES = 150      # Live chart shows the last 30 s of frames
         
         # State variables
         self.threads = []
         self.stop_event = threading.Event()
-        self.statistics = deque()
+        self.statistics = []  # Append-only while listening, so the GUI can slice off new bursts
         self.lock = threading.Lock()
         self.is_listening = False
-        self.log_queue = queue.Queue()
+        self.log_queue = deque(maxlen=self.MAX_LOG_LINES)
+        
+        # Per-thread [packets, bytes] counters; each list is only written by its receiver thread
+        self.counters = {}
+        self.last_sample = None
+        
+        # Rolling rate history for the live chart: aggregate and per-thread (pps, Mbps) per frame
+        self.aggregate_history = deque(maxlen=self.HISTORY_FRAMES)
+        self.thread_history = {}
+        
+        # Treeview rows currently shown, kept sorted by (thread, start) for incremental inserts
+        self.stats_shown = 0
+        self.tree_keys = []
+        self.tree_filter = None
         
         self.create_widgets()
         self.update_log()
+        self.update_metrics()
         
     def create_widgets(self):
         # Main frame
@@ -99,18 +117,43 @@ class UDPReceiverGUI:
         # Status
         self.status_var = tk.StringVar(value="Ready")
         status_label = ttk.Label(main_frame, textvariable=self.status_var, font=('Arial', 10, 'bold'))
-        status_label.grid(row=1, column=0, columnspan=2, pady=(0, 10))
+        status_label.grid(row=1, column=0, pady=(0, 10))
+        
+        self.rate_var = tk.StringVar(value="0.00 Mbps | 0 pps")
+        rate_label = ttk.Label(main_frame, textvariable=self.rate_var, font=('Arial', 10))
+        rate_label.grid(row=1, column=1, pady=(0, 10))
+        
+        # Live view: rolling rate chart and per-thread meters
+        live_frame = ttk.LabelFrame(main_frame, text="Live Throughput", padding="10")
+        live_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.chart = tk.Canvas(live_frame, height=120, background='white', highlightthickness=0)
+        self.chart.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        self.loss_var = tk.StringVar(value="Missed vs. best receiver: 0")
+        ttk.Label(live_frame, textvariable=self.loss_var).grid(row=1, column=0, sticky=tk.W)
+        
+        self.meter_tree = ttk.Treeview(live_frame, columns=('mbps', 'pps', 'missed'), show='tree headings', height=5)
+        self.meter_tree.grid(row=0, column=1, rowspan=2, sticky=(tk.N, tk.S), padx=(10, 0))
+        self.meter_tree.heading('#0', text='Thread')
+        self.meter_tree.heading('mbps', text='Mbps')
+        self.meter_tree.heading('pps', text='pps')
+        self.meter_tree.heading('missed', text='Missed')
+        self.meter_tree.column('#0', width=80)
+        self.meter_tree.column('mbps', width=70)
+        self.meter_tree.column('pps', width=70)
+        self.meter_tree.column('missed', width=70)
         
         # Log frame
         log_frame = ttk.LabelFrame(main_frame, text="Activity Log", padding="10")
-        log_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        log_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=90)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Statistics frame
         stats_frame = ttk.LabelFrame(main_frame, text="Statistics", padding="10")
-        stats_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+        stats_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Thread selector
         thread_frame = ttk.Frame(stats_frame)
@@ -152,29 +195,114 @@ class UDPReceiverGUI:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(2, weight=1)
         main_frame.rowconfigure(3, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+        live_frame.columnconfigure(0, weight=1)
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         stats_frame.columnconfigure(0, weight=1)
         stats_frame.rowconfigure(1, weight=1)
         
     def log_message(self, message):
-        """Thread-safe logging"""
-        self.log_queue.put(f"[{time.strftime('%H:%M:%S')}] {message}")
+        """Thread-safe logging (oldest pending messages are dropped when the buffer is full)"""
+        self.log_queue.append(f"[{time.strftime('%H:%M:%S')}] {message}")
         
     def update_log(self):
-        """Update log display from queue"""
+        """Update log display from the ring buffer, trimming the pane to MAX_LOG_LINES"""
+        messages = []
         try:
             while True:
-                message = self.log_queue.get_nowait()
-                self.log_text.insert(tk.END, message + "\n")
-                self.log_text.see(tk.END)
-        except queue.Empty:
+                messages.append(self.log_queue.popleft())
+        except IndexError:
             pass
         
+        if messages:
+            self.log_text.insert(tk.END, "\n".join(messages) + "\n")
+            line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+            if line_count > self.MAX_LOG_LINES:
+                self.log_text.delete('1.0', f"{line_count - self.MAX_LOG_LINES + 1}.0")
+            self.log_text.see(tk.END)
+        
         # Schedule next update
-        self.root.after(100, self.update_log)
+        self.root.after(self.LOG_INTERVAL_MS, self.update_log)
+        
+    def sample_counters(self):
+        """Sample the receive counters, returning per-thread (pps, Mbps) since the last sample"""
+        now = time.monotonic()
+        snapshot = {name: (counter[0], counter[1]) for name, counter in list(self.counters.items())}
+        rates = {}
+        if self.last_sample is not None:
+            last_time, last_snapshot = self.last_sample
+            elapsed = now - last_time
+            if elapsed > 0:
+                for name, (packets, total_bytes) in snapshot.items():
+                    last_packets, last_bytes = last_snapshot.get(name, (0, 0))
+                    rates[name] = ((packets - last_packets) / elapsed,
+                                   (total_bytes - last_bytes) * 8 / (1024 * 1024) / elapsed)
+        self.last_sample = (now, snapshot)
+        return rates
+        
+    def update_metrics(self):
+        """Sample aggregated rates and append new bursts to the statistics view at a fixed frame rate"""
+        rates = self.sample_counters()
+        if self.is_listening:
+            total_pps = sum(pps for pps, _ in rates.values())
+            total_mbps = sum(mbps for _, mbps in rates.values())
+            self.rate_var.set(f"{total_mbps:.2f} Mbps | {total_pps:.0f} pps")
+            self.aggregate_history.append((total_pps, total_mbps))
+            for name, rate in rates.items():
+                self.thread_history.setdefault(name, deque(maxlen=self.HISTORY_FRAMES)).append(rate)
+            self.update_meters(rates)
+            self.draw_chart()
+        self.add_new_stats()
+        
+        self.root.after(self.FRAME_INTERVAL_MS, self.update_metrics)
+        
+    def update_meters(self, rates):
+        """Refresh the per-thread meter rows in place and the loss counter"""
+        # Every socket sees every broadcast, so packets a thread is behind the best
+        # receiver are packets it dropped (e.g. socket buffer overruns)
+        packets = {name: counts[0] for name, counts in self.last_sample[1].items()}
+        best = max(packets.values(), default=0)
+        total_missed = 0
+        for name, (pps, mbps) in rates.items():
+            missed = best - packets[name]
+            total_missed += missed
+            values = (f"{mbps:.2f}", f"{pps:.0f}", missed)
+            if self.meter_tree.exists(name):
+                self.meter_tree.item(name, values=values)
+            else:
+                self.meter_tree.insert('', tk.END, iid=name, text=name, values=values)
+        self.loss_var.set(f"Missed vs. best receiver: {total_missed}")
+        
+    def draw_chart(self):
+        """Redraw the rolling aggregate Mbps/pps lines and the selected thread's Mbps"""
+        self.chart.delete('all')
+        width = self.chart.winfo_width()
+        height = self.chart.winfo_height()
+        if width <= 1 or len(self.aggregate_history) < 2:
+            return
+        
+        def plot(values, color, line_width=1):
+            peak = max(values) or 1
+            step = width / (self.HISTORY_FRAMES - 1)
+            offset = self.HISTORY_FRAMES - len(values)
+            points = []
+            for i, value in enumerate(values):
+                points.extend(((offset + i) * step, height - 4 - (height - 18) * value / peak))
+            self.chart.create_line(*points, fill=color, width=line_width)
+            return peak
+        
+        peak_mbps = plot([mbps for _, mbps in self.aggregate_history], 'blue', 2)
+        peak_pps = plot([pps for pps, _ in self.aggregate_history], 'green')
+        legend = f"Aggregate: {peak_mbps:.1f} Mbps peak (blue), {peak_pps:.0f} pps peak (green)"
+        
+        selected_thread = self.thread_var.get()
+        history = self.thread_history.get(selected_thread)
+        if history and len(history) >= 2:
+            peak_thread = plot([mbps for _, mbps in history], 'orange')
+            legend += f", {selected_thread}: {peak_thread:.1f} Mbps peak (orange)"
+        self.chart.create_text(4, 2, anchor=tk.NW, text=legend, font=('Arial', 8))
         
     def receiver_function(self, stop_event, statistics, lock, thread_name):
         """UDP receiver function (modified for GUI)"""
@@ -205,6 +333,7 @@ class UDPReceiverGUI:
         burst_start = None
         burst_last = None
         total_bytes = 0
+        counter = self.counters.setdefault(thread_name, [0, 0])
 
         self.log_message(f"{thread_name}: Listening for broadcasts on port {port}...")
 
@@ -213,7 +342,8 @@ class UDPReceiverGUI:
                 data, addr = sock.recvfrom(self.PACKET_SIZE)
                 now = time.time()
                 packet_size = len(data)
-                self.log_message(f"{thread_name}: Received packet from {addr} ({packet_size} bytes)")
+                counter[0] += 1
+                counter[1] += packet_size
                 if burst_count == 0:
                     burst_start = now
                     total_bytes = 0
@@ -244,7 +374,8 @@ class UDPReceiverGUI:
                     burst_last = now
                     burst_count += 1
                     total_bytes += self.PACKET_SIZE  # Oversized packet, use max size
-                    self.log_message(f"{thread_name}: Received oversized packet (>{self.PACKET_SIZE} bytes)")
+                    counter[0] += 1
+                    counter[1] += self.PACKET_SIZE
                 else:
                     self.log_message(f"{thread_name}: Socket error: {e}")
                     break
@@ -269,10 +400,16 @@ class UDPReceiverGUI:
             return
             
         # Clear previous data
-        self.statistics.clear()
-        self.stats_tree.delete(*self.stats_tree.get_children())
+        with self.lock:
+            self.statistics.clear()
+        self.counters = {f"Thread-{i+1}": [0, 0] for i in range(num_threads)}
+        self.last_sample = None
+        self.aggregate_history.clear()
+        self.thread_history = {}
+        self.meter_tree.delete(*self.meter_tree.get_children())
+        self.loss_var.set("Missed vs. best receiver: 0")
+        self.show_all_stats()
         self.thread_combo['values'] = []
-        self.thread_var.set('')
         
         # Reset stop event
         self.stop_event = threading.Event()
@@ -428,35 +565,38 @@ class UDPReceiverGUI:
         selected_thread = self.thread_var.get()
         if not selected_thread:
             return
-            
-        # Clear current display
-        self.stats_tree.delete(*self.stats_tree.get_children())
-        
-        # Filter statistics for selected thread
-        thread_stats = [stat for stat in self.statistics if stat[0] == selected_thread]
-        
-        # Add to treeview
-        for stat in sorted(thread_stats, key=lambda x: x[1]):
-            thread_name, burst_start, burst_last, burst_count, mb_recv, mbps = stat
-            start_str = time.strftime('%H:%M:%S', time.localtime(burst_start))
-            end_str = time.strftime('%H:%M:%S', time.localtime(burst_last))
-            
-            self.stats_tree.insert('', tk.END, text=thread_name,
-                                 values=(start_str, end_str, burst_count, f"{mb_recv:.2f}", f"{mbps:.2f}"))
+        self.rebuild_stats(selected_thread)
                                  
     def show_all_stats(self):
         """Show statistics for all threads"""
-        # Clear current display
-        self.stats_tree.delete(*self.stats_tree.get_children())
         self.thread_var.set('')
+        self.rebuild_stats(None)
         
-        # Add all statistics to treeview
-        for stat in sorted(self.statistics, key=lambda x: (x[0], x[1])):
+    def rebuild_stats(self, thread_filter):
+        """Reset the statistics view for a new filter; rows are then added incrementally"""
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        self.tree_keys = []
+        self.tree_filter = thread_filter
+        self.stats_shown = 0
+        self.add_new_stats()
+        
+    def add_new_stats(self):
+        """Insert bursts recorded since the last refresh at their sorted position"""
+        with self.lock:
+            new_stats = self.statistics[self.stats_shown:]
+            self.stats_shown += len(new_stats)
+        
+        for stat in new_stats:
             thread_name, burst_start, burst_last, burst_count, mb_recv, mbps = stat
+            if self.tree_filter is not None and thread_name != self.tree_filter:
+                continue
+            key = (int(thread_name.split('-')[1]), burst_start)
+            index = bisect.bisect(self.tree_keys, key)
+            self.tree_keys.insert(index, key)
             start_str = time.strftime('%H:%M:%S', time.localtime(burst_start))
             end_str = time.strftime('%H:%M:%S', time.localtime(burst_last))
             
-            self.stats_tree.insert('', tk.END, text=thread_name,
+            self.stats_tree.insert('', index, text=thread_name,
                                  values=(start_str, end_str, burst_count, f"{mb_recv:.2f}", f"{mbps:.2f}"))
                                  
     def on_closing(self):
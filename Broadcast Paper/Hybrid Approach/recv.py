@@ -1,4 +1,5 @@
 import socket
+import sys
 import time
 import threading
 from collections import deque
@@ -12,6 +13,21 @@ TEST_DURATION = 7          # Seconds to test each thread count
 THREAD_INCREMENT = 5       # Increase threads by this amount each test
 DEGRADATION_THRESHOLD = 0.15  # 15% throughput degradation threshold
 
+# Adaptive tuner configuration
+MAX_THREADS = 200          # Same safety limit as the linear search
+THREAD_RESOLUTION = 1      # Binary search stops when the bracket is this narrow
+WARMUP_TIME = 0.5          # Seconds to let sockets bind before sampling
+SAMPLE_WINDOW = 1.0        # Seconds per throughput sample
+MIN_SAMPLES = 3            # Samples taken at every point before checking the CI
+MAX_SAMPLES = 12           # Give up tightening the CI after this many samples
+CI_TARGET = 0.05           # Stop sampling once the 95% CI is within ±5% of the mean
+POLL_TIMEOUT = 0.2         # Socket timeout so counting receivers stop quickly
+
+# Two-sided 95% Student-t critical values for 1..30 degrees of freedom
+T_CRITICAL_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
 def receiver_function(stop_event, statistics, lock):
     # Set up UDP socket for broadcast
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -206,9 +222,167 @@ def find_optimal_threads():
     
     return optimal_threads
 
+def counting_receiver(stop_event, counters, index):
+    """Receiver that only bumps its own packet/byte counters (no per-burst bookkeeping)"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 0)
+    except Exception:
+        pass
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+    try:
+        sock.bind(("", PORT))
+    except:
+        pass
+    sock.settimeout(POLL_TIMEOUT)
+
+    counter = counters[index]
+    while not stop_event.is_set():
+        try:
+            data = sock.recv(PACKET_SIZE)
+            counter[0] += 1
+            counter[1] += len(data)
+        except socket.timeout:
+            continue
+        except OSError as e:
+            if getattr(e, 'winerror', None) == 10040:
+                counter[0] += 1
+                counter[1] += PACKET_SIZE
+            else:
+                raise
+
+    sock.close()
+
+def confidence_interval(samples):
+    """Return (mean, 95% CI half-width) of a list of samples"""
+    n = len(samples)
+    mean = sum(samples) / n
+    if n < 2:
+        return mean, float('inf')
+    variance = sum((x - mean) ** 2 for x in samples) / (n - 1)
+    t = T_CRITICAL_95[n - 2] if n - 1 <= len(T_CRITICAL_95) else 1.96
+    return mean, t * (variance / n) ** 0.5
+
+def measure_point(num_threads):
+    """Measure aggregate Mbps for a thread count, sampling until the CI is tight enough"""
+    stop_event = threading.Event()
+    counters = [[0, 0] for _ in range(num_threads)]
+    threads = [
+        threading.Thread(target=counting_receiver, args=(stop_event, counters, i),
+                         name=f"T{i+1}", daemon=True)
+        for i in range(num_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(WARMUP_TIME)
+
+    samples = []
+    packets = 0
+    last_bytes = sum(c[1] for c in counters)
+    last_packets = sum(c[0] for c in counters)
+    last_time = time.monotonic()
+    mean, half_width = 0.0, float('inf')
+    while len(samples) < MAX_SAMPLES:
+        time.sleep(SAMPLE_WINDOW)
+        now = time.monotonic()
+        total_bytes = sum(c[1] for c in counters)
+        total_packets = sum(c[0] for c in counters)
+        samples.append((total_bytes - last_bytes) / (1024 * 1024) * 8 / (now - last_time))
+        packets += total_packets - last_packets
+        last_bytes, last_packets, last_time = total_bytes, total_packets, now
+
+        if len(samples) >= MIN_SAMPLES:
+            mean, half_width = confidence_interval(samples)
+            if mean == 0 or half_width <= CI_TARGET * mean:
+                break
+
+    stop_event.set()
+    for thread in threads:
+        thread.join(timeout=2.0)
+
+    mean, half_width = confidence_interval(samples)
+    print(f"RESULT: {num_threads} threads -> {mean:.2f} ± {half_width:.2f} Mbps "
+          f"({len(samples)} samples, {packets} packets)")
+    return {'threads': num_threads, 'mbps': mean, 'ci': half_width,
+            'samples': len(samples), 'packets': packets}
+
+def is_degraded(point, best):
+    """True when a point is clearly (beyond both CIs) below the degradation threshold"""
+    if best['mbps'] <= 0:
+        return False
+    limit = best['mbps'] * (1 - DEGRADATION_THRESHOLD)
+    return point['mbps'] + point['ci'] < limit and point['mbps'] < best['mbps'] - best['ci']
+
+def find_optimal_threads_adaptive():
+    """Exponential-then-binary search over thread counts with CI-driven sampling"""
+    print("UDP Thread Optimization - Adaptive Search")
+    print("=" * 60)
+    print(f"{SAMPLE_WINDOW}s samples until ±{CI_TARGET*100:.0f}% CI (max {MAX_SAMPLES}), "
+          f">{DEGRADATION_THRESHOLD*100}% drop counts as degradation")
+
+    results = {}
+
+    def measure(num_threads):
+        if num_threads not in results:
+            print(f"\n➡️  Testing {num_threads} threads")
+            results[num_threads] = measure_point(num_threads)
+        return results[num_threads]
+
+    # Exponential phase: double until throughput clearly degrades
+    best = measure(1)
+    good, bad = 1, None
+    current = 1
+    while current < MAX_THREADS:
+        current = min(current * 2, MAX_THREADS)
+        point = measure(current)
+        if point['mbps'] > best['mbps']:
+            best = point
+        if is_degraded(point, best):
+            print(f"🚨 Degradation at {current} threads")
+            bad = current
+            break
+        good = current
+
+    # Binary phase: narrow the knee between the last good and first degraded count
+    if bad is not None:
+        while bad - good > THREAD_RESOLUTION:
+            mid = (good + bad) // 2
+            point = measure(mid)
+            if point['mbps'] > best['mbps']:
+                best = point
+            if is_degraded(point, best):
+                bad = mid
+            else:
+                good = mid
+    else:
+        print(f"Reached safety limit of {MAX_THREADS} threads")
+
+    # Largest count whose throughput is statistically indistinguishable from the best
+    optimal_threads = max(
+        n for n, p in results.items()
+        if n <= good and p['mbps'] + p['ci'] >= best['mbps'] - best['ci']
+    )
+
+    print(f"\n{'='*60}")
+    print("SCALING CURVE:")
+    print("{:<10} {:<15} {:<10} {:<10} {:<10}".format("Threads", "Mbps", "± CI95", "Samples", "Status"))
+    print("-" * 60)
+    for threads in sorted(results):
+        p = results[threads]
+        status = "OPTIMAL" if threads == optimal_threads else ""
+        print("{:<10} {:<15.2f} {:<10.2f} {:<10} {:<10}".format(
+            threads, p['mbps'], p['ci'], p['samples'], status))
+
+    return optimal_threads, [results[n] for n in sorted(results)]
+
 def main():
     try:
-        optimal_threads = find_optimal_threads()
+        if "--linear" in sys.argv:
+            optimal_threads = find_optimal_threads()
+        else:
+            optimal_threads, _ = find_optimal_threads_adaptive()
         print(f"\n🏆 FINAL ANSWER: {optimal_threads} threads is optimal")
         
     except KeyboardInterrupt:
@@ -0,0 +1,162 @@
+import csv
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# One row per flow; a flow is one AP → station stream in these scenarios.
+# Rows read from an --rxFile CSV have no src, port, tx_bytes, delay or jitter.
+FLOW_DTYPE = np.dtype([
+    ("run", np.int32),
+    ("flow_id", np.int32),
+    ("src", "U15"),
+    ("dst", "U15"),
+    ("dst_port", np.int32),
+    ("tx_packets", np.int64),
+    ("rx_packets", np.int64),
+    ("lost_packets", np.int64),
+    ("tx_bytes", np.int64),
+    ("rx_bytes", np.int64),
+    ("duration_s", np.float64),     # first to last received packet
+    ("throughput_mbps", np.float64),
+    ("mean_delay_ms", np.float64),
+    ("mean_jitter_ms", np.float64),
+    ("loss_ratio", np.float64),
+])
+
+TIME_UNITS = {"s": 1.0, "ms": 1e-3, "us": 1e-6, "ns": 1e-9, "ps": 1e-12, "fs": 1e-15, "min": 60.0, "h": 3600.0, "d": 86400.0}
+TIME_RE = re.compile(r"^([+-]?[0-9.]+(?:[eE][+-]?[0-9]+)?)([a-z]*)$")
+
+def parse_time(text):
+    """ns-3 Time attribute ('+2.0003e+09ns', '+1.5s') → seconds"""
+    match = TIME_RE.match(text)
+    if not match:
+        raise ValueError(f"Unrecognised ns-3 time value: {text!r}")
+    return float(match.group(1)) * TIME_UNITS[match.group(2) or "ns"]
+
+def iter_flows(path):
+    """Stream (flow_id, stats attributes, classifier attributes) out of a FlowMonitor XML file.
+
+    Uses iterparse and clears every element once it has been read, so memory
+    stays flat no matter how many flows (and histogram bins) the file holds.
+    FlowStats come before the classifier in the file, so stats are held by
+    flow id until the matching classifier entry arrives.
+    """
+    stats = {}
+    section = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if elem.tag in ("FlowStats", "Ipv4FlowClassifier", "Ipv6FlowClassifier", "FlowProbes"):
+                section = elem
+            continue
+        if elem.tag == "Flow" and section is not None:
+            flow_id = int(elem.get("flowId"))
+            if section.tag == "FlowStats":
+                stats[flow_id] = dict(elem.attrib)
+            elif section.tag != "FlowProbes" and flow_id in stats:
+                yield flow_id, stats.pop(flow_id), dict(elem.attrib)
+            # Drop the flow (and its histogram bins) from the tree once read
+            elem.clear()
+            section.remove(elem)
+        elif elem is section:
+            section = None
+
+def load_flows(path, run=0):
+    """Load every flow of one FlowMonitor file into a FLOW_DTYPE array"""
+    rows = []
+    for flow_id, s, c in iter_flows(path):
+        rx_packets = int(s["rxPackets"])
+        rx_bytes = int(s["rxBytes"])
+        tx_packets = int(s["txPackets"])
+        lost = int(s["lostPackets"])
+        duration = parse_time(s["timeLastRxPacket"]) - parse_time(s["timeFirstRxPacket"]) if rx_packets else 0.0
+        rows.append((
+            run, flow_id, c.get("sourceAddress", ""), c.get("destinationAddress", ""),
+            int(c.get("destinationPort", 0)),
+            tx_packets, rx_packets, lost, int(s["txBytes"]), rx_bytes,
+            duration,
+            rx_bytes * 8 / duration / 1e6 if duration > 0 else np.nan,
+            parse_time(s["delaySum"]) / rx_packets * 1e3 if rx_packets else np.nan,
+            parse_time(s["jitterSum"]) / (rx_packets - 1) * 1e3 if rx_packets > 1 else np.nan,
+            lost / tx_packets if tx_packets else np.nan,
+        ))
+    return np.array(rows, dtype=FLOW_DTYPE)
+
+def load_rx(path, run=0):
+    """Load a scenario's --rxFile CSV (one row per station) into a FLOW_DTYPE array.
+
+    FlowMonitor's IPv4 probe ignores broadcast and multicast destinations, so
+    for broadcast.pp this is the only per-station data. Throughput is over the
+    transmit period rather than first to last packet.
+    """
+    rows = []
+    with open(path, newline="") as f:
+        for r in csv.DictReader(f):
+            tx_packets = int(r["tx_packets"])
+            rx_packets = int(r["rx_packets"])
+            lost = max(tx_packets - rx_packets, 0)
+            rows.append((
+                run, int(r["station"]), "", r["address"], 0,
+                tx_packets, rx_packets, lost, 0, int(r["rx_bytes"]),
+                np.nan, float(r["throughput_mbps"]), np.nan, np.nan,
+                lost / tx_packets if tx_packets else np.nan,
+            ))
+    return np.array(rows, dtype=FLOW_DTYPE)
+
+def load_runs(paths):
+    """Concatenate FlowMonitor XML and --rxFile CSV files into one array, tagging rows with the file's index"""
+    arrays = [(load_rx if path.endswith(".csv") else load_flows)(path, run) for run, path in enumerate(paths)]
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=FLOW_DTYPE)
+
+def per_run_summary(flows, field):
+    """Per-run mean and 5/50/95th percentiles of a per-flow field, as a dict of arrays"""
+    runs = np.unique(flows["run"])
+    order = np.argsort(flows["run"], kind="stable")
+    values = flows[field][order]
+    bounds = np.searchsorted(flows["run"][order], runs, side="left").tolist() + [len(order)]
+    summary = {"run": runs, "flows": np.diff(bounds), "mean": [], "p5": [], "p50": [], "p95": []}
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        v = values[start:end]
+        v = v[~np.isnan(v)]
+        if len(v):
+            p5, p50, p95 = np.percentile(v, [5, 50, 95])
+            summary["mean"].append(v.mean())
+        else:
+            p5 = p50 = p95 = np.nan
+            summary["mean"].append(np.nan)
+        summary["p5"].append(p5)
+        summary["p50"].append(p50)
+        summary["p95"].append(p95)
+    return {key: np.asarray(value) for key, value in summary.items()}
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} [--csv flows.csv] flowmon.xml|rx.csv ...")
+        sys.exit(1)
+    args = sys.argv[1:]
+    csv_path = None
+    if args[0] == "--csv":
+        csv_path, args = args[1], args[2:]
+
+    flows = load_runs(args)
+    print(f"Loaded {len(flows)} flows from {len(args)} files")
+    for field in ("throughput_mbps", "mean_delay_ms", "mean_jitter_ms", "loss_ratio"):
+        summary = per_run_summary(flows, field)
+        print(f"\n{field}")
+        print("{:<40} {:<8} {:<12} {:<12} {:<12} {:<12}".format("File", "Flows", "Mean", "P5", "P50", "P95"))
+        for i, run in enumerate(summary["run"]):
+            print("{:<40} {:<8} {:<12.4f} {:<12.4f} {:<12.4f} {:<12.4f}".format(
+                args[run][-40:], summary["flows"][i], summary["mean"][i],
+                summary["p5"][i], summary["p50"][i], summary["p95"][i]))
+
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["file"] + list(FLOW_DTYPE.names))
+            for row in flows:
+                writer.writerow([args[row["run"]]] + list(row.tolist()))
+        print(f"\nWrote {csv_path}")
+
+if __name__ == "__main__":
+    main()
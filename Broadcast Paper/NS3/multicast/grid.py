@@ -0,0 +1,206 @@
+import csv
+import itertools
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+
+from flowmon import FLOW_DTYPE, load_rx
+from resultstore import ResultStore
+from sweep import build, command, run_simulation
+
+# Defaults for the "replicates" section of a grid spec
+MIN_REPLICATES = 3
+MAX_REPLICATES = 20
+CI_TARGET = 0.05           # Stop replicating once the 95% CI is within ±5% of the mean
+
+# Per-replicate files a spec can ask for: spec key -> (scenario option, extension)
+OUTPUT_FILES = {"flowmon_dir": ("flowmonFile", ".xml"), "rx_dir": ("rxFile", ".csv")}
+
+# Two-sided 95% Student-t critical values for 1..30 degrees of freedom
+T_CRITICAL_95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+def summarize(values):
+    """Return (n, mean, std, 95% CI half-width) of the successful replicates"""
+    n = len(values)
+    if n == 0:
+        return 0, float('nan'), float('nan'), float('nan')
+    mean = sum(values) / n
+    if n < 2:
+        return n, mean, float('nan'), float('inf')
+    std = math.sqrt(sum((x - mean) ** 2 for x in values) / (n - 1))
+    t = T_CRITICAL_95[n - 2] if n - 1 <= len(T_CRITICAL_95) else 1.96
+    return n, mean, std, t * std / math.sqrt(n)
+
+class Point(object):
+    """One grid point (scenario + parameter values) and its replicates so far"""
+
+    def __init__(self, label, program, params):
+        self.label = label
+        self.program = program
+        self.params = params
+        self.values = []
+        self.attempts = 0
+        self.running = 0
+
+    def needs_more(self, replicates):
+        if self.attempts >= replicates["max"]:
+            return False
+        if len(self.values) < replicates["min"]:
+            return True
+        _, mean, _, half_width = summarize(self.values)
+        return half_width > replicates["ci_target"] * abs(mean)
+
+def expand(spec):
+    """Cartesian product of scenarios and parameter values, in spec order"""
+    names = list(spec["params"])
+    points = []
+    for label, program in spec["scenarios"].items():
+        for combo in itertools.product(*(spec["params"][name] for name in names)):
+            points.append(Point(label, program, dict(zip(names, combo))))
+    return points
+
+def output_path(directory, point, seed, extension):
+    """Deterministic output file path for one replicate, so cached runs find their file again"""
+    name = "_".join([point.label] + [f"{key}{value}" for key, value in point.params.items()] + [f"RngRun{seed}"])
+    return os.path.join(directory, name + extension)
+
+def output_args(spec, point, seed):
+    """Scenario options naming this replicate's output files, for each *_dir set in the spec"""
+    return {option: output_path(spec[key], point, seed, extension)
+            for key, (option, extension) in OUTPUT_FILES.items() if spec.get(key)}
+
+def cache_args(args):
+    """Run args without the output-file options: where the files go does not change the simulation"""
+    options = {option for option, _ in OUTPUT_FILES.values()}
+    return {key: value for key, value in args.items() if key not in options}
+
+def metric_value(spec, metric, args, result):
+    """The replicate's value, or None if the run failed or produced no metric.
+
+    With "flow_metric" set, this is the per-station mean of that FLOW_DTYPE
+    field from the run's --rxFile CSV. Otherwise it is the first group of the
+    "metric" regex in stdout.
+    """
+    if result.returncode != 0:
+        return None
+    if spec.get("flow_metric"):
+        try:
+            values = load_rx(args["rxFile"])[spec["flow_metric"]]
+        except (OSError, KeyError, ValueError):
+            return None
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+    match = metric.search(result.stdout)
+    return float(match.group(1)) if match else None
+
+def run_grid(spec, points, workers=None, store=None):
+    """Run a grid spec, yielding (point, RngRun, value, returncode) for every replicate as it lands.
+
+    All points start with the minimum number of replicates; whenever a point's
+    replicates are all back and its CI is still too wide, one more RngRun is
+    queued. The pool therefore stays full until every point has converged or
+    hit the maximum.
+    """
+    replicates = {"min": MIN_REPLICATES, "max": MAX_REPLICATES, "ci_target": CI_TARGET}
+    replicates.update(spec.get("replicates", {}))
+    metric = re.compile(spec["metric"]) if spec.get("metric") else None
+    if spec.get("flow_metric"):
+        if not spec.get("rx_dir"):
+            raise ValueError("flow_metric needs rx_dir")
+        if spec["flow_metric"] not in FLOW_DTYPE.names:
+            raise ValueError(f"Unknown flow_metric {spec['flow_metric']!r}")
+    elif metric is None:
+        raise ValueError("Grid spec needs a metric or a flow_metric")
+    for key in OUTPUT_FILES:
+        if spec.get(key):
+            os.makedirs(spec[key], exist_ok=True)
+
+    completed = deque()
+    futures = {}
+    built = []
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        def schedule(point):
+            point.attempts += 1
+            point.running += 1
+            args = dict(point.params, RngRun=point.attempts)
+            outputs = output_args(spec, point, args["RngRun"])
+            args.update(outputs)
+            record = store.get(point.program, cache_args(args)) if store is not None else None
+            # A cached run only counts if the files it wrote are still there
+            if record is not None and all(os.path.exists(path) for path in outputs.values()):
+                completed.append((point, args, subprocess.CompletedProcess(
+                    command(point.program, args), record["returncode"], record["stdout"], record["stderr"])))
+                return
+            if not built:
+                build()
+                built.append(True)
+            futures[pool.submit(run_simulation, point.program, args)] = (point, args)
+
+        for point in points:
+            for _ in range(replicates["min"]):
+                schedule(point)
+
+        while completed or futures:
+            if not completed:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    point, args = futures.pop(future)
+                    result = future.result()
+                    if store is not None:
+                        store.put(point.program, cache_args(args), result)
+                    completed.append((point, args, result))
+                continue
+
+            point, args, result = completed.popleft()
+            point.running -= 1
+            value = metric_value(spec, metric, args, result)
+            if value is not None:
+                point.values.append(value)
+            else:
+                value = float('nan')
+                print(f"Warning: run failed or metric missing for {point.label} {args} "
+                      f"(exit code {result.returncode})", file=sys.stderr)
+            yield point, args["RngRun"], value, result.returncode
+
+            if point.running == 0 and point.needs_more(replicates):
+                schedule(point)
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} grid.json")
+        sys.exit(1)
+    with open(sys.argv[1]) as f:
+        spec = json.load(f)
+
+    names = list(spec["params"])
+    prefix = spec.get("output", "grid")
+    points = expand(spec)
+    with open(f"{prefix}-runs.csv", "w", newline="") as f:
+        runs = csv.writer(f)
+        runs.writerow(["scenario"] + names + ["RngRun", "value", "returncode", "flowmon", "rx"])
+        for point, seed, value, returncode in run_grid(spec, points, store=ResultStore()):
+            outputs = output_args(spec, point, seed)
+            runs.writerow([point.label] + [point.params[n] for n in names] + [seed, value, returncode,
+                          outputs.get("flowmonFile", ""), outputs.get("rxFile", "")])
+            f.flush()
+            print(f"{point.label} {point.params} RngRun={seed}: {value}")
+
+    with open(f"{prefix}-summary.csv", "w", newline="") as f:
+        summary = csv.writer(f)
+        summary.writerow(["scenario"] + names + ["n", "mean", "std", "ci95"])
+        for point in points:
+            summary.writerow([point.label] + [point.params[n] for n in names] + list(summarize(point.values)))
+    print(f"Wrote {prefix}-runs.csv and {prefix}-summary.csv")
+
+if __name__ == "__main__":
+    main()
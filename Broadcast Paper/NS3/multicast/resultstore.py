@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import subprocess
+
+# Configuration
+RESULTS_DIR = "sweep-results"  # Relative to the ns-3 root, next to build/
+DEFAULT_RNG_RUN = 1            # ns-3's default RngRun, so omitted and explicit run 1 share a key
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def scenario_hash(scenario):
+    """Hash of the scenario source: scratch/name.cc, or every file under scratch/name/"""
+    h = hashlib.sha256(scenario.encode())
+    if os.path.isfile(scenario + ".cc"):
+        h.update(file_hash(scenario + ".cc").encode())
+    elif os.path.isdir(scenario):
+        for root, dirs, files in os.walk(scenario):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                h.update(path.encode())
+                h.update(file_hash(path).encode())
+    return h.hexdigest()
+
+def build_id():
+    """ns-3 commit plus a hash of local modifications outside scratch/"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        diff = subprocess.run(["git", "diff", "HEAD", "--", ".", ":(exclude)scratch"],
+                              capture_output=True, check=True).stdout
+        return f"{commit}-{hashlib.sha256(diff).hexdigest()[:16]}"
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+class ResultStore(object):
+    """Content-addressed store of finished simulations, one JSON file per run.
+
+    The key covers the scenario source, the ns-3 build, the full argument set
+    and the RNG run, so anything that could change the output gives a new key.
+    Files are written atomically, so a sweep killed halfway resumes exactly
+    after the last run that finished.
+    """
+
+    def __init__(self, directory=RESULTS_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.build = build_id()
+        self.scenarios = {}
+
+    def key(self, scenario, args):
+        if scenario not in self.scenarios:
+            self.scenarios[scenario] = scenario_hash(scenario)
+        full_args = {"RngRun": DEFAULT_RNG_RUN}
+        full_args.update(args)
+        material = json.dumps({
+            "scenario": self.scenarios[scenario],
+            "build": self.build,
+            "args": {k: str(v) for k, v in full_args.items()},
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, scenario, args):
+        """Stored record for this run, or None if it has not completed yet"""
+        try:
+            with open(self.path(self.key(scenario, args))) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, scenario, args, result):
+        """Store a finished run (only successful runs, so failures are retried)"""
+        if result.returncode != 0:
+            return
+        path = self.path(self.key(scenario, args))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "scenario": scenario,
+            "args": args,
+            "build": self.build,
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+        }
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
@@ -0,0 +1,51 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Configuration
+NS3 = "./ns3"              # Run from the ns-3 root, like runscript.py
+
+def build():
+    """Build ns-3 once so the parallel runs can all use --no-build"""
+    print("Building ns-3...")
+    subprocess.run([NS3, "build"], check=True)
+
+def command(scenario, args):
+    """./ns3 run --no-build "scenario --key=value ..." as an argument list (no shell)"""
+    program = " ".join([scenario] + [f"--{key}={value}" for key, value in args.items()])
+    return [NS3, "run", "--no-build", program]
+
+def run_simulation(scenario, args):
+    """Run one simulation and return its CompletedProcess"""
+    return subprocess.run(command(scenario, args), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+def sweep(scenario, arg_sets, workers=None, store=None):
+    """Run every argument set concurrently, yielding (args, CompletedProcess) as each finishes.
+
+    Each simulation is single-threaded, so by default one worker per core is
+    used. The workers only wait on their subprocess, so a thread pool is enough.
+    With a ResultStore, runs that already finished are yielded straight from
+    the store and only the missing ones are simulated.
+    """
+    pending = []
+    for args in arg_sets:
+        record = store.get(scenario, args) if store is not None else None
+        if record is None:
+            pending.append(args)
+        else:
+            yield args, subprocess.CompletedProcess(command(scenario, args), record["returncode"],
+                                                    record["stdout"], record["stderr"])
+    if not pending:
+        return
+    if store is not None:
+        print(f"{len(arg_sets) - len(pending)} runs cached, {len(pending)} to simulate")
+
+    build()
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_simulation, scenario, args): args for args in pending}
+        for future in as_completed(futures):
+            args, result = futures[future], future.result()
+            if store is not None:
+                store.put(scenario, args, result)
+            yield args, result
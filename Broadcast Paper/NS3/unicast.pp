@@ -6,6 +6,9 @@
 #include "ns3/mobility-module.h"
 #include "ns3/applications-module.h"
 #include "ns3/wifi-mac-header.h"
+#include "ns3/flow-monitor-module.h"
+
+#include <fstream>
 
 using namespace ns3;
 
@@ -14,6 +17,29 @@ NS_LOG_COMPONENT_DEFINE ("WifiUdpUnicastAvgPerUserExample");
 // Global variable to count UDP unicast bytes transmitted by the AP.
 static uint64_t g_totalBytesTx = 0;
 
+// Bytes and packets delivered to each station's UDP server, indexed by station.
+// Unlike the AP's TX count, these fall as errorRate rises and exclude retransmissions.
+static std::vector<uint64_t> g_rxBytes;
+static std::vector<uint64_t> g_rxPackets;
+// Packets the AP's UdpClient sent to each station (before any MAC retransmission).
+static std::vector<uint64_t> g_txPackets;
+
+// Trace callback on each UdpServer's Rx; the context is the station index.
+void
+RxTrace (std::string context, Ptr<const Packet> packet)
+{
+  uint32_t station = std::stoul (context);
+  g_rxBytes[station] += packet->GetSize ();
+  g_rxPackets[station]++;
+}
+
+// Trace callback on each UdpClient's Tx; the context is the station index.
+void
+AppTxTrace (std::string context, Ptr<const Packet> packet)
+{
+  g_txPackets[std::stoul (context)]++;
+}
+
 // Trace callback to record the size of each transmitted UDP unicast packet.
 void
 TxTrace (Ptr<const Packet> packet)
@@ -38,9 +64,21 @@ int main (int argc, char *argv[])
   double simulationTime = 10.0; // seconds
   uint16_t port = 9; // UDP port
   double txStartTime = 2.0; // when AP starts transmitting
+  double packetInterval = 0.1; // seconds between packets to each station
+  uint32_t maxPackets = 100; // packets sent to each station
+  uint32_t packetSize = 1024; // UDP payload bytes
+  double errorRate = 0.0; // packet error rate at each station (impairment)
+  std::string flowmonFile = ""; // per-flow FlowMonitor XML output (disabled when empty)
+  std::string rxFile = ""; // per-station delivered packets/bytes CSV (disabled when empty)
 
   CommandLine cmd;
   cmd.AddValue ("numStations", "Number of station nodes", numStations);
+  cmd.AddValue ("packetInterval", "Seconds between packets to each station", packetInterval);
+  cmd.AddValue ("maxPackets", "Packets sent to each station", maxPackets);
+  cmd.AddValue ("packetSize", "UDP payload size in bytes", packetSize);
+  cmd.AddValue ("errorRate", "Packet error rate applied at each station's PHY", errorRate);
+  cmd.AddValue ("flowmonFile", "Write per-flow FlowMonitor statistics to this XML file", flowmonFile);
+  cmd.AddValue ("rxFile", "Write per-station delivered packets and bytes to this CSV file", rxFile);
   cmd.Parse (argc, argv);
 
   // Create node containers: one AP and numStations stations.
@@ -75,6 +113,18 @@ int main (int argc, char *argv[])
                "Ssid", SsidValue (ssid));
   NetDeviceContainer apDevice = wifi.Install (phy, mac, apNode);
 
+  // Impairment: each station drops received frames with probability errorRate.
+  if (errorRate > 0)
+    {
+      for (uint32_t i = 0; i < staDevices.GetN (); ++i)
+        {
+          Ptr<RateErrorModel> em = CreateObject<RateErrorModel> ();
+          em->SetAttribute ("ErrorUnit", StringValue ("ERROR_UNIT_PACKET"));
+          em->SetAttribute ("ErrorRate", DoubleValue (errorRate));
+          staDevices.Get (i)->GetObject<WifiNetDevice> ()->GetPhy ()->SetPostReceptionErrorModel (em);
+        }
+    }
+
   // Attach trace callback to the AP's PHY layer.
   Ptr<WifiNetDevice> apWifiDevice = apDevice.Get (0)->GetObject<WifiNetDevice> ();
   apWifiDevice->GetPhy ()->TraceConnectWithoutContext ("PhyTxEnd", MakeCallback (&TxTrace));
@@ -117,23 +167,59 @@ int main (int argc, char *argv[])
   serverApps.Start (Seconds (1.0));
   serverApps.Stop (Seconds (simulationTime + 1));
 
+  // Count what each station actually receives.
+  g_rxBytes.assign (numStations, 0);
+  g_rxPackets.assign (numStations, 0);
+  g_txPackets.assign (numStations, 0);
+  for (uint32_t i = 0; i < serverApps.GetN (); ++i)
+    {
+      serverApps.Get (i)->TraceConnect ("Rx", std::to_string (i), MakeCallback (&RxTrace));
+    }
+
   // Install a UDP client on the AP for each station.
   for (uint32_t i = 0; i < staNodes.GetN (); ++i)
     {
       Ipv4Address dstAddress = interfaces.GetAddress (i); // station's IP address
       UdpClientHelper udpClient (dstAddress, port);
-      udpClient.SetAttribute ("MaxPackets", UintegerValue (100));
-      udpClient.SetAttribute ("Interval", TimeValue (Seconds (0.1)));
-      udpClient.SetAttribute ("PacketSize", UintegerValue (1024));
+      udpClient.SetAttribute ("MaxPackets", UintegerValue (maxPackets));
+      udpClient.SetAttribute ("Interval", TimeValue (Seconds (packetInterval)));
+      udpClient.SetAttribute ("PacketSize", UintegerValue (packetSize));
 
       ApplicationContainer clientApps = udpClient.Install (apNode.Get (0));
       clientApps.Start (Seconds (txStartTime));
       clientApps.Stop (Seconds (simulationTime));
+      clientApps.Get (0)->TraceConnect ("Tx", std::to_string (i), MakeCallback (&AppTxTrace));
+    }
+
+  // Per-flow statistics (throughput, delay, loss for every station) for the sweep scripts.
+  FlowMonitorHelper flowmonHelper;
+  Ptr<FlowMonitor> monitor;
+  if (!flowmonFile.empty ())
+    {
+      monitor = flowmonHelper.InstallAll ();
     }
 
   // Run the simulation.
   Simulator::Stop (Seconds (simulationTime + 1));
   Simulator::Run ();
+
+  if (monitor)
+    {
+      monitor->CheckForLostPackets ();
+      monitor->SerializeToXmlFile (flowmonFile, false, false);
+    }
+
+  // Per-station record in the same format as broadcast.pp, which FlowMonitor cannot cover.
+  if (!rxFile.empty ())
+    {
+      std::ofstream rx (rxFile);
+      rx << "station,address,tx_packets,rx_packets,rx_bytes,throughput_mbps" << std::endl;
+      for (uint32_t i = 0; i < numStations; ++i)
+        {
+          rx << i << "," << interfaces.GetAddress (i) << "," << g_txPackets[i] << "," << g_rxPackets[i] << ","
+             << g_rxBytes[i] << "," << (g_rxBytes[i] * 8.0) / ((simulationTime - txStartTime) * 1e6) << std::endl;
+        }
+    }
   Simulator::Destroy ();
 
   // Calculate the aggregate throughput (in Mbps) over the transmission period.
@@ -147,5 +233,15 @@ int main (int argc, char *argv[])
   std::cout << "Aggregate UDP unicast throughput of the AP: " << aggregateThroughput << " Mbps" << std::endl;
   std::cout << "Average UDP unicast throughput per user: " << avgThroughputPerUser << " Mbps" << std::endl;
 
+  // Goodput: bytes the stations' UDP servers received, which is what errorRate impairs.
+  uint64_t totalBytesRx = 0;
+  for (uint64_t bytes : g_rxBytes)
+    {
+      totalBytesRx += bytes;
+    }
+  double deliveredPerUser = (totalBytesRx * 8.0) / (txDuration * 1e6) / numStations;
+  std::cout << "Total delivered UDP unicast bytes at stations: " << totalBytesRx << std::endl;
+  std::cout << "Average UDP delivered throughput per user: " << deliveredPerUser << " Mbps" << std::endl;
+
   return 0;
 }